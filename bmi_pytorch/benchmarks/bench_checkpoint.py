@@ -0,0 +1,55 @@
+"""
+Benchmark Bmi_Model.initialize latency against model size, building the model from a
+Config (random initialization) versus memory mapping it from a checkpoint
+
+usage: python bench_checkpoint.py [--widths 10 256 1024 4096] [--layers 3] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bmi_pytorch.bmi_model import Bmi_Model
+from bmi_pytorch.checkpoint import save_checkpoint
+from bmi_pytorch.config import Config
+from bmi_pytorch.ensemble import build_model
+from bmi_pytorch.store import weight_store
+
+
+def bench(source, repeat: int) -> float:
+    """Mean seconds per initialize of a new inference instance, without store reuse"""
+    # untimed first call, which pays for lazily imported code
+    Bmi_Model().initialize(source)
+    total = 0.0
+    for _ in range(repeat):
+        weight_store.clear()
+        model = Bmi_Model()
+        start = time.perf_counter()
+        model.initialize(source)
+        total += time.perf_counter() - start
+    return total / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--widths", type=int, nargs="*", default=[10, 256, 1024, 4096])
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'width':>6} {'params':>10} {'config ms':>10} {'checkpoint ms':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for width in args.widths:
+            config = Config(hidden_size=[width] * args.layers, run_mode="inference")
+            model = build_model(config)
+            params = sum(p.numel() for p in model.parameters())
+            path = Path(tmp) / f"model_{width}.pt"
+            save_checkpoint(path, model, config)
+            built = bench(config, args.repeat)
+            mapped = bench(path, args.repeat)
+            print(f"{width:>6} {params:>10} {built * 1e3:10.2f} {mapped * 1e3:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark data parallel training scaling over local CPU worker processes
+
+usage: python bench_distributed.py [--workers 1 2 4 8] [--basins N] [--epochs E]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bmi_pytorch.config import Config
+from bmi_pytorch.distributed import train_data_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    parser.add_argument("--basins", type=int, default=671 * 64)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--hidden-size", type=int, nargs="*", default=[10, 64, 64])
+    args = parser.parse_args()
+
+    precip = np.random.default_rng(42).uniform(-1, 1, (args.basins, 1))
+    runoff = 2 * precip + 1
+    config = Config(
+        hidden_size=args.hidden_size, epochs=args.epochs, batch_size=args.batch_size
+    )
+    print(f"basins={args.basins} epochs={args.epochs} hidden_size={args.hidden_size}")
+    print(f"{'workers':>7} {'wall s':>8} {'samples/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        _, history = train_data_parallel(config, runoff, precip, workers)
+        wall = time.perf_counter() - start
+        # median epoch throughput, excluding process start up
+        rate = float(np.median([stats.samples_per_second for stats in history]))
+        baseline = baseline or rate
+        print(f"{workers:>7} {wall:8.2f} {rate:12.1f} {rate / baseline:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the per-step cost of a coupled inference Bmi_Model under each dtype policy,
+with the framework exchanging double precision values (set_value, update, get_value)
+
+usage: python bench_dtype.py [--basins 1 671] [--hidden-size 10 64 64] [--steps N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bmi_pytorch.bmi_model import Bmi_Model
+from bmi_pytorch.config import Config
+
+# (compute_dtype, exchange_dtype)
+POLICIES = [
+    ("float32", "float32"),
+    ("float32", "float64"),
+    ("float64", "float64"),
+    ("bfloat16", "float64"),
+]
+
+
+def bench(config: Config, steps: int) -> float:
+    """Mean microseconds per coupling step"""
+    model = Bmi_Model()
+    model.initialize(config)
+    n = model.get_var_nbytes("runoff") // model.get_var_itemsize("runoff")
+    precip = np.random.default_rng(0).uniform(0, 10, n)
+    runoff = np.empty(n)
+    for _ in range(100):  # warm up
+        model.set_value("precipitation", precip)
+        model.update()
+        model.get_value("runoff", runoff)
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.set_value("precipitation", precip)
+        model.update()
+        model.get_value("runoff", runoff)
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--basins", type=int, nargs="*", default=[0, 671])
+    parser.add_argument("--hidden-size", type=int, nargs="*", default=[10, 64, 64])
+    parser.add_argument("--steps", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'basins':>6} {'compute':>9} {'exchange':>9} {'us/step':>9}")
+    for basins in args.basins:
+        for compute, exchange in POLICIES:
+            config = Config(
+                hidden_size=args.hidden_size,
+                basins=basins,
+                run_mode="inference",
+                compute_dtype=compute,
+                exchange_dtype=exchange,
+            )
+            cost = bench(config, args.steps)
+            print(f"{basins:>6} {compute:>9} {exchange:>9} {cost:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark the per update latency of Bmi_Model with each inference engine on CPU
+
+usage: python bench_engine.py [--updates N] [--hidden-size 10 10]
+"""
+
+import argparse
+import time
+
+import torch
+
+from bmi_pytorch.bmi_model import Bmi_Model
+from bmi_pytorch.config import Config
+
+
+def bench(engine: str, hidden_size, updates: int) -> float:
+    """Average seconds per Bmi_Model.update call"""
+    model = Bmi_Model()
+    model.initialize(
+        Config(hidden_size=hidden_size, engine=engine, run_mode="inference")
+    )
+    model.input = torch.rand(1, 1)
+    for _ in range(100):  # warm up
+        model.update()
+    start = time.perf_counter()
+    for _ in range(updates):
+        model.update()
+    return (time.perf_counter() - start) / updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--hidden-size", type=int, nargs="*", default=[10, 10])
+    parser.add_argument("--engines", nargs="*", default=["eager", "script", "compile"])
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    print(f"hidden_size={args.hidden_size} updates={args.updates}")
+    baseline = None
+    for engine in args.engines:
+        latency = bench(engine, args.hidden_size, args.updates)
+        baseline = baseline or latency
+        print(
+            f"{engine:>8}: {latency * 1e6:8.2f} us/update  ({baseline / latency:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark worker startup (import, initialize, first update) and resident memory of
+the torch Bmi_Model against the torch free Bmi_NumpyModel, each in a new process
+
+Requires Linux (/proc/self/status)
+
+usage: python bench_numpy.py [--hidden-size 10 10] [--basins 0] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bmi_pytorch.config import Config
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+from {module} import {cls}
+model = {cls}()
+model.initialize({source!r})
+model.update()
+seconds = time.perf_counter() - start
+# peak resident set of this process, ru_maxrss would include the parent's pre-exec peak
+status = dict(l.split(":", 1) for l in open("/proc/self/status").read().splitlines())
+rss = int(status["VmHWM"].split()[0])
+print(json.dumps({{"seconds": seconds, "rss_kb": rss, "torch": "torch" in sys.modules}}))
+"""
+
+
+def run(module: str, cls: str, source: str, cwd: str) -> dict:
+    script = WORKER.format(module=module, cls=cls, source=source)
+    result = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, cwd=cwd
+    )
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hidden-size", type=int, nargs="*", default=[10, 10])
+    parser.add_argument("--basins", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # torch is only needed here to export the bundle
+    from bmi_pytorch.model import Model
+    from bmi_pytorch.numpy_model import export_bundle
+
+    config = Config(
+        hidden_size=args.hidden_size, basins=args.basins, run_mode="inference"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.json"
+        config_file.write_text(config.model_dump_json())
+        bundle = Path(tmp) / "model.npz"
+        export_bundle(Model(config), config, bundle)
+        backends = [
+            ("torch", "bmi_pytorch.bmi_model", "Bmi_Model", str(config_file)),
+            ("numpy", "bmi_pytorch.numpy_model", "Bmi_NumpyModel", str(bundle)),
+        ]
+        print(f"{'backend':>8} {'startup ms':>11} {'peak rss MB':>11} {'torch':>6}")
+        for name, module, cls, source in backends:
+            runs = [run(module, cls, source, tmp) for _ in range(args.repeat)]
+            seconds = statistics.median(r["seconds"] for r in runs)
+            rss = statistics.median(r["rss_kb"] for r in runs) / 1024
+            print(
+                f"{name:>8} {seconds * 1e3:11.1f} {rss:11.1f} {runs[0]['torch']!s:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
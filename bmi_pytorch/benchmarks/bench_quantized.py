@@ -0,0 +1,77 @@
+"""
+Benchmark the int8 quantized inference engine against the float32 eager Model, the
+forward pass throughput for each hidden layer width and the accuracy on CAMELS data
+
+usage: python bench_quantized.py [--widths 64 256 1024 2048] [--layers 3] [--batch 671]
+    [--data path/to/CAMELS] [--backend x86|fbgemm|qnnpack]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import torch
+
+from bmi_pytorch.config import Config
+from bmi_pytorch.engine import build_engine
+from bmi_pytorch.model import Model
+from bmi_pytorch.quantized import accuracy_report
+from bmi_pytorch.utils import load_data, normalize
+
+
+def throughput(forward, input: torch.Tensor, seconds: float) -> float:
+    """Forward passes per second"""
+    with torch.inference_mode():
+        for _ in range(10):  # warm up
+            forward(input)
+        calls = 0
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            forward(input)
+            calls += 1
+    return calls / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--widths", type=int, nargs="*", default=[64, 256, 1024, 2048])
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=671)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(__file__).parents[1] / "tests/data/CAMELS",
+        help="CAMELS data directory for the accuracy report",
+    )
+    parser.add_argument("--backend", default=torch.backends.quantized.engine)
+    args = parser.parse_args()
+    torch.backends.quantized.engine = args.backend
+
+    precip = None
+    if args.data.exists():
+        _, precip = load_data(args.data)
+        precip = torch.as_tensor(normalize(precip), dtype=torch.float32)
+    input = torch.rand(args.batch, 1)
+
+    print(f"quantized backend: {args.backend}")
+    print(
+        f"{'width':>6} {'fp32/s':>10} {'int8/s':>10} {'speedup':>8}"
+        f" {'max abs err':>12} {'rel rmse':>9}"
+    )
+    for width in args.widths:
+        # Model skips the first hidden size, see Model.__init__
+        config = Config(hidden_size=[1] + [width] * args.layers)
+        model = Model(config).eval()
+        int8 = build_engine(model, "int8", input)
+        fp32 = throughput(model, input, args.seconds)
+        quantized = throughput(int8, input, args.seconds)
+        line = f"{width:>6} {fp32:10.1f} {quantized:10.1f} {quantized / fp32:8.2f}"
+        if precip is not None:
+            report = accuracy_report(model, int8, precip)
+            line += f" {report.max_abs_error:12.4g} {report.relative_rmse:9.4f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
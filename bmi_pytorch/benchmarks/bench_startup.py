@@ -0,0 +1,70 @@
+"""
+Benchmark the cold start of a Bmi_Model worker, each stage timed in a new interpreter:
+import bmi_pytorch.bmi_model, Bmi_Model(), and initialize (which loads torch)
+
+usage: python bench_startup.py [--repeat 10] [--importtime]
+    --importtime prints python -X importtime output for the import, slowest first
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+from bmi_pytorch.bmi_model import Bmi_Model
+imported = time.perf_counter()
+model = Bmi_Model()
+constructed = time.perf_counter()
+model.initialize()
+initialized = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "initialize": initialized - constructed,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.importtime:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-X",
+                    "importtime",
+                    "-c",
+                    "import bmi_pytorch.bmi_model",
+                ],
+                capture_output=True,
+                cwd=tmp,
+            )
+            lines = result.stderr.decode().splitlines()[1:]
+            lines.sort(key=lambda line: int(line.split("|")[1]), reverse=True)
+            print("\n".join(lines[:20]))
+            return
+        runs = []
+        for _ in range(args.repeat):
+            result = subprocess.run(
+                [sys.executable, "-c", WORKER], check=True, capture_output=True, cwd=tmp
+            )
+            runs.append(json.loads(result.stdout.decode().strip().splitlines()[-1]))
+
+    print(f"{'stage':>10} {'median ms':>10} {'max ms':>8}")
+    for stage in ("import", "construct", "initialize"):
+        times = [r[stage] * 1e3 for r in runs]
+        print(f"{stage:>10} {statistics.median(times):10.1f} {max(times):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark aggregate Bmi_Model update throughput against torch thread settings for
+1, 8, and 64 concurrent instances, each in its own worker process
+
+usage: python bench_threads.py [--instances 1 8 64] [--threads 1 2 4 0] [--seconds S]
+    a thread count of 0 leaves the torch default
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+
+import torch
+
+from bmi_pytorch.bmi_model import Bmi_Model
+from bmi_pytorch.config import Config
+
+
+def worker(threads: int, hidden_size, basins: int, seconds: float, start, queue):
+    model = Bmi_Model()
+    threads = threads or None
+    model.initialize(
+        Config(
+            hidden_size=hidden_size,
+            basins=basins,
+            run_mode="inference",
+            intra_op_threads=threads,
+            inter_op_threads=threads,
+        )
+    )
+    start.wait()
+    updates = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        model.update()
+        updates += 1
+    queue.put(updates)
+
+
+def bench(instances: int, threads: int, args) -> float:
+    """Total updates per second of all instances"""
+    # fork shares the imported torch pages, the thread pools start in the workers
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    start = ctx.Event()
+    queue = ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=worker,
+            args=(threads, args.hidden_size, args.basins, args.seconds, start, queue),
+        )
+        for _ in range(instances)
+    ]
+    for p in procs:
+        p.start()
+    start.set()
+    total = sum(queue.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / args.seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, nargs="*", default=[1, 8, 64])
+    parser.add_argument("--threads", type=int, nargs="*", default=[1, 2, 4, 0])
+    parser.add_argument("--hidden-size", type=int, nargs="*", default=[10, 64, 64])
+    parser.add_argument("--basins", type=int, default=671)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"default torch threads: {torch.get_num_threads()}")
+    print(f"{'instances':>9} {'threads':>8} {'updates/s':>12}")
+    for instances in args.instances:
+        for threads in args.threads:
+            rate = bench(instances, threads, args)
+            label = threads or "default"
+            print(f"{instances:>9} {label:>8} {rate:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Variables and grids of the runoff model BMI, shared by the torch (Bmi_Model)
+and NumPy (Bmi_NumpyModel) backends
+
+This module doesn't import torch, the backends provide the exchange buffers.
+
+@version 0.1.0
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Tuple, Union
+
+import numpy as np
+from bmi_sdk import UnknownBMIVariable
+from bmi_sdk.bmi_grid import Grid, GridType
+from bmi_sdk.bmi_minimal import Bmi_Minimal
+from bmi_sdk.bmi_var import ValueStore, VarInfo
+from numpy import ndarray
+
+# pydantic (Config) is imported on first use
+if TYPE_CHECKING:
+    from .config import Config
+
+
+class Bmi_Base(Bmi_Minimal):
+    """BMI variables of the runoff model, bound to the input and output buffers of
+    a backend (self.input, self.output, self.spread)
+    """
+
+    def __init__(self):
+        super(Bmi_Base, self).__init__()
+        self.input_names: Tuple[str] = ("precipitation",)
+        self._set_output_names()
+        self._build_grids()
+        # Scalar grid buffers until initialize allocates the backend's buffers
+        self.input = np.zeros((1, 1), dtype=np.float32)
+        self.output = np.zeros((1, 1), dtype=np.float32)
+        # ensemble spread of the output, see Config.ensemble_size
+        self.spread = np.zeros((1, 1), dtype=np.float32)
+        # numpy views of each buffer, as returned by get_value_ptr
+        self._ptrs: Dict[str, ndarray] = {}
+        # Rebinding a variable's buffer invalidates its cached VarInfo and view
+        self._values = ValueStore(self._var_info, self._ptrs)
+        self._bind_values()
+
+    @staticmethod
+    def _read_config(config_file: Union[str, Path, "Config", None]) -> "Config":
+        """Config instance, json Config file, or None for the default Config values"""
+        from .config import Config
+
+        if isinstance(config_file, Config):
+            # validated again, fields may have been assigned since it was built
+            return Config.model_validate(config_file)
+        if config_file:
+            return Config.model_validate_json(Path(config_file).read_text())
+        return Config()
+
+    def _bind_values(self, ensemble: bool = False) -> None:
+        """Bind each variable to its buffer
+
+        Args:
+            ensemble (bool, optional): Bind the ensemble spread output. Defaults to False.
+        """
+        for name in self.input_names:
+            self._values[name] = self.input
+        self._values["runoff"] = self.output
+        if ensemble:
+            self._values["runoff_spread"] = self.spread
+        elif "runoff_spread" in self._values:
+            del self._values["runoff_spread"]
+
+    @staticmethod
+    def _as_array(value) -> ndarray:
+        """Numpy array sharing the memory of a buffer (ndarray or cpu Tensor)"""
+        return np.asarray(value)
+
+    def _set_output_names(self, ensemble: bool = False) -> None:
+        """Set the output variables, and the units of all variables
+
+        Args:
+            ensemble (bool, optional): Add the ensemble spread output. Defaults to False.
+        """
+        self.output_names: Tuple[str] = ("runoff",)
+        if ensemble:
+            # runoff is the ensemble mean
+            self.output_names += ("runoff_spread",)
+        self._var_names = frozenset(self.input_names + self.output_names)
+        self.units = {k: "-" for k in self.input_names + self.output_names}
+
+    def _build_grids(self, basins: int = 0, grid_type: str = "vector") -> None:
+        """Create the grid all variables are mapped to
+
+        Args:
+            basins (int, optional): Number of basins. Defaults to 0, a scalar grid.
+            grid_type (str, optional): Grid type for multiple basins, "vector" or "points".
+        """
+        if basins:
+            # Grid 0 is a 1 dimension grid with one element per basin, so each
+            # update is a single (basins, input_size) forward pass
+            self.grid_0: Grid = Grid(0, 1, GridType(grid_type))
+            self.grid_0.shape = (basins,)
+        else:
+            # Grid 0 is a 0 dimension "grid" for scalars
+            self.grid_0: Grid = Grid(0, 0, GridType.scalar)
+        # all inputs and outputs map to grid 0
+        self.grid_map = {k: self.grid_0 for k in self.input_names + self.output_names}
+        self._grids.clear()
+        self.register_grid(self.grid_0)
+
+    @staticmethod
+    def _grid_elements(grid: Grid) -> int:
+        """Number of values a variable on @p grid holds, a scalar grid holds one"""
+        return 1 if grid.rank == 0 else int(grid.size)
+
+    def finalize(self):
+        """Clean up any internal resources of the model"""
+        pass
+
+    def get_component_name(self) -> str:
+        """Name of this BMI module component.
+
+        Returns:
+            str: Model Name
+        """
+        return "Tensor Test"
+
+    def get_input_item_count(self) -> int:
+        """Number of model input variables
+
+        Returns:
+            int: number of input variables
+        """
+        return len(self.input_names)
+
+    def get_input_var_names(self) -> Tuple[str, ...]:
+        """The names of each input variables
+
+        Returns:
+            tuple[str, ...]: iterable tuple of input variable names
+        """
+        return self.input_names
+
+    def get_output_item_count(self) -> int:
+        """Number of model output variables
+
+        Returns:
+            int: number of output variables
+        """
+        return len(self.output_names)
+
+    def get_output_var_names(self) -> Tuple[str, ...]:
+        """The names of each output variable
+
+        Returns:
+            tuple[str, ...]: iterable tuple of output variable names
+        """
+        return self.output_names
+
+    # BMI Variable Query
+    def get_value_ptr(self, name: str) -> ndarray:
+        # The view is cached until the buffer is rebound, buffers are updated in place
+        try:
+            return self._ptrs[name]
+        except KeyError:
+            pass
+        np_array = self._as_array(self._values[name])
+        shape = np_array.shape
+        try:
+            # see if raveling is possible without a copy
+            np_array.shape = (-1,)
+            # reset original shape
+            np_array.shape = shape
+        except ValueError as e:
+            raise RuntimeError(
+                "Cannot flatten array without copying -- " + str(e).split(": ")[-1]
+            )
+        np_array = self._ptrs[name] = np_array.ravel()
+        return np_array
+
+    # BMI Variable Information Functions
+    def _build_var_info(self, name: str) -> VarInfo:
+        """Build the meta data of a variable from its buffer and grid
+
+        Args:
+            name (str): Name of variable.
+
+        Raises:
+            UnknownBMIVariable: name is not recognized
+
+        Returns:
+            VarInfo: meta data of the variable
+        """
+        if name not in self._var_names:
+            raise (UnknownBMIVariable(f"No known variable in BMI model: {name}"))
+        array = self.get_value_ptr(name)
+        return VarInfo(
+            dtype=str(array.dtype),
+            itemsize=array.itemsize,
+            nbytes=array.nbytes,
+            size=array.size,
+            grid=self.grid_map[name].id,
+            units=self.units[name],
+            location="node",
+        )
+
+    def get_var_grid(self, name: str) -> int:
+        """Get the grid identiferier associated with a given variable
+
+        Args:
+            name (str): name of the variable
+
+        Raises:
+            UnknownBMIVariable: name is not recognized, grid unknown
+
+        Returns:
+            int: grid identifier associated with @p name
+        """
+        return self.get_var_info(name).grid
+
+    def get_var_units(self, name: str) -> str:
+        """Get units of the given variable
+
+        Args:
+            name (str): variable name
+
+        Raises:
+            UnknownBMIVariable: name is not recognized, units unknown
+
+        Returns:
+            str: units
+        """
+        return self.get_var_info(name).units
+
+    def get_var_location(self, name: str) -> str:
+        """Location of the variable relative to the grid
+
+        Args:
+            name (str): name of the BMI variable
+
+        Raises:
+            UnknownBMIVariable: name is not recognized, location unknown
+
+        Returns:
+            str: location on the grid, e.g. node, face
+        """
+        return self.get_var_info(name).location
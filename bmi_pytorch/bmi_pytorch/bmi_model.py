@@ -1,17 +1,22 @@
-from typing import List, Tuple
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
 
-import torch
 from bmi_sdk import UnknownBMIVariable
-from bmi_sdk.bmi_grid import Grid, GridType
-from bmi_sdk.bmi_minimal import Bmi_Minimal
+from bmi_sdk.bmi_clock import Clock
 from numpy import ndarray
-from torch import Tensor
 
-from .config import Config
-from .model import Model
+from .bmi_base import Bmi_Base
 
+# torch, and the modules using it, are imported by initialize rather than here, so
+# constructing a Bmi_Model and querying its metadata doesn't pay for loading them
+if TYPE_CHECKING:
+    from torch import Tensor
 
-class Bmi_Model(Bmi_Minimal):
+    from .config import Config
+
+
+class Bmi_Model(Bmi_Base):
     """BMI composition wrapper for Model
 
     Args:
@@ -20,149 +25,217 @@ class Bmi_Model(Bmi_Minimal):
 
     def __init__(self):
         super(Bmi_Model, self).__init__()
-        # Grid 0 is a 0 dimension "grid" for scalars
-        self.grid_0: Grid = Grid(0, 0, GridType.scalar)
-        self.input_names: Tuple[str] = ("precipitation",)
-        self.output_names: Tuple[str] = ("runoff",)
-        # all inputs and outputs map to scalar grid
-        self.grid_map = {k: self.grid_0 for k in self.input_names + self.output_names}
-        self._grids: List[Grid] = [self.grid_0]
-
-        self.units = {k: "-" for k in self.input_names + self.output_names}
-
-        self.input = Tensor()
-        self.output = Tensor()
-        self._values = {}
-        for name in self.input_names:
-            self._values[name] = self.input
-        for name in self.output_names:
-            self._values[name] = self.output
-
-    def initialize(self, config_file: str):
-        """_summary_
+        # Forcing window staged by stage_forcing, and the next row of it to consume
+        self._window: Optional["Tensor"] = None
+        self._window_step: int = 0
+        self.history: Optional["Tensor"] = None
+
+    def initialize(self, config_file: Union[str, Path, "Config", None] = None):
+        """Build the Model and its inference engine from a configuration
 
         Args:
-            config (str): _description_
+            config_file (str | Path | Config | None): path to a json Config file or to a
+                checkpoint (.pt, see checkpoint.save_checkpoint), a Config instance, or
+                None to use the default Config values.  A checkpoint path uses the
+                Config saved with it, a Config naming a checkpoint in its checkpoint
+                field only takes the model fields from the checkpoint.
         """
-        _config = Config()  # Hack to get the default values. We can change later
-        self.model = Model(_config)
+        import torch
+
+        from .checkpoint import checkpoint_key, is_checkpoint, load_checkpoint
+        from .ensemble import build_model
+        from .precision import autocast, exchange_dtype, parameter_dtype
+        from .store import frozen_model, model_key, weight_store
+        from .threads import configure_threads
+
+        checkpoint: Optional[Path] = None
+        model = None
+        if isinstance(config_file, (str, Path)) and is_checkpoint(config_file):
+            checkpoint = Path(config_file)
+            _config, model = load_checkpoint(checkpoint)
+        else:
+            _config = self._read_config(config_file)
+            if _config.checkpoint is not None:
+                checkpoint = _config.checkpoint
+                if isinstance(config_file, (str, Path)):
+                    checkpoint = Path(config_file).parent / checkpoint
+                _config, model = load_checkpoint(checkpoint, config=_config)
+        self.config = _config
+        configure_threads(
+            _config.intra_op_threads, _config.inter_op_threads, _config.cpu_affinity
+        )
+        self._clock = Clock.from_time(_config.time)
+        self._window = None
+        self.history = None
+        ensemble: bool = _config.ensemble_size > 0
+        self._set_output_names(ensemble)
+        self._build_grids(_config.basins, _config.basin_grid)
+        # Preallocate the exchange buffers, update writes into these in place so
+        # pointers from get_value_ptr remain valid for the life of the model
+        n: int = self._grid_elements(self.grid_0)
+        exchange: torch.dtype = exchange_dtype(_config)
+        self.input = torch.zeros(n, _config.input_size, dtype=exchange)
+        self.output = torch.zeros(n, _config.output_size, dtype=exchange)
+        self.spread = torch.zeros(n, _config.output_size, dtype=exchange)
+        self._compute_dtype: torch.dtype = parameter_dtype(_config)
+        self._autocast = autocast(_config)
+        # Inputs are converted to the compute dtype in a preallocated buffer.  Training
+        # converts into new tensors, since the graph of the last update saves its input.
+        self._compute_input: Optional["Tensor"] = None
+        if self._compute_dtype != exchange and _config.run_mode == "inference":
+            self._compute_input = self.input.to(self._compute_dtype)
+        example: "Tensor" = self.input.to(self._compute_dtype)
+        self._bind_values(ensemble)
+
+        self.run_mode = _config.run_mode
         # TODO should these be attributes of the Bmi_Model, or the underlying Model?
         self.learning_rate = _config.learning_rate
-        self.optimizer = torch.optim.SGD(self.model.parameters(), self.learning_rate)
+        if self.run_mode == "inference":
+            # No one calls backward in a coupled run, so don't record a graph.
+            # Instances with the same model share one frozen copy of it, and its engine,
+            # from the process wide store and hold no optimizer state.
+            # A checkpoint's memory mapped parameters are shared by file identity.
+            key = checkpoint_key(checkpoint) if checkpoint else model_key(_config)
+            self.model = weight_store.get(
+                key, lambda: frozen_model(_config, _config.share_memory, model)
+            )
+            if _config.share_memory:
+                # The stored model may have been built by an instance that didn't share
+                # it, moving its parameters is a no-op once they are shared
+                self.model.share_memory()
+            self._forward = weight_store.get(
+                (key, _config.engine),
+                lambda: self._build_engine(_config.engine, example),
+            )
+            self.optimizer = None
+            self._grad_mode = torch.inference_mode
+        else:
+            self.model = model if model is not None else build_model(_config)
+            # Built once here so update pays no compilation/dispatch setup cost
+            self._forward = self._build_engine(_config.engine, example)
+            self.optimizer = torch.optim.SGD(
+                self.model.parameters(), self.learning_rate
+            )
+            self._grad_mode = nullcontext
+        if ensemble:
+            from .ensemble import ensemble_mean_spread
+
+            self._mean_spread = ensemble_mean_spread
+            self._update = self._update_ensemble
+        elif (
+            self.run_mode == "inference"
+            and self._forward is self.model
+            and self._compute_dtype == exchange
+            and _config.compute_dtype != "bfloat16"
+        ):
+            self._update = self._update_in_place
+        else:
+            self._update = self._update_copy
 
     def update(self):
         """Update the model for the internal timestep duration"""
-        self.output = self.model(self.input)
-
-    def finalize(self):
-        """Clean up any internal resources of the model"""
-        pass
-
-    def get_component_name(self) -> str:
-        """Name of this BMI module component.
-
-        Returns:
-            str: Model Name
-        """
-        return "Tensor Test"
-
-    def get_input_item_count(self) -> int:
-        """Number of model input variables
-
-        Returns:
-            int: number of input variables
-        """
-        return len(self.input_names)
-
-    def get_input_var_names(self) -> Tuple[str, ...]:
-        """The names of each input variables
-
-        Returns:
-            tuple[str, ...]: iterable tuple of input variable names
-        """
-        return self.input_names
-
-    def get_output_item_count(self) -> int:
-        """Number of model output variables
-
-        Returns:
-            int: number of output variables
-        """
-        return len(self.output_names)
-
-    def get_output_var_names(self) -> Tuple[str, ...]:
-        """The names of each output variable
-
-        Returns:
-            tuple[str, ...]: iterable tuple of output variable names
-        """
-        return self.output_names
-
-    # BMI Variable Query
-    def get_value_ptr(self, name: str) -> ndarray:
-        # np_array will share memory with the Tensor's
-        # numeric array, but won't have any other attributes
-        # of the Tensor.
-        np_array = self._values[name].numpy()
-        shape = np_array.shape
-        try:
-            # see if raveling is possible without a copy
-            np_array.shape = (-1,)
-            # reset original shape
-            np_array.shape = shape
-        except ValueError as e:
-            raise RuntimeError(
-                "Cannot flatten array without copying -- " + str(e).split(": ")[-1]
-            )
-        return np_array.ravel()
-
-    # BMI Variable Information Functions
-    def get_var_grid(self, name: str) -> int:
-        """Get the grid identiferier associated with a given variable
+        window = self._window
+        if window is not None and self._window_step < len(window):
+            step = self._window_step
+            self.input.copy_(window[step])
+            with self._grad_mode(), self._autocast():
+                self._update(self.input, self.output)
+            self.history[step].copy_(self.output)
+            self._window_step += 1
+        else:
+            with self._grad_mode(), self._autocast():
+                self._update(self.input, self.output)
+        self._clock.advance()
+
+    def update_until(self, time: float) -> None:
+        """Update the model until @p time
+
+        Timesteps covered by a staged forcing window (see stage_forcing) are evaluated
+        as one batched forward pass, since the Model is stateless.  Any remaining
+        timesteps are run one update at a time.
 
         Args:
-            name (str): name of the variable
-
-        Raises:
-            UnknownBMIVariable: name is not recognized, grid unknown
-
-        Returns:
-            int: grid identifier associated with @p name
+            time (float): model time to advance to
         """
-        if name in (self.input_names + self.output_names):
-            return 0  # should these be on a grid???
-
-        raise (UnknownBMIVariable(f"No known variable in BMI model: {name}"))
-
-    def get_var_itemsize(self, name: str) -> int:
-        """Size, in bytes, of a single element of the variable name
+        steps: int = self._clock.steps_until(time)
+        batch: int = 0
+        if self._window is not None and self.model.stateless:
+            batch = min(steps, len(self._window) - self._window_step)
+        if batch > 0:
+            self._update_window(batch)
+        for _ in range(steps - batch):
+            self.update()
+
+    def _update_window(self, steps: int) -> None:
+        """Run the next @p steps timesteps of the staged window as a single batch"""
+        start, end = self._window_step, self._window_step + steps
+        inputs: "Tensor" = self._window[start:end]
+        outputs: "Tensor" = self.history[start:end]
+        with self._grad_mode(), self._autocast():
+            self._update(
+                inputs.view(-1, self.input.shape[-1]),
+                outputs.view(-1, self.output.shape[-1]),
+            )
+        # Leave the exchange buffers as if each step had been run
+        self.input.copy_(inputs[-1])
+        self.output.copy_(outputs[-1])
+        self._window_step = end
+        self._clock.advance(steps)
 
-        Args:
-            name (str): variable name
+    def stage_forcing(self, name: str, values: ndarray) -> None:
+        """Stage a window of input values for the upcoming timesteps
 
-        Returns:
-            int: number of bytes representing a single variable of @p name
-        """
-        return self.get_value_ptr(name).itemsize
-
-    def get_var_nbytes(self, name: str) -> int:
-        """_summary_
+        Each row of @p values is copied into the input buffer by the update for its
+        timestep, starting with the next update.  Outputs of these timesteps are
+        recorded in self.history.
 
         Args:
-            name (str): Name of variable.
+            name (str): input variable name
+            values (ndarray): (n_steps, size) input values, one row per timestep
 
-        Returns:
-            int: Size of data array in bytes.
+        Raises:
+            UnknownBMIVariable: name is not an input variable
         """
-        return self.get_value_ptr(name).nbytes
-
-    def get_var_type(self, name: str) -> str:
-        """Data type of variable.
-
-        Args:
-            name (str): Name of variable.
-
-        Returns:
-            str: Data type.
+        if name not in self.input_names:
+            raise (UnknownBMIVariable(f"No known input variable in BMI model: {name}"))
+        import torch
+
+        window = torch.as_tensor(values, dtype=self.input.dtype)
+        self._window = window.reshape(-1, *self.input.shape).contiguous()
+        self._window_step = 0
+        self.history = torch.zeros(
+            len(self._window), *self.output.shape, dtype=self.output.dtype
+        )
+
+    def _build_engine(self, engine: str, example: "Tensor"):
+        """Build the inference engine, under the autocast policy it is run with"""
+        from .engine import build_engine
+
+        with self._autocast():
+            return build_engine(self.model, engine, example)
+
+    def _compute_tensor(self, input: "Tensor") -> "Tensor":
+        """@p input in the dtype of the Model parameters"""
+        if input.dtype == self._compute_dtype:
+            return input
+        if input is self.input and self._compute_input is not None:
+            return self._compute_input.copy_(input)
+        return input.to(self._compute_dtype)
+
+    def _update_in_place(self, input: "Tensor", output: "Tensor"):
+        """Forward pass writing the final layer directly into the output buffer"""
+        self.model(input, out=output)
+
+    def _update_copy(self, input: "Tensor", output: "Tensor"):
+        """Forward pass through the engine, copying the result into the output buffer"""
+        # Hold on to the result, in training mode it carries the autograd graph
+        self.prediction = self._forward(self._compute_tensor(input))
+        output.copy_(self.prediction.detach())
+
+    def _update_ensemble(self, input: "Tensor", output: "Tensor"):
+        """Forward pass of every ensemble member, writing the mean into the output buffer
+        and the spread of the last rows (the latest timestep) into the spread buffer
         """
-        return str(self.get_value_ptr(name).dtype)
+        self.prediction = self._forward(self._compute_tensor(input))
+        result: "Tensor" = self.prediction.detach().to(output.dtype)
+        self._mean_spread(result, output, self.spread)
@@ -0,0 +1,94 @@
+"""
+Checkpoints of a Model (or Ensemble) and its Config, loaded by memory mapping
+
+A checkpoint is a torch.save archive holding only the Config fields and the state_dict
+tensors, so it can be loaded with weights_only=True and mmap=True.  The loaded
+parameters are views of the (copy on write) mapped file, nothing is copied or
+unpickled beyond the tensor metadata, and instances loading the same file share the
+page cache.
+
+The model fields of the saved Config (store._MODEL_FIELDS) describe the parameters,
+the runtime fields (run_mode, engine, basins, ...) can be taken from another Config,
+e.g. one naming the checkpoint in its checkpoint field.
+
+@version 0.1.0
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import torch
+
+from .config import Config
+from .ensemble import Ensemble, build_model
+from .model import Model
+from .store import _MODEL_FIELDS
+
+log = logging.getLogger(__name__)
+
+# File suffixes recognized as checkpoints by Bmi_Model.initialize
+CHECKPOINT_SUFFIXES = (".pt", ".pth")
+
+
+def is_checkpoint(path: os.PathLike) -> bool:
+    """Whether @p path names a checkpoint rather than a json Config file"""
+    return Path(path).suffix in CHECKPOINT_SUFFIXES
+
+
+def checkpoint_key(path: os.PathLike) -> str:
+    """Identity of the checkpoint file at @p path, changes when the file is rewritten"""
+    path = Path(path).resolve()
+    return f"{path}:{path.stat().st_mtime_ns}"
+
+
+def save_checkpoint(
+    path: os.PathLike, model: Union[Model, Ensemble], config: Config
+) -> None:
+    """Write @p model and the @p config it was built from to a checkpoint
+
+    Args:
+        path (os.PathLike): checkpoint file, e.g. model.pt
+        model (Union[Model, Ensemble]): model to save
+        config (Config): configuration the model was built from
+    """
+    state = {k: v.detach().contiguous() for k, v in model.state_dict().items()}
+    torch.save({"config": config.model_dump(), "state_dict": state}, path)
+
+
+def load_checkpoint(
+    path: os.PathLike, mmap: bool = True, config: Optional[Config] = None
+) -> Tuple[Config, Union[Model, Ensemble]]:
+    """Load the Config and model of a checkpoint
+
+    The model is built without initializing its parameters, which are then replaced by
+    the checkpoint tensors.
+
+    Args:
+        path (os.PathLike): checkpoint file
+        mmap (bool, optional): Memory map the tensors rather than reading them into
+            memory. Defaults to True.
+        config (Config, optional): runtime settings, e.g. run_mode and engine, to use
+            with the saved model fields. Defaults to None, the saved Config.
+
+    Returns:
+        Tuple[Config, Union[Model, Ensemble]]: configuration and model
+    """
+    checkpoint = torch.load(path, map_location="cpu", mmap=mmap, weights_only=True)
+    config = _merge(checkpoint["config"], config)
+    # Allocate no parameter storage, it is assigned from the checkpoint
+    with torch.device("meta"):
+        model = build_model(config)
+    model.load_state_dict(checkpoint["state_dict"], assign=True)
+    log.debug("Loaded checkpoint %s", path)
+    return config, model
+
+
+def _merge(saved: dict, config: Optional[Config]) -> Config:
+    """@p config with the model fields of the @p saved Config fields"""
+    if config is None:
+        return Config.model_validate(saved)
+    model_fields = Config.model_validate(saved).model_dump(include=_MODEL_FIELDS)
+    # validated again, e.g. the int8 engine checks the saved compute_dtype
+    return Config.model_validate({**config.model_dump(), **model_fields})
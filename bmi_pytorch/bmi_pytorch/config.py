@@ -1,14 +1,81 @@
 import logging
-from typing import List, Union
+from pathlib import Path
+from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from bmi_sdk.bmi_time import BmiTime
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 log = logging.getLogger(__name__)
 
 
 class Config(BaseModel):
+    # Validate Config instances again when passed to model_validate (e.g. by
+    # Bmi_Model.initialize), since fields may have been assigned after construction
+    model_config = ConfigDict(revalidate_instances="always")
+
     input_size: int = 1
     output_size: int = 1
     hidden_size: List[Union[None, int]] = Field(default_factory=lambda: [10, 10])
     learning_rate: float = 0.005
     epochs: int = 800
+    # Mini-batch training, see trainer.Trainer
+    batch_size: int = Field(default=64, ge=1)
+    accumulation_steps: int = Field(default=1, ge=1)
+    # Stop training after this many epochs without a loss improvement of min_delta
+    patience: Optional[int] = Field(default=None, ge=1)
+    min_delta: float = 0.0
+    # Dtype the Model computes in, and of the Bmi_Model exchange buffers, see precision
+    compute_dtype: Literal["float32", "float64", "bfloat16"] = "float32"
+    exchange_dtype: Literal["float32", "float64"] = "float32"
+    # Fold the (activation free) layer stack into a single affine map when the
+    # Model is in eval mode
+    collapse_layers: bool = False
+    # Pack all Model parameters into one contiguous flat Parameter, see Model.flat
+    flat_parameters: bool = False
+    # Inference engine used by Bmi_Model.update, see engine.build_engine.
+    # "int8" runs dynamically quantized weights, see quantized.QuantizedModel
+    engine: Literal["eager", "script", "compile", "int8"] = "eager"
+    # Bmi_Model run mode, inference runs update without autograd
+    run_mode: Literal["training", "inference"] = "training"
+    # Inference models are shared between instances, optionally in shared memory
+    # so forked or spawned workers use the same pages
+    share_memory: bool = False
+    # Number of basins evaluated together by Bmi_Model, each variable is then a
+    # basin_grid ("vector" or "points") grid of this size.  0 uses a scalar grid.
+    basins: int = Field(default=0, ge=0)
+    basin_grid: Literal["vector", "points"] = "vector"
+    # Number of ensemble members evaluated together by Bmi_Model, which then reports
+    # the ensemble mean as runoff and its spread as runoff_spread.  0 is a single Model.
+    ensemble_size: int = Field(default=0, ge=0)
+    # Torch thread pool sizes and CPU affinity for the process, see threads.configure_threads.
+    # None leaves the torch setting as is, 1 suits many small models per node.
+    intra_op_threads: Optional[int] = Field(default=None, ge=1)
+    inter_op_threads: Optional[int] = Field(default=None, ge=1)
+    cpu_affinity: Optional[List[int]] = None
+    # Model clock, each update advances time by time.time_step
+    time: BmiTime = Field(default_factory=BmiTime)
+    # Checkpoint (.pt) Bmi_Model.initialize loads the Model from.  Its saved model
+    # fields (store._MODEL_FIELDS) replace these, the other (runtime) fields are kept.
+    # A relative path is relative to the json Config file.
+    checkpoint: Optional[Path] = None
+
+    @model_validator(mode="after")
+    def _check_engine(self) -> "Config":
+        """Reject engines which can't be used with the other settings"""
+        if self.engine != "eager" and self.run_mode != "inference":
+            # The graph engines run the model in eval mode, and "script" and "int8"
+            # snapshot the weights, so training couldn't update their outputs
+            raise ValueError(
+                f'engine "{self.engine}" requires run_mode "inference", training uses '
+                'the "eager" engine'
+            )
+        if self.engine == "int8":
+            # QuantizedModel quantizes the float32 weights of a single Model
+            if self.compute_dtype != "float32":
+                raise ValueError(
+                    f'engine "int8" requires compute_dtype "float32", not '
+                    f'"{self.compute_dtype}"'
+                )
+            if self.ensemble_size:
+                raise ValueError('engine "int8" does not support an ensemble')
+        return self
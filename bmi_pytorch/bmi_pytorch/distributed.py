@@ -0,0 +1,191 @@
+"""
+Data parallel training of a Model across local CPU worker processes
+
+Workers communicate through torch.distributed with the gloo backend, rendezvousing
+through a file, so no network services are required.
+
+@version 0.1.0
+"""
+
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch import Tensor
+from torch.nn.utils import parameters_to_vector
+
+from .config import Config
+from .model import Model
+from .trainer import EpochStats, Trainer
+
+log = logging.getLogger(__name__)
+
+
+def shard(array: np.ndarray, rank: int, world_size: int) -> np.ndarray:
+    """Contiguous block of basins (rows) of @p array owned by @p rank
+
+    Args:
+        array (np.ndarray): (N, ...) data of N basins
+        rank (int): worker rank
+        world_size (int): number of workers
+
+    Returns:
+        np.ndarray: view of the rank's rows, sizes differ by at most one row
+    """
+    return np.array_split(array, world_size)[rank]
+
+
+class DistributedTrainer(Trainer):
+    """
+    Trainer for one worker of a data parallel group, gradients and losses are
+    averaged over all workers so every worker takes identical optimizer steps.
+
+    config.batch_size is the batch size of each worker.  Workers with a smaller shard
+    use slightly smaller batches, so every worker runs the same number of batches.
+    """
+
+    def __init__(self, model: Model, config: Config, runoff, precip, validation=None):
+        self.world_size: int = dist.get_world_size()
+        samples: int = len(precip)
+        largest = torch.tensor(samples)
+        dist.all_reduce(largest, op=dist.ReduceOp.MAX)
+        total = torch.tensor(samples)
+        dist.all_reduce(total)
+        batches: int = -(-int(largest) // config.batch_size)
+        config = config.model_copy(update={"batch_size": -(-samples // batches)})
+        super().__init__(model, config, runoff, precip, validation)
+
+        self._global_samples: int = int(total)
+        # Weight each worker's (mean) gradients by its share of the samples
+        self._grad_scale: float = samples / self._global_samples
+        # Start every worker from the same parameters
+        for p in self.model.parameters():
+            dist.broadcast(p.data, src=0)
+
+    def _reduce_gradients(self) -> None:
+        """All-reduce the gradients as one flat buffer and average them"""
+        grads: List[Tensor] = [p.grad for p in self.model.parameters()]
+        flat = parameters_to_vector(grads)
+        flat.mul_(self._grad_scale)
+        dist.all_reduce(flat)
+        offset: int = 0
+        for grad in grads:
+            size = grad.numel()
+            grad.copy_(flat[offset : offset + size].view_as(grad))
+            offset += size
+
+    def _reduce_loss(self, total: Tensor, samples: int) -> float:
+        dist.all_reduce(total)
+        return total.item() / self._global_samples
+
+    def _total_samples(self) -> int:
+        return self._global_samples
+
+    def evaluate(self) -> float:
+        # Weight each worker's mean loss by its validation samples, as _reduce_loss does
+        samples: int = len(self._validation[0])
+        total = torch.tensor(
+            [super().evaluate() * samples, samples], dtype=torch.float64
+        )
+        dist.all_reduce(total)
+        return (total[0] / total[1]).item()
+
+
+def _worker(
+    rank: int,
+    world_size: int,
+    init_file: str,
+    config: Config,
+    runoff: np.ndarray,
+    precip: np.ndarray,
+    initial_state: Optional[Dict[str, np.ndarray]],
+    results: Dict,
+) -> None:
+    dist.init_process_group(
+        "gloo", init_method=f"file://{init_file}", rank=rank, world_size=world_size
+    )
+    try:
+        # Each worker uses a single thread, the parallelism is across workers
+        torch.set_num_threads(1)
+        model = Model(config)
+        if initial_state is not None:
+            model.load_state_dict(
+                {k: torch.from_numpy(v) for k, v in initial_state.items()}
+            )
+        trainer = DistributedTrainer(
+            model,
+            config,
+            shard(runoff, rank, world_size),
+            shard(precip, rank, world_size),
+        )
+        history = trainer.fit()
+        if rank == 0:
+            results["history"] = history
+            results["state_dict"] = {
+                k: v.numpy().copy() for k, v in model.state_dict().items()
+            }
+    finally:
+        dist.destroy_process_group()
+
+
+def train_data_parallel(
+    config: Config,
+    runoff: np.ndarray,
+    precip: np.ndarray,
+    world_size: int,
+    model: Optional[Model] = None,
+) -> Tuple[Model, List[EpochStats]]:
+    """Train a Model with @p world_size local worker processes, each on a shard of the basins
+
+    Args:
+        config (Config): training configuration
+        runoff (np.ndarray): (N, output_size) training targets, e.g. from utils.load_data
+        precip (np.ndarray): (N, input_size) training inputs
+        world_size (int): number of worker processes
+        model (Model, optional): model to start training from, and to load the trained
+            parameters into. Defaults to None, a new Model(config) is trained.
+
+    Raises:
+        ValueError: @p world_size is less than 1 or more than the N basins, a worker
+            would have no samples to train on
+
+    Returns:
+        Tuple[Model, List[EpochStats]]: the trained model, and statistics of each epoch
+            over all workers
+    """
+    if not 1 <= world_size <= len(precip):
+        raise ValueError(
+            f"world_size {world_size} must be between 1 and the {len(precip)} samples"
+        )
+    initial_state = None
+    if model is not None:
+        initial_state = {k: v.numpy() for k, v in model.state_dict().items()}
+    with tempfile.TemporaryDirectory() as tmp, mp.Manager() as manager:
+        results = manager.dict()
+        init_file = str(Path(tmp) / "rendezvous")
+        mp.spawn(
+            _worker,
+            args=(
+                world_size,
+                init_file,
+                config,
+                runoff,
+                precip,
+                initial_state,
+                results,
+            ),
+            nprocs=world_size,
+            join=True,
+        )
+        history = results["history"]
+        if model is None:
+            model = Model(config)
+        model.load_state_dict(
+            {k: torch.from_numpy(v) for k, v in results["state_dict"].items()}
+        )
+    return model, history
@@ -0,0 +1,88 @@
+"""
+Inference engines for running a Model forward pass with minimal per call overhead
+
+@version 0.1.0
+"""
+
+import logging
+import warnings
+from typing import Callable
+
+import torch
+from torch import Tensor
+
+from .model import Model
+from .quantized import QuantizedModel
+
+log = logging.getLogger(__name__)
+
+Engine = Callable[[Tensor], Tensor]
+
+
+def _script(model: Model, example: Tensor) -> Engine:
+    """Trace the model into a frozen TorchScript graph
+
+    Freezing inlines the parameters as constants, so the graph is a snapshot of the
+    current weights and must be rebuilt if the model is trained further.
+    """
+    model.eval()
+    with warnings.catch_warnings():
+        # torch.jit is deprecated in newer torch releases, but still functional
+        warnings.simplefilter("ignore", FutureWarning)
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example)
+        return torch.jit.freeze(traced)
+
+
+def _compile(model: Model, example: Tensor) -> Engine:
+    """Compile the model forward pass with torch.compile
+
+    Parameters are graph inputs, so updates to the model weights are seen by the engine.
+    """
+    model.eval()
+    compiled = torch.compile(model, dynamic=False, fullgraph=True)
+    # Trigger compilation now rather than on the first update
+    with torch.no_grad():
+        compiled(example)
+    return compiled
+
+
+def _int8(model: Model, example: Tensor) -> Engine:
+    """Dynamic int8 quantized snapshot of the model weights, see quantized.QuantizedModel"""
+    model.eval()
+    return QuantizedModel(model)
+
+
+_engines = {
+    "eager": lambda model, example: model,
+    "script": _script,
+    "compile": _compile,
+    "int8": _int8,
+}
+
+
+def build_engine(model: Model, engine: str, example: Tensor) -> Engine:
+    """Build a callable that evaluates the inference forward pass of @p model
+
+    The "eager" engine is the model itself.  The other engines switch the model to
+    eval mode, since they capture the inference graph (or weights).
+
+    Args:
+        model (Model): model to evaluate
+        engine (str): one of "eager", "script", "compile", or "int8"
+        example (Tensor): example input with the shape and dtype used for each call
+
+    Raises:
+        ValueError: unknown engine
+
+    Returns:
+        Engine: callable taking the input tensor and returning the model output
+    """
+    try:
+        build = _engines[engine]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine {engine}, expected one of {tuple(_engines)}"
+        ) from None
+    log.debug("Building %s inference engine", engine)
+    return build(model, example)
@@ -0,0 +1,137 @@
+"""
+Ensemble of Models evaluated together with batched matmuls
+
+@version 0.1.0
+"""
+
+from typing import Callable, List, Optional, Sequence, Union
+
+import torch
+from torch import Tensor
+from torch.nn import Parameter, ParameterList
+
+from .config import Config
+from .model import Model
+
+
+class Ensemble(torch.nn.Module):
+    """Ensemble of M Models with the same Config, with each layer's parameters
+    stacked into (M, ...) tensors so all members are evaluated by one batched matmul
+    (baddbmm) per layer, both for inference and for training.
+    """
+
+    # Like Model, members have no recurrent state
+    stateless: bool = True
+
+    def __init__(
+        self,
+        models: Sequence[Model],
+        activation: Optional[Callable] = None,
+    ):
+        """Stack the parameters of each member model
+
+        Args:
+            models (Sequence[Model]): members, each with the same layer sizes
+            activation (Callable, optional): Activation function to use. Defaults to None.
+        """
+        super(Ensemble, self).__init__()
+        if not models:
+            raise ValueError("An ensemble requires at least one member")
+        self.members: int = len(models)
+        self.weights: ParameterList = ParameterList()
+        self.bias: ParameterList = ParameterList()
+        for layer in range(len(models[0].weights)):
+            # (M, in, out) weights and (M, 1, out) bias, broadcast over the batch
+            self.weights.append(
+                Parameter(torch.stack([m.weights[layer].detach() for m in models]))
+            )
+            self.bias.append(
+                Parameter(
+                    torch.stack([m.bias[layer].detach() for m in models]).unsqueeze(1)
+                )
+            )
+        self.activation: Callable = activation
+
+    @classmethod
+    def from_config(cls, config: Config, members: int) -> "Ensemble":
+        """Ensemble of @p members independently initialized Models
+
+        Args:
+            config (Config): configuration of each member
+            members (int): number of members
+
+        Returns:
+            Ensemble: the ensemble
+        """
+        return cls([Model(config) for _ in range(members)])
+
+    def member(self, index: int) -> Model:
+        """Copy of a single member as a Model
+
+        Args:
+            index (int): member index
+
+        Returns:
+            Model: the member
+        """
+        input_size, output_size = self.weights[0].shape[1], self.weights[-1].shape[2]
+        # Model skips the first hidden size, see Model.__init__
+        hidden = [w.shape[2] for w in self.weights[:-1]]
+        config = Config(
+            input_size=input_size,
+            output_size=output_size,
+            hidden_size=[input_size] + hidden if hidden else [],
+        )
+        model = Model(config, activation=self.activation)
+        with torch.no_grad():
+            for layer, (weight, bias) in enumerate(zip(self.weights, self.bias)):
+                model.weights[layer].copy_(weight[index])
+                model.bias[layer].copy_(bias[index, 0])
+        return model
+
+    def forward(self, input: Tensor) -> Tensor:
+        """Forward pass of every member
+
+        Args:
+            input (Tensor): (N, input_size) input shared by the members
+
+        Returns:
+            Tensor: (M, N, output_size) result of each member
+        """
+        # expand is a view, the input isn't copied per member
+        result: Tensor = input.expand(self.members, *input.shape)
+        for weight, bias in zip(self.weights, self.bias):
+            result = torch.baddbmm(bias, result, weight)
+        if self.activation:
+            result = self.activation(result)
+        return result
+
+
+def build_model(config: Config) -> Union[Model, Ensemble]:
+    """The Model, or Ensemble of Models when config.ensemble_size is set, described by @p config
+
+    Args:
+        config (Config): model configuration
+
+    Returns:
+        Union[Model, Ensemble]: new model
+    """
+    if config.ensemble_size:
+        return Ensemble.from_config(config, config.ensemble_size)
+    return Model(config)
+
+
+def ensemble_mean_spread(result: Tensor, mean: Tensor, spread: Tensor) -> List[Tensor]:
+    """Mean and (population) standard deviation over the members of an Ensemble result
+
+    Args:
+        result (Tensor): (M, N, output_size) ensemble result
+        mean (Tensor): (N, output_size) tensor to write the mean into
+        spread (Tensor): (K, output_size) tensor to write the spread of the last K rows into
+
+    Returns:
+        List[Tensor]: [mean, spread]
+    """
+    torch.mean(result, 0, out=mean)
+    torch.std(result[:, -len(spread) :], 0, correction=0, out=spread)
+    return [mean, spread]
@@ -12,18 +12,61 @@ Torch model for a multi-layer Neural Network with weights and bias
 from math import sqrt
 
 # Typing imports
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import torch
 from torch import Tensor
 from torch.nn import Parameter, ParameterList
 
 from .config import Config
+from .precision import parameter_dtype
+
+
+class FlatViews(Sequence):
+    """Per-layer views of a Model's flat Parameter, used as Model.weights/Model.bias
+    when the parameters are packed (see Config.flat_parameters).
+
+    Views are created on access, so each forward pass records them in its own
+    autograd graph and gradients accumulate in the flat Parameter's grad.
+    """
+
+    def __init__(self, owner: torch.nn.Module, layout: List[Tuple[int, torch.Size]]):
+        """
+        Args:
+            owner (torch.nn.Module): module holding the flat Parameter as owner.flat
+            layout (List[Tuple[int, torch.Size]]): offset and shape of each view
+        """
+        self._owner = owner
+        self._layout = layout
+
+    def views(self, flat: Tensor) -> List[Tensor]:
+        """Views of @p flat with this layout, e.g. of the flat Parameter's grad
+
+        Args:
+            flat (Tensor): tensor with the same layout as the flat Parameter
+
+        Returns:
+            List[Tensor]: view of each layer
+        """
+        return [flat[o : o + shape.numel()].view(shape) for o, shape in self._layout]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tensor, List[Tensor]]:
+        if isinstance(index, slice):
+            return self.views(self._owner.flat)[index]
+        offset, shape = self._layout[index]
+        return self._owner.flat[offset : offset + shape.numel()].view(shape)
+
+    def __len__(self) -> int:
+        return len(self._layout)
 
 
 class Model(torch.nn.Module):
     """Multi-layer Neural Network Model"""
 
+    # Output depends only on the current input (no recurrent state), so independent
+    # timesteps can be evaluated together as a batch
+    stateless: bool = True
+
     def __init__(
         self,
         config: Config,
@@ -68,25 +111,113 @@ class Model(torch.nn.Module):
         self.weights[-1].data.uniform_(-self.std_deviation, self.std_deviation)
         self.bias[-1].data.uniform_(-self.std_deviation, self.std_deviation)
 
+        dtype: torch.dtype = parameter_dtype(config)
+        if dtype != torch.float32:
+            self.to(dtype)
+        if config.flat_parameters:
+            self._pack_parameters()
+
         # Hold activation function and dropout rate for use in forward pass
         self.activation: Callable = activation
         self.dropout_rate: float = dropout_rate
 
-    def forward(self, input: Tensor) -> Tensor:
+        # Cached single layer equivalent of the weights/bias stack, see collapsed()
+        self.collapse_layers: bool = config.collapse_layers
+        self._collapsed: Optional[Tuple[Tensor, Tensor]] = None
+        self._collapsed_key: Optional[Tuple[Tuple[int, int], ...]] = None
+
+    def _pack_parameters(self) -> None:
+        """Replace the per-layer Parameters with views into one flat Parameter
+
+        The flat Parameter (self.flat) is the only Parameter of the Model, so an
+        optimizer step is a single (fused) update, the state_dict is a single tensor,
+        and share_memory moves a single storage.
+        """
+        params: List[Tensor] = [p.detach() for p in [*self.weights, *self.bias]]
+        layout: List[Tuple[int, torch.Size]] = []
+        offset: int = 0
+        for p in params:
+            layout.append((offset, p.shape))
+            offset += p.numel()
+        layers: int = len(self.weights)
+        del self.weights, self.bias
+        self.flat: Parameter = Parameter(torch.cat([p.reshape(-1) for p in params]))
+        self.weights: FlatViews = FlatViews(self, layout[:layers])
+        self.bias: FlatViews = FlatViews(self, layout[layers:])
+
+    def collapsed(self) -> Tuple[Tensor, Tensor]:
+        """Fold each layer's weight and bias into a single affine map
+
+        Since the activation is only applied after the final layer, the layer stack
+        x @ W_0 + b_0 ... @ W_n + b_n is equivalent to x @ W + b where
+        W = W_0 @ ... @ W_n and b = (b_0 @ W_1 + b_1) ... @ W_n + b_n.
+
+        The folded weight and bias are cached and only recomputed when a parameter
+        is modified in place (e.g. an optimizer step or load_state_dict) or replaced.
+
+        Returns:
+            Tuple[Tensor, Tensor]: (input_size, output_size) weight and (output_size) bias
+        """
+        if torch.jit.is_tracing() or torch.compiler.is_compiling():
+            # The cache key (data pointers and version counters) can't be traced or
+            # compiled, fold the layers in the graph instead.  A frozen script graph
+            # folds them once, as constants.
+            return self._fold()
+        # Parameter version counters are bumped by every in-place modification
+        key = tuple((p.data_ptr(), p._version) for p in self.parameters())
+        if key != self._collapsed_key:
+            self._collapsed = self._fold()
+            self._collapsed_key = key
+        return self._collapsed
+
+    def _fold(self) -> Tuple[Tensor, Tensor]:
+        """Uncached single layer equivalent of the layer stack, see collapsed"""
+        with torch.no_grad():
+            weight: Tensor = self.weights[0].detach().clone()
+            bias: Tensor = self.bias[0].detach().clone()
+            for w, b in zip(self.weights[1:], self.bias[1:]):
+                bias = torch.matmul(bias, w.detach()) + b.detach()
+                weight = torch.matmul(weight, w.detach())
+        return weight, bias
+
+    def forward(self, input: Tensor, out: Optional[Tensor] = None) -> Tensor:
         """Forward pass of the network layers
 
         Args:
             input (Tensor): Input tensor
+            out (Tensor, optional): Preallocated tensor to write the result into.
+                Writing the final layer directly into @p out isn't differentiable, so
+                this is intended for use without autograd (e.g. torch.inference_mode).
 
         Returns:
             Tensor: Result of tensor applyed to each layer of the Model
         """
         result: Tensor = input
+        if self.collapse_layers and not self.training:
+            # Inference, a single matmul with the folded layers
+            weight, bias = self.collapsed()
+            weights, biases = (weight,), (bias,)
+        else:
+            weights, biases = self.weights, self.bias
+        # The final layer can be written straight into out when nothing follows it
+        last: int = (
+            len(weights) - 1 if not (self.activation or self.dropout_rate) else -1
+        )
         # Iterate each layer's weight and bias
-        for weight, bias in zip(self.weights, self.bias):
-            result = torch.matmul(result, weight) + bias
+        for i, (weight, bias) in enumerate(zip(weights, biases)):
+            if result.dim() == 2:
+                # fused matmul and bias add
+                result = torch.addmm(
+                    bias, result, weight, out=out if i == last else None
+                )
+            else:
+                result = torch.matmul(result, weight) + bias
         # Apply activation, if requested
         if self.activation:
             result = self.activation(result)
-        result = torch.dropout(result, self.dropout_rate, self.training)
+        # dropout is the identity with a zero rate, skip the call
+        if self.dropout_rate:
+            result = torch.dropout(result, self.dropout_rate, self.training)
+        if out is not None and result is not out:
+            result = out.copy_(result)
         return result
@@ -0,0 +1,48 @@
+"""
+Dtype policy of a Config, the dtype the Model computes in and the dtype of the
+Bmi_Model exchange buffers
+
+e.g. compute_dtype="float64", exchange_dtype="float64" runs double precision end to
+end with no conversions at the BMI boundary, while compute_dtype="float32",
+exchange_dtype="float64" computes in single precision and converts through
+preallocated buffers.  compute_dtype="bfloat16" keeps float32 parameters and runs
+the forward pass under CPU autocast.
+
+@version 0.1.0
+"""
+
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, ContextManager
+
+import torch
+
+from .config import Config
+
+DTYPES = {
+    "float32": torch.float32,
+    "float64": torch.float64,
+    "bfloat16": torch.bfloat16,
+}
+
+
+def parameter_dtype(config: Config) -> torch.dtype:
+    """Dtype of the Model parameters, and of the tensors passed to the Model"""
+    if config.compute_dtype == "bfloat16":
+        # autocast computes in bfloat16 from float32 parameters
+        return torch.float32
+    return DTYPES[config.compute_dtype]
+
+
+def exchange_dtype(config: Config) -> torch.dtype:
+    """Dtype of the Bmi_Model input and output buffers"""
+    return DTYPES[config.exchange_dtype]
+
+
+def autocast(config: Config) -> Callable[[], ContextManager]:
+    """Context manager factory to run the forward pass in, autocast for bfloat16"""
+    if config.compute_dtype == "bfloat16":
+        # Each update is its own autocast region, so the weight cast cache isn't
+        # reused, and it breaks tracing (engine "script")
+        return partial(torch.autocast, "cpu", dtype=torch.bfloat16, cache_enabled=False)
+    return nullcontext
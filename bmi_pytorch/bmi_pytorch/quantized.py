@@ -0,0 +1,129 @@
+"""
+Dynamic int8 quantized inference of a Model
+
+Each layer's weight is quantized once, per output channel, to int8 and prepacked for
+the quantized backend (fbgemm/x86 or qnnpack).  Inputs are quantized dynamically on
+each call by the quantized linear kernel, which accumulates in int32 and returns
+float32, so the weights read per call are a quarter of their float32 size.
+
+@version 0.1.0
+"""
+
+import logging
+import warnings
+from typing import List, NamedTuple
+
+import torch
+from torch import Tensor
+
+from .model import Model
+
+log = logging.getLogger(__name__)
+
+
+def _quantize_weight(weight: Tensor) -> Tensor:
+    """Symmetric per output channel int8 quantization of an (out, in) weight"""
+    scale = weight.abs().amax(dim=1).clamp_min(1e-12) / 127.0
+    zero_point = torch.zeros(len(weight), dtype=torch.int64)
+    return torch.quantize_per_channel(
+        weight, scale.double(), zero_point, 0, torch.qint8
+    )
+
+
+class QuantizedModel(torch.nn.Module):
+    """Inference only snapshot of a Model with int8 weights, see module docs
+
+    Like the "script" engine, the weights are copied when built, so it must be rebuilt
+    if the Model is trained further.
+    """
+
+    def __init__(self, model: Model):
+        """Quantize the weights of @p model
+
+        Args:
+            model (Model): float32 model, its folded single layer is quantized when
+                model.collapse_layers is set
+
+        Raises:
+            ValueError: @p model isn't a float32 Model
+        """
+        super(QuantizedModel, self).__init__()
+        if not isinstance(model, Model):
+            raise ValueError(f"int8 quantization requires a Model, not {type(model)}")
+        if any(p.dtype != torch.float32 for p in model.parameters()):
+            raise ValueError("int8 quantization requires a float32 Model")
+        if model.collapse_layers:
+            weight, bias = model.collapsed()
+            layers = [(weight, bias)]
+        else:
+            layers = list(zip(model.weights, model.bias))
+        # fbgemm/x86 kernels quantize the input to 7 bits to avoid overflow in the
+        # int16 intermediate products, qnnpack uses the full range
+        self.reduce_range: bool = torch.backends.quantized.engine in ("fbgemm", "x86")
+        self.activation = model.activation
+        self._packed: List[object] = []
+        with warnings.catch_warnings(), torch.no_grad():
+            # Quantized tensors are deprecated in newer torch releases, but still functional
+            warnings.simplefilter("ignore", UserWarning)
+            warnings.simplefilter("ignore", DeprecationWarning)
+            for weight, bias in layers:
+                # quantized linear weights are (out, in)
+                qweight = _quantize_weight(weight.detach().t().contiguous())
+                self._packed.append(
+                    torch.ops.quantized.linear_prepack(qweight, bias.detach().clone())
+                )
+        log.debug(
+            "Quantized %d layers with the %s backend",
+            len(layers),
+            torch.backends.quantized.engine,
+        )
+
+    def forward(self, input: Tensor) -> Tensor:
+        """Forward pass through the quantized layers
+
+        Args:
+            input (Tensor): (N, input_size) float32 input
+
+        Returns:
+            Tensor: (N, output_size) float32 result
+        """
+        result: Tensor = input
+        for packed in self._packed:
+            result = torch.ops.quantized.linear_dynamic(
+                result, packed, self.reduce_range
+            )
+        if self.activation:
+            result = self.activation(result)
+        return result
+
+
+class AccuracyReport(NamedTuple):
+    """Error of an inference engine relative to the float32 Model"""
+
+    max_abs_error: float
+    rmse: float
+    # rmse relative to the root mean square of the Model output
+    relative_rmse: float
+
+
+def accuracy_report(model: Model, engine, input: Tensor) -> AccuracyReport:
+    """Compare the output of @p engine to @p model on @p input
+
+    Args:
+        model (Model): reference model
+        engine (Engine): engine built from @p model, e.g. a QuantizedModel
+        input (Tensor): (N, input_size) inputs, e.g. from utils.load_data
+
+    Returns:
+        AccuracyReport: error statistics
+    """
+    with torch.inference_mode():
+        expected: Tensor = model(input)
+        error: Tensor = engine(input) - expected
+    rmse: float = error.square().mean().sqrt().item()
+    scale: float = expected.square().mean().sqrt().item()
+    return AccuracyReport(
+        max_abs_error=error.abs().max().item(),
+        rmse=rmse,
+        relative_rmse=rmse / scale if scale else float("inf"),
+    )
@@ -0,0 +1,110 @@
+"""
+Process wide store of read only Models shared between inference Bmi_Model instances
+
+@version 0.1.0
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Optional, TypeVar, Union
+
+from .config import Config
+from .ensemble import Ensemble, build_model
+from .model import Model
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Config fields which determine the Model parameters
+_MODEL_FIELDS = {
+    "input_size",
+    "output_size",
+    "hidden_size",
+    "collapse_layers",
+    "flat_parameters",
+    "compute_dtype",
+    "ensemble_size",
+}
+
+
+def model_key(config: Config) -> str:
+    """Identity of the Model described by @p config
+
+    Args:
+        config (Config): model configuration
+
+    Returns:
+        str: key which is equal for configs that build equivalent Models
+    """
+    return config.model_dump_json(include=_MODEL_FIELDS)
+
+
+def frozen_model(
+    config: Config,
+    share_memory: bool = False,
+    model: Optional[Union[Model, Ensemble]] = None,
+) -> Union[Model, Ensemble]:
+    """Build a Model for inference only, with parameters that don't require grad
+
+    Args:
+        config (Config): model configuration
+        share_memory (bool, optional): Move the parameters to shared memory, so forked
+            or spawned worker processes use the same pages. Defaults to False.
+        model (Union[Model, Ensemble], optional): model to freeze, e.g. loaded from a
+            checkpoint. Defaults to None, a new model built from @p config.
+
+    Returns:
+        Union[Model, Ensemble]: model in eval mode
+    """
+    if model is None:
+        model = build_model(config)
+    model.eval()
+    model.requires_grad_(False)
+    if share_memory:
+        model.share_memory()
+    return model
+
+
+class WeightStore:
+    """
+    Cache of read only objects (Models and their inference engines) keyed by identity.
+
+    Memory scales with the number of distinct keys rather than the number of users.
+    """
+
+    def __init__(self):
+        self._items: Dict[Hashable, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Get the object stored for @p key, building and storing it if needed
+
+        Args:
+            key (Hashable): identity of the object
+            build (Callable[[], T]): builds the object on first use of @p key
+
+        Returns:
+            T: the shared object
+        """
+        try:
+            return self._items[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._items:
+                log.debug("Building shared store item %s", key)
+                self._items[key] = build()
+            return self._items[key]
+
+    def clear(self) -> None:
+        """Drop all stored objects, existing users keep their references"""
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# The process wide store used by Bmi_Model
+weight_store = WeightStore()
@@ -0,0 +1,248 @@
+"""
+Hyperparameter sweeps over Config fields, with trials run across a process pool
+
+Training data is written once to .npy files which every worker memory maps, and each
+completed trial is appended to a csv results table as soon as it finishes, so an
+interrupted sweep can be resumed without rerunning completed trials.  Failed trials are
+recorded with their error and run again when the sweep is resumed.
+
+@version 0.1.0
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import torch
+
+from .config import Config
+from .model import Model
+from .trainer import Trainer
+
+log = logging.getLogger(__name__)
+
+Params = Dict[str, Any]
+
+
+class Uniform(NamedTuple):
+    """Continuous uniform distribution for random search"""
+
+    low: float
+    high: float
+
+
+class LogUniform(NamedTuple):
+    """Log-uniform distribution for random search, e.g. for learning_rate"""
+
+    low: float
+    high: float
+
+
+def grid_search(space: Dict[str, Sequence]) -> List[Params]:
+    """Every combination of the values of each Config field
+
+    Args:
+        space (Dict[str, Sequence]): Config field name to the values to try
+
+    Returns:
+        List[Params]: trial parameters
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_search(
+    space: Dict[str, Any], trials: int, seed: Optional[int] = None
+) -> List[Params]:
+    """Random samples of each Config field
+
+    Args:
+        space (Dict[str, Any]): Config field name to a Uniform or LogUniform
+            distribution, or a sequence of values to choose from
+        trials (int): number of trials
+        seed (int, optional): random seed. Defaults to None.
+
+    Returns:
+        List[Params]: trial parameters
+    """
+    rng = np.random.default_rng(seed)
+
+    def sample(values):
+        if isinstance(values, Uniform):
+            return float(rng.uniform(values.low, values.high))
+        if isinstance(values, LogUniform):
+            return float(np.exp(rng.uniform(np.log(values.low), np.log(values.high))))
+        return values[rng.integers(len(values))]
+
+    return [{k: sample(v) for k, v in space.items()} for _ in range(trials)]
+
+
+def trial_id(params: Params, base: Optional[Dict[str, Any]] = None) -> str:
+    """Stable identifier of a trial's parameters
+
+    Args:
+        params (Params): Config fields of the trial
+        base (Dict[str, Any], optional): fields of the Config the trial is applied to,
+            e.g. Config.model_dump(mode="json"). Defaults to None, the trial parameters only.
+
+    Returns:
+        str: identifier
+    """
+    trial = params if base is None else {"base": base, "params": params}
+    encoded = json.dumps(trial, sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+# Training data memory mapped by each worker process, see _init_worker
+_data: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(data_dir: str) -> None:
+    # Trials run in parallel, each on a single thread
+    torch.set_num_threads(1)
+    for name in ("runoff", "precip"):
+        _data[name] = np.load(Path(data_dir) / f"{name}.npy", mmap_mode="r")
+
+
+def _run_trial(params: Params, base: Dict[str, Any]) -> Dict[str, Any]:
+    config = Config.model_validate({**base, **params})
+    start = time.perf_counter()
+    history = Trainer(Model(config), config, _data["runoff"], _data["precip"]).fit()
+    return {
+        "trial": trial_id(params, base),
+        "params": json.dumps(params, sort_keys=True),
+        "loss": history[-1].loss,
+        "best_loss": min(stats.loss for stats in history),
+        "epochs": len(history),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def load_results(results: os.PathLike) -> List[Dict[str, str]]:
+    """Rows of a sweep results table
+
+    Args:
+        results (os.PathLike): csv results table
+
+    A trial rerun after failing is appended again, only its last row is returned.
+
+    Args:
+        results (os.PathLike): csv results table
+
+    Returns:
+        List[Dict[str, str]]: one row per completed or failed trial, empty if the table
+            doesn't exist
+    """
+    results = Path(results)
+    if not results.exists():
+        return []
+    with open(results, newline="") as fp:
+        rows = {row["trial"]: row for row in csv.DictReader(fp)}
+    return list(rows.values())
+
+
+_COLUMNS = ["trial", "params", "loss", "best_loss", "epochs", "seconds", "error"]
+
+
+def run_sweep(
+    trials: Iterable[Params],
+    base: Config,
+    runoff: np.ndarray,
+    precip: np.ndarray,
+    results: os.PathLike,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """Train a Model for each trial's Config across a pool of worker processes
+
+    Trials of @p base already completed in @p results are skipped.  At most
+    @p max_workers trials are in flight at once, so stopping the sweep only loses the
+    trials in progress.  A trial which raises is recorded with its error, and the
+    sweep carries on with the other trials.
+
+    Args:
+        trials (Iterable[Params]): Config fields of each trial, e.g. from grid_search
+        base (Config): configuration the trial fields are applied to
+        runoff (np.ndarray): (N, output_size) training targets
+        precip (np.ndarray): (N, input_size) training inputs
+        results (os.PathLike): csv results table to append to
+        max_workers (int, optional): concurrent trials. Defaults to None, the CPU count.
+
+    Returns:
+        List[Dict[str, str]]: rows of the results table
+    """
+    results = Path(results)
+    base_fields = base.model_dump(mode="json")
+    done = {row["trial"] for row in load_results(results) if not row.get("error")}
+    pending = [p for p in trials if trial_id(p, base_fields) not in done]
+    log.info("%d trials completed, %d to run", len(done), len(pending))
+    if not pending:
+        return load_results(results)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    # One shared copy of the training data, memory mapped by every worker
+    # unique to this sweep, others may be running in the same directory
+    results.parent.mkdir(parents=True, exist_ok=True)
+    data_dir = Path(
+        tempfile.mkdtemp(prefix=f".{results.stem}_data", dir=results.parent)
+    )
+    try:
+        np.save(data_dir / "runoff.npy", runoff)
+        np.save(data_dir / "precip.npy", precip)
+        _run_pending(pending, base_fields, data_dir, results, max_workers)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return load_results(results)
+
+
+def _run_pending(
+    pending: List[Params],
+    base: Dict[str, Any],
+    data_dir: Path,
+    results: Path,
+    max_workers: int,
+) -> None:
+    write_header = not results.exists()
+    with open(results, "a", newline="") as fp, ProcessPoolExecutor(
+        max_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(data_dir),),
+    ) as pool:
+        writer = csv.DictWriter(fp, _COLUMNS)
+        if write_header:
+            writer.writeheader()
+        queue = iter(pending)
+        running: Dict = {}
+        while True:
+            for params in itertools.islice(queue, max_workers - len(running)):
+                running[pool.submit(_run_trial, params, base)] = params
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                params = running.pop(future)
+                try:
+                    row = future.result()
+                    log.info("trial %s loss %.6g", row["trial"], row["loss"])
+                except Exception as e:
+                    row = {
+                        "trial": trial_id(params, base),
+                        "params": json.dumps(params, sort_keys=True),
+                        "error": repr(e),
+                    }
+                    log.warning("trial %s failed: %r", row["trial"], e)
+                writer.writerow(row)
+                # persist each trial as soon as it completes
+                fp.flush()
+                os.fsync(fp.fileno())
@@ -0,0 +1,53 @@
+"""
+Thread and CPU budget for the torch thread pools used by a process
+
+@version 0.1.0
+"""
+
+import logging
+import os
+from typing import Iterable, Optional
+
+import torch
+
+log = logging.getLogger(__name__)
+
+# The inter-op pool size is fixed once set, only warn the first time a change fails
+_inter_op_warned = False
+
+
+def configure_threads(
+    intra_op: Optional[int] = None,
+    inter_op: Optional[int] = None,
+    cpu_affinity: Optional[Iterable[int]] = None,
+) -> None:
+    """Set the torch thread pool sizes and CPU affinity of the current process
+
+    The thread pools are process wide, so every Model in the process shares these
+    settings.  When many models or worker processes run on one node, one thread each
+    avoids oversubscribing the cores with the tiny matmuls of a Model forward pass.
+
+    Args:
+        intra_op (int, optional): threads used within an op. Defaults to None, unchanged.
+        inter_op (int, optional): threads used to run independent ops. Defaults to None, unchanged.
+            torch only allows this to be set before any inter-op parallel work has run,
+            a failed change warns once per process.
+        cpu_affinity (Iterable[int], optional): CPU ids the process may run on.
+            Defaults to None, unchanged.
+    """
+    if intra_op is not None and torch.get_num_threads() != intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op is not None and torch.get_num_interop_threads() != inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            # Already set, or the pool is already running
+            global _inter_op_warned
+            if not _inter_op_warned:
+                _inter_op_warned = True
+                log.warning("Unable to set inter-op threads to %d: %s", inter_op, e)
+    if cpu_affinity is not None:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, set(cpu_affinity))
+        else:
+            log.warning("CPU affinity is not supported on this platform")
@@ -0,0 +1,206 @@
+"""
+Mini-batch training of a Model on (runoff, precipitation) data
+
+@version 0.1.0
+"""
+
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import torch
+from torch import Tensor
+from torch.nn.functional import mse_loss
+
+from .config import Config
+from .model import Model
+
+log = logging.getLogger(__name__)
+
+
+class EpochStats(NamedTuple):
+    """Summary of a single training epoch"""
+
+    epoch: int
+    loss: float  # mean training loss
+    validation_loss: Optional[float]
+    samples_per_second: float
+
+
+def build_optimizer(model: Model, learning_rate: float) -> torch.optim.Optimizer:
+    """SGD using the fused implementation when available, else the foreach implementation
+
+    Args:
+        model (Model): model to optimize
+        learning_rate (float): learning rate
+
+    Returns:
+        torch.optim.Optimizer: optimizer of the model parameters
+    """
+    try:
+        return torch.optim.SGD(model.parameters(), learning_rate, fused=True)
+    except (RuntimeError, TypeError, ValueError):
+        # fused isn't supported by this version of torch, or on this device
+        return torch.optim.SGD(model.parameters(), learning_rate, foreach=True)
+
+
+class Trainer:
+    """
+    Mini-batch trainer, minimizing the mean squared error of Model(precip) and runoff.
+
+    The training data is copied once into tensors, and every mini-batch is gathered
+    into preallocated batch tensors, so an epoch allocates no data tensors.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        config: Config,
+        runoff: np.ndarray,
+        precip: np.ndarray,
+        validation: Optional[tuple] = None,
+    ):
+        """
+        Args:
+            model (Model): model to train
+            config (Config): training configuration, epochs, learning_rate, batch_size,
+                accumulation_steps, patience and min_delta are used
+            runoff (np.ndarray): (N, output_size) training targets
+            precip (np.ndarray): (N, input_size) training inputs
+            validation (tuple, optional): (runoff, precip) arrays used for early stopping.
+                Defaults to None, which uses the training loss.
+        """
+        self.model: Model = model
+        self.config: Config = config
+        self.optimizer: torch.optim.Optimizer = build_optimizer(
+            model, config.learning_rate
+        )
+
+        dtype = next(model.parameters()).dtype
+        self._x: Tensor = torch.as_tensor(precip, dtype=dtype)
+        self._y: Tensor = torch.as_tensor(runoff, dtype=dtype)
+        self._validation: Optional[tuple] = None
+        if validation is not None:
+            self._validation = (
+                torch.as_tensor(validation[1], dtype=dtype),
+                torch.as_tensor(validation[0], dtype=dtype),
+            )
+        samples: int = len(self._x)
+        batch_size: int = min(config.batch_size, samples)
+        # Preallocated shuffle order and mini-batch buffers
+        self._perm: Tensor = torch.empty(samples, dtype=torch.int64)
+        self._xb: Tensor = torch.empty(batch_size, *self._x.shape[1:], dtype=dtype)
+        self._yb: Tensor = torch.empty(batch_size, *self._y.shape[1:], dtype=dtype)
+
+        self.history: List[EpochStats] = []
+        self.best_loss: float = float("inf")
+        self._best_state: Optional[Dict[str, Tensor]] = None
+
+    @property
+    def samples(self) -> int:
+        """Number of training samples"""
+        return len(self._x)
+
+    def fit(self) -> List[EpochStats]:
+        """Train for config.epochs, or until the loss stops improving for config.patience epochs
+
+        When stopped early, the model is left with the parameters of its best epoch.
+
+        Returns:
+            List[EpochStats]: statistics of each epoch run
+        """
+        patience: Optional[int] = self.config.patience
+        stale: int = 0
+        for epoch in range(len(self.history), self.config.epochs):
+            start = time.perf_counter()
+            loss = self.train_epoch()
+            seconds = time.perf_counter() - start
+            validation_loss = self.evaluate() if self._validation is not None else None
+            stats = EpochStats(
+                epoch, loss, validation_loss, self._total_samples() / seconds
+            )
+            self.history.append(stats)
+            log.info(
+                "epoch %d loss %.6g validation loss %s %.1f samples/s",
+                epoch,
+                loss,
+                validation_loss,
+                stats.samples_per_second,
+            )
+
+            monitored = loss if validation_loss is None else validation_loss
+            if monitored < self.best_loss - self.config.min_delta:
+                self.best_loss = monitored
+                stale = 0
+                if patience is not None:
+                    self._best_state = {
+                        k: v.detach().clone()
+                        for k, v in self.model.state_dict().items()
+                    }
+            else:
+                stale += 1
+                if patience is not None and stale >= patience:
+                    log.info("Stopping early after epoch %d", epoch)
+                    if self._best_state is not None:
+                        self.model.load_state_dict(self._best_state)
+                    break
+        return self.history
+
+    def train_epoch(self) -> float:
+        """Run one epoch of shuffled mini-batches
+
+        Gradients of config.accumulation_steps mini-batches are accumulated before each
+        optimizer step, the last group of the epoch may hold fewer mini-batches.
+
+        Returns:
+            float: mean loss of the epoch
+        """
+        self.model.train()
+        samples: int = self.samples
+        batch_size: int = len(self._xb)
+        accumulation: int = self.config.accumulation_steps
+        batches: int = -(-samples // batch_size)
+        torch.randperm(samples, out=self._perm)
+        total: Tensor = torch.zeros(())
+
+        self.optimizer.zero_grad()
+        for batch, start in enumerate(range(0, samples, batch_size)):
+            if batch % accumulation == 0:
+                # mini-batches in this group, fewer in a partial last group
+                group: int = min(accumulation, batches - batch)
+            index = self._perm[start : start + batch_size]
+            size = len(index)
+            xb = torch.index_select(self._x, 0, index, out=self._xb[:size])
+            yb = torch.index_select(self._y, 0, index, out=self._yb[:size])
+            loss = mse_loss(self.model(xb), yb)
+            (loss / group).backward()
+            total += loss.detach() * size
+            if (batch + 1) % accumulation == 0 or batch + 1 == batches:
+                self._reduce_gradients()
+                self.optimizer.step()
+                self.optimizer.zero_grad()
+        return self._reduce_loss(total, samples)
+
+    def evaluate(self) -> float:
+        """Mean squared error of the model on the validation data
+
+        Returns:
+            float: validation loss
+        """
+        self.model.eval()
+        x, y = self._validation
+        with torch.no_grad():
+            return mse_loss(self.model(x), y).item()
+
+    # Hooks for data parallel training, a single process has nothing to reduce
+    def _reduce_gradients(self) -> None:
+        """Combine the accumulated gradients of all workers before an optimizer step"""
+
+    def _reduce_loss(self, total: Tensor, samples: int) -> float:
+        """Mean loss of the epoch from the summed loss of @p samples"""
+        return total.item() / samples
+
+    def _total_samples(self) -> int:
+        """Number of samples processed by an epoch, over all workers"""
+        return self.samples
@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Tuple
 
 import numpy as np
-import pandas as pd
 
 log = logging.getLogger(__name__)
 
@@ -14,6 +13,9 @@ def normalize(x: np.ndarray) -> np.ndarray:
 
 
 def load_data(data_dir: PathLike) -> Tuple[np.ndarray, np.ndarray]:
+    # pandas is only needed here, import it on first use
+    import pandas as pd
+
     data_dir = Path(data_dir)
     # TODO add the input and output vars to config file
     # Read the CSV files and drop the "Year" column
@@ -9,6 +9,7 @@ import pytest
 import torch
 from bmi_pytorch.bmi_model import Bmi_Model
 from bmi_pytorch.config import Config
+from bmi_pytorch.store import weight_store
 
 
 class TestDataDownloadError(Exception): ...
@@ -76,3 +77,10 @@ def bmi_model() -> Bmi_Model:
 def bmi_model_initialized(config, bmi_model) -> Bmi_Model:
     bmi_model.initialize(config)
     return bmi_model
+
+
+@pytest.fixture(autouse=True)
+def clear_weight_store():
+    """Isolate the shared inference models of each test"""
+    yield
+    weight_store.clear()
@@ -1,3 +1,8 @@
+from pathlib import Path
+
+import numpy as np
+import torch
+
 from ..config import Config
 from bmi_sdk.bmi_grid import GridType
 from ..bmi_model import Bmi_Model, UnknownBMIVariable
@@ -206,3 +211,276 @@ def test_bmi_get_var_type(bmi_model_initialized, input):
     data = m.get_var_type(name)
 
     assert str(input.dtype).split(".")[1] == data
+
+
+@pytest.mark.parametrize("engine", ["eager", "script"])
+def test_bmi_update_engine(config: Config, bmi_model, engine):
+    """update produces the Model output with each configured engine"""
+    config.engine = engine
+    config.run_mode = "inference"
+    config.hidden_size = [10, 10]
+    bmi_model.initialize(config)
+    bmi_model.input = tensor([[1.5]])
+    bmi_model.update()
+    assert bmi_model.output.shape == (1, 1)
+    assert bmi_model.output.item() == pytest.approx(
+        bmi_model.model(bmi_model.input).item(), abs=1e-6
+    )
+
+
+@pytest.mark.parametrize("run_mode", ["training", "inference"])
+def test_bmi_run_mode(config: Config, bmi_model, run_mode):
+    """Inference mode puts the Model in eval and records no autograd graph"""
+    config.run_mode = run_mode
+    bmi_model.initialize(config)
+    bmi_model.input = tensor([[1.5]])
+    bmi_model.update()
+
+    inference = run_mode == "inference"
+    assert bmi_model.model.training != inference
+    assert not bmi_model.output.requires_grad
+    if not inference:
+        # the training prediction carries the graph for a loss
+        assert bmi_model.prediction.grad_fn is not None
+
+
+@pytest.mark.parametrize("engine", ["eager", "script", "compile", "int8"])
+def test_bmi_training_engine(config: Config, bmi_model, engine):
+    """Training updates have a gradient, graph engines are rejected for training"""
+    config.engine = engine
+    if engine != "eager":
+        with pytest.raises(ValueError, match="run_mode"):
+            Config(engine=engine)
+        with pytest.raises(ValueError, match="run_mode"):
+            bmi_model.initialize(config)
+        return
+    bmi_model.initialize(config)
+    bmi_model.input = tensor([[1.5]])
+    bmi_model.update()
+    assert bmi_model.model.training
+    bmi_model.prediction.sum().backward()
+    assert all(p.grad is not None for p in bmi_model.model.parameters())
+
+
+def _rss_pages() -> int:
+    return int(Path("/proc/self/statm").read_text().split()[1])
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/statm").exists(), reason="requires /proc/self/statm"
+)
+def test_bmi_inference_memory(config: Config, bmi_model):
+    """Resident memory stays flat over many inference updates"""
+    config.run_mode = "inference"
+    config.hidden_size = [10, 10]
+    bmi_model.initialize(config)
+    bmi_model.input = tensor([[1.5]])
+    for _ in range(1_000):  # warm up allocator caches
+        bmi_model.update()
+    before = _rss_pages()
+    for _ in range(100_000):
+        bmi_model.update()
+    # allow a little allocator noise, a leak of even 16 bytes per update is ~400 pages
+    assert _rss_pages() - before < 64
+
+
+@pytest.mark.parametrize(
+    "run_mode, engine",
+    [("training", "eager"), ("inference", "eager"), ("inference", "script")],
+)
+def test_bmi_value_ptr_stable(config: Config, bmi_model, run_mode, engine):
+    """Pointers from get_value_ptr see every update's results"""
+    config.run_mode = run_mode
+    config.engine = engine
+    config.hidden_size = [10, 10]
+    bmi_model.initialize(config)
+    precip = bmi_model.get_value_ptr("precipitation")
+    runoff = bmi_model.get_value_ptr("runoff")
+    address = runoff.ctypes.data
+
+    for value in (1.0, 2.0, 3.0):
+        precip[:] = value
+        bmi_model.update()
+        expected = bmi_model.model(tensor([[value]])).item()
+        assert runoff[0] == pytest.approx(expected, abs=1e-6)
+        assert bmi_model.get_value_ptr("runoff").ctypes.data == address
+
+
+def test_bmi_var_info(bmi_model_initialized):
+    """Variable meta data is built once per buffer"""
+    m = bmi_model_initialized
+    info = m.get_var_info("runoff")
+    assert m.get_var_info("runoff") is info
+    assert info.grid == 0
+    assert info.units == m.get_var_units("runoff") == "-"
+    assert info.location == m.get_var_location("runoff") == "node"
+    assert info.dtype == "float32"
+    assert info.size == 1
+    # update writes in place, the buffer (and its meta data) is unchanged
+    m.update()
+    assert m.get_var_info("runoff") is info
+    # reinitializing reallocates the buffers
+    m.initialize(m.config)
+    assert m.get_var_info("runoff") is not info
+
+
+def test_bmi_time(bmi_model_initialized):
+    """Each update advances the model time by one timestep"""
+    m = bmi_model_initialized
+    assert m.get_current_time() == m.get_start_time() == 0.0
+    assert m.get_time_units() == "s"
+    m.update()
+    assert m.get_current_time() == m.get_time_step()
+    m.update_until(5 * m.get_time_step())
+    assert m.get_current_time() == 5 * m.get_time_step()
+
+
+@pytest.mark.parametrize(
+    "run_mode, engine",
+    [("training", "eager"), ("inference", "eager"), ("inference", "script")],
+)
+def test_bmi_update_until_batched(config: Config, run_mode, engine):
+    """A batched update_until over a staged window matches stepping with update"""
+    config.run_mode = run_mode
+    config.engine = engine
+    config.hidden_size = [10, 10]
+    window = np.random.default_rng(42).uniform(0, 10, (24, 1))
+
+    stepped = Bmi_Model()
+    stepped.initialize(config)
+    batched = Bmi_Model()
+    batched.initialize(config)
+    batched.model.load_state_dict(stepped.model.state_dict())
+    if engine != "eager":
+        # frozen engines snapshot the weights at initialize, rebuild them
+        batched._forward = stepped._forward
+
+    stepped.stage_forcing("precipitation", window)
+    batched.stage_forcing("precipitation", window)
+    for _ in range(20):
+        stepped.update()
+    batched.update_until(20 * config.time.time_step)
+    assert batched.get_current_time() == stepped.get_current_time()
+    assert torch.allclose(batched.history[:20], stepped.history[:20], atol=1e-6)
+    assert torch.allclose(batched.output, stepped.output, atol=1e-6)
+
+    # batches the remaining 4 steps of the window, then steps once past it
+    batched.update_until(25 * config.time.time_step)
+    for _ in range(5):
+        stepped.update()
+    assert torch.allclose(batched.history, stepped.history, atol=1e-6)
+    assert batched.get_current_time() == stepped.get_current_time()
+
+
+def test_bmi_stage_forcing_unknown(bmi_model_initialized):
+    with pytest.raises(UnknownBMIVariable):
+        bmi_model_initialized.stage_forcing("runoff", np.zeros((2, 1)))
+
+
+def test_bmi_set_value(bmi_model_initialized):
+    """Forcings set through BMI are used by the next update"""
+    m = bmi_model_initialized
+    m.set_value("precipitation", np.array([2.5]))
+    m.update()
+    dest = np.empty(1, dtype=np.float32)
+    m.get_value_at_indices("runoff", dest, np.array([0]))
+    assert dest[0] == pytest.approx(m.model(tensor([[2.5]])).item())
+
+    m.set_value_at_indices("precipitation", np.array([0]), np.array([1.0]))
+    assert m.input[0, 0] == 1.0
+
+
+def test_bmi_get_value_at_indices_double(config: Config, bmi_model):
+    """float32 variables are read into the double buffers of callers such as ngen"""
+    config.basins = 4
+    config.run_mode = "inference"
+    bmi_model.initialize(config)
+    bmi_model.set_value("precipitation", np.arange(4.0))
+    dest = np.empty(2)
+    bmi_model.get_value_at_indices("precipitation", dest, np.array([1, 3]))
+    np.testing.assert_array_equal(dest, [1.0, 3.0])
+
+
+@pytest.mark.parametrize("grid_type", ["vector", "points"])
+def test_bmi_basins(config: Config, bmi_model, data_dims, grid_type):
+    """All basins are evaluated by one update through contiguous buffers"""
+    basins = data_dims[0]
+    config.basins = basins
+    config.basin_grid = grid_type
+    config.hidden_size = [10, 10]
+    bmi_model.initialize(config)
+
+    grid = bmi_model.get_var_grid("runoff")
+    assert bmi_model.get_grid_type(grid) == grid_type
+    assert bmi_model.get_grid_rank(grid) == 1
+    assert bmi_model.get_grid_size(grid) == basins
+    shape = np.empty(1, dtype=np.int32)
+    assert bmi_model.get_grid_shape(grid, shape) is shape
+    assert shape[0] == basins
+    assert bmi_model.get_var_info("precipitation").size == basins
+    assert bmi_model.get_var_nbytes("runoff") == basins * 4
+
+    precip = np.random.default_rng(42).uniform(0, 10, basins)
+    bmi_model.set_value("precipitation", precip)
+    bmi_model.update()
+    runoff = bmi_model.get_value_ptr("runoff")
+    assert runoff.flags.c_contiguous
+    expected = bmi_model.model(torch.as_tensor(precip, dtype=torch.float32)[:, None])
+    assert np.allclose(runoff, expected.detach().numpy().ravel(), atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "compute_dtype,exchange_dtype,tolerance",
+    [
+        ("float64", "float64", 1e-12),
+        ("float32", "float32", 1e-5),
+        ("float32", "float64", 1e-5),
+        ("bfloat16", "float64", 5e-2),
+        ("bfloat16", "float32", 5e-2),
+    ],
+)
+@pytest.mark.parametrize("run_mode", ["training", "inference"])
+def test_bmi_dtype_policy(
+    config: Config, compute_dtype, exchange_dtype, tolerance, run_mode
+):
+    """Buffers use the exchange dtype, the Model the compute dtype"""
+    config.hidden_size = [10, 10]
+    config.basins = 4
+    config.run_mode = run_mode
+    config.compute_dtype = "float64"
+    config.exchange_dtype = "float64"
+    torch.manual_seed(0)
+    reference = Bmi_Model()
+    reference.initialize(config)
+
+    config.compute_dtype = compute_dtype
+    config.exchange_dtype = exchange_dtype
+    torch.manual_seed(0)
+    m = Bmi_Model()
+    m.initialize(config)
+    itemsize = np.dtype(exchange_dtype).itemsize
+    for name in ("precipitation", "runoff"):
+        assert m.get_var_type(name) == exchange_dtype
+        assert m.get_var_itemsize(name) == itemsize
+        assert m.get_var_nbytes(name) == 4 * itemsize
+        assert m.get_value_ptr(name).dtype == np.dtype(exchange_dtype)
+    expected_params = torch.float64 if compute_dtype == "float64" else torch.float32
+    assert all(p.dtype == expected_params for p in m.model.parameters())
+
+    precip = np.array([0.5, 1.0, 2.0, 4.0])
+    runoff = m.get_value_ptr("runoff")
+    for bmi in (reference, m):
+        bmi.set_value("precipitation", precip)
+        bmi.update()
+    assert np.allclose(runoff, reference.get_value_ptr("runoff"), atol=tolerance)
+    assert m.get_value_ptr("runoff").ctypes.data == runoff.ctypes.data
+
+    # Windowed updates convert the staged forcing as well
+    window = np.random.default_rng(0).uniform(0, 4, (3, 4))
+    for bmi in (reference, m):
+        bmi.stage_forcing("precipitation", window)
+        bmi.update_until(bmi.get_current_time() + 3 * bmi.get_time_step())
+    assert m.history.dtype == getattr(torch, exchange_dtype)
+    assert torch.allclose(
+        m.history.double(), reference.history, atol=tolerance * 10
+    )
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..checkpoint import checkpoint_key, is_checkpoint, load_checkpoint, save_checkpoint
+from ..config import Config
+from ..ensemble import Ensemble, build_model
+from ..store import weight_store
+
+
+@pytest.mark.parametrize("ensemble_size", [0, 3])
+def test_round_trip(config: Config, tmp_path, ensemble_size):
+    config.ensemble_size = ensemble_size
+    model = build_model(config)
+    path = tmp_path / "model.pt"
+    save_checkpoint(path, model, config)
+    loaded_config, loaded = load_checkpoint(path)
+    assert loaded_config == config
+    assert isinstance(loaded, Ensemble) == bool(ensemble_size)
+    for name, tensor in model.state_dict().items():
+        assert torch.equal(loaded.state_dict()[name], tensor)
+    assert all(p.requires_grad for p in loaded.parameters())
+
+
+def test_is_checkpoint(tmp_path):
+    assert is_checkpoint(tmp_path / "model.pt")
+    assert is_checkpoint("model.pth")
+    assert not is_checkpoint("config.json")
+
+
+def test_checkpoint_key_changes_on_rewrite(config: Config, tmp_path):
+    path = tmp_path / "model.pt"
+    save_checkpoint(path, build_model(config), config)
+    key = checkpoint_key(path)
+    assert checkpoint_key(str(path)) == key
+    save_checkpoint(path, build_model(config), config)
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+    assert checkpoint_key(path) != key
+
+
+def test_initialize_from_checkpoint(config: Config, tmp_path):
+    config.run_mode = "inference"
+    model = build_model(config)
+    path = tmp_path / "model.pt"
+    save_checkpoint(path, model, config)
+    bmi = Bmi_Model()
+    bmi.initialize(path)
+    assert bmi.config == config
+    bmi.set_value("precipitation", np.array([0.5], dtype=np.float32))
+    bmi.update()
+    with torch.no_grad():
+        expected = model(torch.tensor([[0.5]]))
+    assert torch.allclose(bmi.output, expected)
+    # Instances of the same checkpoint share its memory mapped parameters
+    other = Bmi_Model()
+    other.initialize(str(path))
+    assert other.model is bmi.model
+    assert len(weight_store) == 2
+
+
+def test_train_from_checkpoint(config: Config, tmp_path):
+    path = tmp_path / "model.pt"
+    save_checkpoint(path, build_model(config), config)
+    saved = path.read_bytes()
+    bmi = Bmi_Model()
+    bmi.initialize(path)
+    assert bmi.optimizer is not None
+    before = [p.detach().clone() for p in bmi.model.parameters()]
+    bmi.set_value("precipitation", np.array([0.5], dtype=np.float32))
+    bmi.update()
+    bmi.prediction.sum().backward()
+    bmi.optimizer.step()
+    assert any(not torch.equal(a, p) for a, p in zip(before, bmi.model.parameters()))
+    # Training updates the mapped parameters copy on write, not the file
+    assert path.read_bytes() == saved
+
+
+def test_checkpoint_runtime_config(config: Config, tmp_path):
+    """A checkpoint saved by a training run is deployed with the runtime fields of a
+    json Config naming it, and the model fields of the checkpoint"""
+    config.hidden_size = [4, 4]
+    model = build_model(config)
+    save_checkpoint(tmp_path / "model.pt", model, config)
+    deploy = Config(
+        hidden_size=[99],
+        run_mode="inference",
+        engine="script",
+        basins=3,
+        checkpoint="model.pt",
+    )
+    config_file = tmp_path / "config.json"
+    config_file.write_text(deploy.model_dump_json())
+    bmi = Bmi_Model()
+    bmi.initialize(config_file)
+    assert bmi.config.hidden_size == [4, 4]
+    assert (bmi.config.run_mode, bmi.config.engine, bmi.config.basins) == (
+        "inference",
+        "script",
+        3,
+    )
+    assert bmi.optimizer is None
+    assert not any(p.requires_grad for p in bmi.model.parameters())
+    precip = np.array([0.1, 0.5, 0.9], dtype=np.float32)
+    bmi.set_value("precipitation", precip)
+    bmi.update()
+    with torch.no_grad():
+        expected = model(torch.from_numpy(precip)[:, None])
+    assert torch.allclose(bmi.output, expected)
+    # a Config instance naming the checkpoint by absolute path
+    deploy.checkpoint = tmp_path / "model.pt"
+    other = Bmi_Model()
+    other.initialize(deploy)
+    assert other.model is bmi.model
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+import torch
+import torch.distributed as dist
+
+from ..config import Config
+from .. import distributed
+from ..distributed import DistributedTrainer, shard, train_data_parallel
+from ..model import Model
+from ..trainer import Trainer
+
+pytestmark = pytest.mark.skipif(
+    not dist.is_available() or not dist.is_gloo_available(),
+    reason="requires torch.distributed with gloo",
+)
+
+
+def test_shard():
+    data = np.arange(10).reshape(10, 1)
+    shards = [shard(data, rank, 3) for rank in range(3)]
+    assert [len(s) for s in shards] == [4, 3, 3]
+    np.testing.assert_array_equal(np.concatenate(shards), data)
+
+
+def test_train_data_parallel(config: Config):
+    """Two workers train on their shards of the basins and agree on the result"""
+    precip = np.random.default_rng(42).uniform(-1, 1, (101, 1))
+    runoff = 2 * precip + 1
+    config.epochs = 20
+    config.batch_size = 16
+    config.learning_rate = 0.05
+    model = Model(config)
+    before = [p.detach().clone() for p in model.parameters()]
+    trained, history = train_data_parallel(
+        config, runoff, precip, world_size=2, model=model
+    )
+    assert trained is model
+    assert len(history) == 20
+    assert history[-1].loss < history[0].loss
+    assert any(not torch.equal(a, b) for a, b in zip(before, model.parameters()))
+
+
+def test_train_data_parallel_new_model(config: Config):
+    """Without a model, a new Model with the trained parameters is returned"""
+    precip = np.random.default_rng(42).uniform(-1, 1, (64, 1))
+    runoff = 2 * precip + 1
+    config.epochs = 5
+    config.batch_size = 16
+    config.learning_rate = 0.05
+    torch.manual_seed(42)
+    initial = Model(config)
+    torch.manual_seed(42)
+    model, history = train_data_parallel(config, runoff, precip, world_size=2)
+    assert isinstance(model, Model)
+    assert len(history) == 5
+    assert any(
+        not torch.equal(a, b) for a, b in zip(initial.parameters(), model.parameters())
+    )
+    # the returned weights are the trained ones, with the final training loss
+    x = torch.as_tensor(precip, dtype=torch.float32)
+    y = torch.as_tensor(runoff, dtype=torch.float32)
+    with torch.no_grad():
+        loss = torch.nn.functional.mse_loss(model(x), y).item()
+    assert loss < history[0].loss
+
+
+def test_distributed_evaluate_weighted(config: Config, monkeypatch):
+    """Validation losses are weighted by each worker's validation samples"""
+    model = Model(config)
+    x = torch.zeros(3, 1)
+    y = torch.ones(3, 1)
+    trainer = DistributedTrainer.__new__(DistributedTrainer)
+    trainer.model = model
+    trainer._validation = (x, y)
+    local = Trainer.evaluate(trainer)
+
+    def all_reduce(tensor):
+        # another worker with 1 validation sample and a loss of 10
+        tensor.add_(torch.tensor([10.0, 1.0], dtype=tensor.dtype))
+
+    monkeypatch.setattr(distributed.dist, "all_reduce", all_reduce)
+    assert trainer.evaluate() == pytest.approx((3 * local + 10.0) / 4)
+
+
+@pytest.mark.parametrize("world_size", [0, 4])
+def test_train_data_parallel_world_size(config: Config, world_size):
+    """Every worker needs at least one sample"""
+    precip = np.zeros((3, 1))
+    with pytest.raises(ValueError, match="world_size"):
+        train_data_parallel(config, precip, precip, world_size=world_size)
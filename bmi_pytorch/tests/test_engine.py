@@ -0,0 +1,50 @@
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..config import Config
+from ..engine import build_engine
+from ..model import Model
+
+
+@pytest.mark.parametrize("engine", ["eager", "script", "compile"])
+@pytest.mark.parametrize("hidden_size", [[], [10, 10]])
+def test_engine_matches_model(config: Config, engine, hidden_size):
+    """Each engine produces the same output as the eager Model
+
+    Args:
+        config (Config): model configuration
+        engine (str): engine name
+        hidden_size (List[int]): hidden layer sizes
+    """
+    config.hidden_size = hidden_size
+    model = Model(config).eval()
+    example = torch.rand(1, config.input_size)
+    forward = build_engine(model, engine, example)
+    with torch.no_grad():
+        assert torch.allclose(forward(example), model(example), atol=1e-6)
+
+
+def test_engine_unknown(config: Config):
+    with pytest.raises(ValueError):
+        build_engine(Model(config), "jit", torch.zeros(1, 1))
+
+
+@pytest.mark.parametrize("engine", ["script", "compile"])
+def test_engine_collapse_layers(config: Config, engine):
+    """Graph engines capture the folded layers of a collapse_layers Model"""
+    config.hidden_size = [10, 10, 10]
+    config.collapse_layers = True
+    config.run_mode = "inference"
+    config.engine = engine
+    bmi = Bmi_Model()
+    bmi.initialize(config)
+    example = torch.rand(4, config.input_size)
+    with torch.no_grad():
+        expected = bmi.model(example)
+        assert torch.allclose(bmi._forward(example), expected, atol=1e-6)
+        # and the layered forward pass
+        layered = Model(config)
+        layered.load_state_dict(bmi.model.state_dict())
+        layered.collapse_layers = False
+        assert torch.allclose(bmi._forward(example), layered(example), atol=1e-5)
@@ -0,0 +1,61 @@
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..config import Config
+from ..ensemble import Ensemble
+from ..model import Model
+
+
+@pytest.mark.parametrize("hidden_size", [[], [10, 10], [10, 15, 20]])
+def test_ensemble_matches_members(config: Config, input: torch.Tensor, hidden_size):
+    """One batched forward gives each member's Model output"""
+    config.hidden_size = hidden_size
+    models = [Model(config) for _ in range(5)]
+    ensemble = Ensemble(models)
+    result = ensemble(input)
+    assert result.shape == (5, *input.shape)
+    for i, model in enumerate(models):
+        assert torch.allclose(result[i], model(input), atol=1e-5)
+        assert torch.allclose(ensemble.member(i)(input), model(input), atol=1e-5)
+
+
+def test_ensemble_training(config: Config, input: torch.Tensor):
+    """Members are trained independently by the summed loss"""
+    config.hidden_size = [10, 10]
+    models = [Model(config) for _ in range(3)]
+    ensemble = Ensemble(models)
+    target = 2 * input + 1
+    loss = ((ensemble(input) - target) ** 2).mean(dim=(1, 2)).sum()
+    loss.backward()
+    for i, model in enumerate(models):
+        ((model(input) - target) ** 2).mean().backward()
+        for layer, weight in enumerate(model.weights):
+            assert torch.allclose(
+                ensemble.weights[layer].grad[i], weight.grad, atol=1e-4
+            )
+
+
+@pytest.mark.parametrize("run_mode", ["training", "inference"])
+def test_bmi_ensemble(config: Config, run_mode):
+    config.ensemble_size = 4
+    config.basins = 3
+    config.run_mode = run_mode
+    config.hidden_size = [10, 10]
+    m = Bmi_Model()
+    m.initialize(config)
+    assert m.get_output_var_names() == ("runoff", "runoff_spread")
+    assert m.get_var_grid("runoff_spread") == 0
+
+    m.get_value_ptr("precipitation")[:] = [1.0, 2.0, 3.0]
+    m.update()
+    members = m.model(m.input)
+    assert torch.allclose(m.output, members.mean(0), atol=1e-6)
+    assert torch.allclose(m.spread, members.std(0, correction=0), atol=1e-6)
+    assert (m.get_value_ptr("runoff_spread") > 0).all()
+
+    # back to a single model drops the spread output
+    config.ensemble_size = 0
+    m.initialize(config)
+    assert m.get_output_var_names() == ("runoff",)
+    assert "runoff_spread" not in m._values
@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+
+# Cold start budget for importing bmi_model and constructing a Bmi_Model, measured
+# in a new interpreter.  Dominated by numpy, well under this on a developer machine.
+IMPORT_BUDGET_SECONDS = 1.0
+
+# Loaded on first real use (initialize, load_data), not by import or metadata queries
+HEAVY_MODULES = ("torch", "pandas", "pydantic")
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from bmi_pytorch.bmi_model import Bmi_Model
+imported = time.perf_counter()
+model = Bmi_Model()
+model.get_output_var_names()
+model.get_var_type("runoff")
+model.get_var_grid("runoff")
+constructed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _run(script: str, cwd) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, cwd=cwd
+    )
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def test_bmi_model_cold_start(tmp_path):
+    """Importing bmi_model and constructing a Bmi_Model loads no heavy dependencies"""
+    measured = _run(COLD_START, tmp_path)
+    assert measured["loaded"] == []
+    assert measured["import"] + measured["construct"] < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_modules(tmp_path):
+    script = (
+        "import json, sys\n"
+        "import bmi_pytorch.utils, bmi_pytorch.numpy_model, bmi_pytorch.bmi_base\n"
+        f"print(json.dumps({{'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    assert _run(script, tmp_path)["loaded"] == []
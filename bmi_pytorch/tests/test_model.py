@@ -63,3 +63,108 @@ def test_data_load(data_dims: Tuple[int, int]):
     assert isinstance(precip_mean, np.ndarray), "Precip mean is not a numpy array"
     assert runoff_mean.shape == data_dims, "Runoff mean shape is incorrect"
     assert precip_mean.shape == data_dims, "Precip mean shape is incorrect"
+
+
+@pytest.mark.parametrize("hidden_size", [[], [10], [10, 10], [10, 15, 20]])
+def test_collapsed_layers(config: Config, input: torch.Tensor, hidden_size):
+    """Folded single layer inference matches the layered forward pass
+
+    Args:
+        config (Config): model configuration
+        input (torch.Tensor): an Nx1 set of inputs
+        hidden_size (List[int]): hidden layer sizes
+    """
+    config.hidden_size = hidden_size
+    model = Model(config)
+    model.collapse_layers = True
+    # Layered path used in training mode, folded path in eval mode
+    layered = model.train()(input).detach()
+    collapsed = model.eval()(input)
+    assert torch.allclose(layered, collapsed, atol=1e-5)
+
+
+def test_collapsed_layers_refresh(config: Config, input: torch.Tensor):
+    """Folded weights are recomputed after the parameters change
+
+    Args:
+        config (Config): model configuration
+        input (torch.Tensor): an Nx1 set of inputs
+    """
+    config.hidden_size = [10, 10]
+    config.collapse_layers = True
+    model = Model(config)
+    optimizer = torch.optim.SGD(model.parameters(), config.learning_rate)
+
+    model.eval()
+    before = model(input).detach()
+    # Take an optimizer step, which modifies the parameters in place
+    model.train()
+    model(input).sum().backward()
+    optimizer.step()
+    layered = model(input).detach()
+    model.eval()
+    after = model(input).detach()
+    assert not torch.allclose(before, after)
+    assert torch.allclose(layered, after, atol=1e-5)
+
+    # Loading a state dict also invalidates the folded weights
+    other = Model(config)
+    model.load_state_dict(other.state_dict())
+    other.eval()
+    assert torch.allclose(model(input), other(input), atol=1e-5)
+
+
+@pytest.mark.parametrize("activation", [None, torch.relu])
+def test_forward_out(config: Config, input: torch.Tensor, activation):
+    """Forward writes its result into a preallocated out tensor
+
+    Args:
+        config (Config): model configuration
+        input (torch.Tensor): an Nx1 set of inputs
+        activation (Callable): activation function
+    """
+    config.hidden_size = [10, 10]
+    model = Model(config, activation=activation)
+    out = torch.empty(input.shape[0], config.output_size)
+    with torch.inference_mode():
+        result = model(input, out=out)
+        assert result is out
+        assert torch.allclose(out, model(input))
+
+
+def test_flat_parameters(config: Config, input: torch.Tensor):
+    """Packed parameters match the per-layer layout, as views of one flat Parameter
+
+    Args:
+        config (Config): model configuration
+        input (torch.Tensor): an Nx1 set of inputs
+    """
+    config.hidden_size = [10, 15, 20]
+    torch.manual_seed(0)
+    layered = Model(config)
+    config.flat_parameters = True
+    torch.manual_seed(0)
+    model = Model(config)
+    assert [name for name, _ in model.named_parameters()] == ["flat"]
+    assert len(model.weights) == len(layered.weights) == 3
+    for w, b, lw, lb in zip(model.weights, model.bias, layered.weights, layered.bias):
+        assert torch.equal(w, lw) and torch.equal(b, lb)
+        assert w.untyped_storage().data_ptr() == model.flat.untyped_storage().data_ptr()
+    assert torch.equal(model(input), layered(input))
+
+    # Gradients accumulate in the flat Parameter's grad
+    model(input).sum().backward()
+    layered(input).sum().backward()
+    for grad, w in zip(model.weights.views(model.flat.grad), layered.weights):
+        assert torch.allclose(grad, w.grad)
+
+    # One optimizer update of the flat Parameter updates every layer
+    optimizer = torch.optim.SGD(model.parameters(), config.learning_rate)
+    before = model.weights[0].detach().clone()
+    optimizer.step()
+    assert not torch.equal(model.weights[0], before)
+
+    # In place writes through the views modify the flat Parameter
+    with torch.no_grad():
+        model.bias[-1].fill_(1.0)
+    assert torch.all(model.flat[-config.output_size :] == 1.0)
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..config import Config
+from ..ensemble import Ensemble
+from ..model import Model
+from ..numpy_model import Bmi_NumpyModel, export_bundle, load_bundle
+
+
+@pytest.mark.parametrize("activation", [None, torch.relu, torch.tanh, torch.sigmoid])
+@pytest.mark.parametrize("hidden_size", [[], [10, 10], [10, 15, 20]])
+@pytest.mark.parametrize("collapse_layers", [False, True])
+def test_numpy_parity(
+    config: Config, input, tmp_path, activation, hidden_size, collapse_layers
+):
+    """The NumPy backend matches the torch Model"""
+    config.hidden_size = hidden_size
+    config.collapse_layers = collapse_layers
+    model = Model(config, activation=activation).eval()
+    path = tmp_path / "model.npz"
+    export_bundle(model, config, path)
+    loaded_config, numpy_model = load_bundle(path)
+    assert loaded_config == config
+    with torch.no_grad():
+        expected = model(input).numpy()
+    assert np.allclose(numpy_model(input.numpy()), expected, atol=1e-5)
+    out = np.empty_like(expected)
+    assert numpy_model(input.numpy(), out=out) is out
+    assert np.allclose(out, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("exchange_dtype", ["float32", "float64"])
+def test_bmi_numpy_parity(config: Config, tmp_path, exchange_dtype):
+    """Bmi_NumpyModel exposes the variables of Bmi_Model, with the same results"""
+    config.hidden_size = [10, 10]
+    config.basins = 5
+    config.run_mode = "inference"
+    config.exchange_dtype = exchange_dtype
+    reference = Bmi_Model()
+    reference.initialize(config)
+    path = tmp_path / "model.npz"
+    export_bundle(reference.model, config, path)
+    bmi = Bmi_NumpyModel()
+    bmi.initialize(path)
+
+    assert bmi.get_output_var_names() == reference.get_output_var_names()
+    for name in ("precipitation", "runoff"):
+        assert bmi.get_var_type(name) == reference.get_var_type(name)
+        assert bmi.get_var_nbytes(name) == reference.get_var_nbytes(name)
+        assert bmi.get_var_grid(name) == reference.get_var_grid(name)
+    runoff = bmi.get_value_ptr("runoff")
+    precip = np.linspace(0, 4, 5)
+    for m in (reference, bmi):
+        m.set_value("precipitation", precip)
+        m.update_until(3 * m.get_time_step())
+    assert bmi.get_current_time() == reference.get_current_time()
+    assert np.allclose(runoff, reference.get_value_ptr("runoff"), atol=1e-5)
+
+
+def test_export_requires_model(tmp_path):
+    with pytest.raises(ValueError):
+        export_bundle(Ensemble.from_config(Config(), 2), Config(), tmp_path / "e.npz")
+    with pytest.raises(ValueError):
+        model = Model(Config(), activation=torch.nn.functional.gelu)
+        export_bundle(model, Config(), tmp_path / "m.npz")
+
+
+def test_numpy_backend_imports_no_torch(config: Config, tmp_path):
+    path = tmp_path / "model.npz"
+    export_bundle(Model(config), config, path)
+    script = (
+        "import sys\n"
+        "from bmi_pytorch.numpy_model import Bmi_NumpyModel\n"
+        "bmi = Bmi_NumpyModel()\n"
+        f"bmi.initialize({str(path)!r})\n"
+        "bmi.update()\n"
+        "assert 'torch' not in sys.modules, 'torch was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=tmp_path)
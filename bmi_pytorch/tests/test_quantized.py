@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..config import Config
+from ..engine import build_engine
+from ..ensemble import Ensemble
+from ..model import Model
+from ..quantized import QuantizedModel, accuracy_report
+from ..utils import load_data, normalize
+
+
+@pytest.fixture
+def camels():
+    runoff, precip = load_data(Path(__file__).parent / "data/CAMELS")
+    return normalize(runoff).astype(np.float32), normalize(precip).astype(np.float32)
+
+
+@pytest.mark.parametrize("backend", ["fbgemm", "qnnpack"])
+@pytest.mark.parametrize(
+    "collapse_layers,tolerance",
+    # quantization error compounds through each quantized layer
+    [(False, 0.15), (True, 0.02)],
+)
+def test_int8_accuracy(config: Config, camels, backend, collapse_layers, tolerance):
+    """The int8 engine tracks the float32 Model on the CAMELS data"""
+    if backend not in torch.backends.quantized.supported_engines:
+        pytest.skip(f"{backend} quantized backend unavailable")
+    _, precip = camels
+    config.hidden_size = [1, 64, 64]
+    config.collapse_layers = collapse_layers
+    torch.manual_seed(0)
+    model = Model(config)
+
+    default = torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    try:
+        engine = build_engine(model, "int8", torch.zeros(1, 1))
+        report = accuracy_report(model, engine, torch.from_numpy(precip))
+    finally:
+        torch.backends.quantized.engine = default
+    assert report.relative_rmse < tolerance
+
+
+def test_int8_requires_float32_model(config: Config):
+    config.compute_dtype = "float64"
+    with pytest.raises(ValueError):
+        QuantizedModel(Model(config))
+    with pytest.raises(ValueError):
+        QuantizedModel(Ensemble.from_config(Config(), 2))
+
+
+@pytest.mark.parametrize(
+    "fields,match",
+    [
+        ({"compute_dtype": "bfloat16"}, "compute_dtype"),
+        ({"compute_dtype": "float64"}, "compute_dtype"),
+        ({"ensemble_size": 2}, "ensemble"),
+    ],
+)
+def test_int8_config(fields, match):
+    """Config rejects settings the int8 engine can't run with"""
+    with pytest.raises(ValueError, match=match):
+        Config(engine="int8", run_mode="inference", **fields)
+
+
+def test_bmi_int8_engine(config: Config, bmi_model):
+    """Bmi_Model selects the int8 engine from its Config"""
+    config.engine = "int8"
+    config.run_mode = "inference"
+    config.hidden_size = [1, 32, 32]
+    config.basins = 8
+    bmi_model.initialize(config)
+    assert isinstance(bmi_model._forward, QuantizedModel)
+    precip = np.linspace(0, 1, 8)
+    bmi_model.set_value("precipitation", precip)
+    bmi_model.update()
+    expected = bmi_model._forward(torch.tensor(precip, dtype=torch.float32)[:, None])
+    assert np.allclose(bmi_model.get_value_ptr("runoff"), expected.ravel().numpy())
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from ..config import Config
+from ..store import WeightStore, model_key, weight_store
+
+
+def test_store_builds_once():
+    store = WeightStore()
+    calls = []
+    build = lambda: calls.append(1) or object()
+    item = store.get("a", build)
+    assert store.get("a", build) is item
+    assert len(calls) == 1
+    assert len(store) == 1
+    store.clear()
+    assert store.get("a", build) is not item
+
+
+def test_model_key(config: Config):
+    other = config.model_copy()
+    other.learning_rate = 1.0
+    other.run_mode = "inference"
+    assert model_key(config) == model_key(other)
+    other.hidden_size = [10]
+    assert model_key(config) != model_key(other)
+
+
+@pytest.mark.parametrize("engine", ["eager", "script"])
+def test_inference_instances_share_model(config: Config, engine):
+    """Inference instances share one frozen model, engine, and no optimizer"""
+    config.run_mode = "inference"
+    config.engine = engine
+    models = [Bmi_Model() for _ in range(100)]
+    for m in models:
+        m.initialize(config)
+    first = models[0]
+    assert all(m.model is first.model for m in models)
+    assert all(m._forward is first._forward for m in models)
+    assert all(m.optimizer is None for m in models)
+    assert not any(p.requires_grad for p in first.model.parameters())
+    # Each instance still has its own exchange buffers
+    assert models[1].input.data_ptr() != first.input.data_ptr()
+    assert len(weight_store) == 2
+
+
+def test_training_instances_own_model(config: Config):
+    a, b = Bmi_Model(), Bmi_Model()
+    a.initialize(config)
+    b.initialize(config)
+    assert a.model is not b.model
+    assert a.optimizer is not None
+    assert len(weight_store) == 0
+
+
+def test_share_memory(config: Config):
+    config.run_mode = "inference"
+    config.share_memory = True
+    m = Bmi_Model()
+    m.initialize(config)
+    assert all(p.is_shared() for p in m.model.parameters())
+
+
+@pytest.mark.parametrize("engine", ["eager", "script"])
+def test_share_memory_after_unshared(config: Config, engine):
+    """An instance requesting shared memory shares a model stored by one that didn't"""
+    config.run_mode = "inference"
+    config.engine = engine
+    unshared = Bmi_Model()
+    unshared.initialize(config)
+    assert not any(p.is_shared() for p in unshared.model.parameters())
+    config.share_memory = True
+    shared = Bmi_Model()
+    shared.initialize(config)
+    assert shared.model is unshared.model
+    assert all(p.is_shared() for p in shared.model.parameters())
+    # both instances still evaluate the moved parameters
+    for m in (unshared, shared):
+        m.set_value("precipitation", np.array([0.5], dtype=np.float32))
+        m.update()
+    assert torch.equal(unshared.output, shared.output)
@@ -0,0 +1,114 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from ..config import Config
+from ..sweep import (
+    LogUniform,
+    Uniform,
+    grid_search,
+    load_results,
+    random_search,
+    run_sweep,
+    trial_id,
+)
+
+
+def test_grid_search():
+    trials = grid_search({"hidden_size": [[], [10, 10]], "learning_rate": [0.1, 0.01]})
+    assert len(trials) == 4
+    assert {"hidden_size": [10, 10], "learning_rate": 0.01} in trials
+
+
+def test_random_search():
+    space = {
+        "learning_rate": LogUniform(1e-4, 1e-1),
+        "min_delta": Uniform(0.0, 1.0),
+        "hidden_size": [[], [10, 10]],
+    }
+    trials = random_search(space, 20, seed=42)
+    assert len(trials) == 20
+    assert all(1e-4 <= t["learning_rate"] <= 1e-1 for t in trials)
+    assert all(0.0 <= t["min_delta"] <= 1.0 for t in trials)
+    assert all(t["hidden_size"] in space["hidden_size"] for t in trials)
+    assert random_search(space, 20, seed=42) == trials
+
+
+def test_trial_id():
+    assert trial_id({"a": 1, "b": 2}) == trial_id({"b": 2, "a": 1})
+    assert trial_id({"a": 1}) != trial_id({"a": 2})
+    # the same trial of a different base config
+    assert trial_id({"a": 1}, {"b": 1}) != trial_id({"a": 1}, {"b": 2})
+
+
+def test_run_sweep_resume(config: Config, tmp_path):
+    """Completed trials are recorded, and skipped when the sweep is run again"""
+    precip = np.random.default_rng(42).uniform(-1, 1, (64, 1))
+    runoff = 2 * precip + 1
+    config.epochs = 2
+    trials = grid_search({"hidden_size": [[], [10, 10]], "learning_rate": [0.1, 0.01]})
+    results = tmp_path / "results.csv"
+
+    # a partial run, e.g. stopped after the first two trials
+    rows = run_sweep(trials[:2], config, runoff, precip, results, max_workers=2)
+    assert len(rows) == 2
+    rows = run_sweep(trials, config, runoff, precip, results, max_workers=2)
+    assert len(rows) == 4
+    base = config.model_dump(mode="json")
+    assert sorted(row["trial"] for row in rows) == sorted(
+        trial_id(t, base) for t in trials
+    )
+    assert {json.dumps(t, sort_keys=True) for t in trials} == {
+        row["params"] for row in rows
+    }
+    # nothing left to run
+    assert run_sweep(trials, config, runoff, precip, results) == load_results(results)
+    # the shared training data is removed
+    assert list(tmp_path.iterdir()) == [results]
+    # the same trials of another base config are run
+    config.epochs = 1
+    rows = run_sweep(trials[:1], config, runoff, precip, results, max_workers=1)
+    assert len(rows) == 5
+
+
+def test_run_sweep_failed_trial(config: Config, tmp_path):
+    """A failed trial is recorded without losing the others, and rerun on resume"""
+    precip = np.random.default_rng(42).uniform(-1, 1, (64, 1))
+    runoff = 2 * precip + 1
+    config.epochs = 2
+    trials = [
+        {"learning_rate": 0.1},
+        {"learning_rate": "fast"},
+        {"learning_rate": 0.01},
+    ]
+    results = tmp_path / "results.csv"
+    # interrupted after the first two trials
+    rows = run_sweep(trials[:2], config, runoff, precip, results, max_workers=2)
+    assert len(rows) == 2
+    failed = [row for row in rows if row["error"]]
+    assert [row["params"] for row in failed] == ['{"learning_rate": "fast"}']
+    assert all(row["loss"] for row in rows if not row["error"])
+    # resumed, the failed trial is run again and its last row replaces the first
+    rows = run_sweep(trials, config, runoff, precip, results, max_workers=2)
+    assert len(rows) == 3
+    assert len({row["trial"] for row in rows}) == 3
+    assert sum(1 for row in rows if row["error"]) == 1
+    # the table keeps both rows of the failed trial
+    with open(results, newline="") as fp:
+        assert len(list(csv.DictReader(fp))) == 4
+
+
+def test_run_sweep_data_dirs(config: Config, tmp_path):
+    """Sweeps with results tables of the same stem don't share training data"""
+    precip = np.zeros((8, 1))
+    config.epochs = 1
+    # e.g. the data of a sweep writing results.json
+    (tmp_path / ".results_data").mkdir()
+    run_sweep([{}], config, precip, precip, tmp_path / "results.csv", max_workers=1)
+    # the other sweep's data is left alone
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        ".results_data",
+        "results.csv",
+    ]
@@ -0,0 +1,68 @@
+import logging
+import os
+
+import pytest
+import torch
+
+from ..bmi_model import Bmi_Model
+from .. import threads
+from ..config import Config
+from ..threads import configure_threads
+
+
+@pytest.fixture
+def num_threads():
+    """Restore the intra-op thread count after the test"""
+    threads = torch.get_num_threads()
+    yield threads
+    torch.set_num_threads(threads)
+
+
+def test_configure_intra_op(num_threads):
+    configure_threads(intra_op=2)
+    assert torch.get_num_threads() == 2
+    # None leaves the setting unchanged
+    configure_threads()
+    assert torch.get_num_threads() == 2
+
+
+def test_configure_inter_op_once(caplog, monkeypatch):
+    """Changing inter-op threads once the pool is fixed warns once instead of raising"""
+    monkeypatch.setattr(threads, "_inter_op_warned", False)
+    current = torch.get_num_interop_threads()
+    try:
+        # fixes the pool size, if nothing has already
+        torch.set_num_interop_threads(current)
+    except RuntimeError:
+        pass
+    with caplog.at_level(logging.WARNING, logger=threads.__name__):
+        configure_threads(inter_op=current)
+        assert not caplog.records
+        configure_threads(inter_op=current + 1)
+        configure_threads(inter_op=current + 1)
+    assert len(caplog.records) == 1
+    assert "Unable to set inter-op threads" in caplog.records[0].getMessage()
+    assert torch.get_num_interop_threads() == current
+
+
+def test_config_threads_default(config: Config, num_threads):
+    """The default config leaves the torch thread pools as they are"""
+    assert config.intra_op_threads is None and config.inter_op_threads is None
+    torch.set_num_threads(2)
+    Bmi_Model().initialize(config)
+    assert torch.get_num_threads() == 2
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="requires sched_setaffinity"
+)
+def test_configure_affinity():
+    cpus = os.sched_getaffinity(0)
+    configure_threads(cpu_affinity=cpus)
+    assert os.sched_getaffinity(0) == cpus
+
+
+def test_bmi_initialize_threads(config: Config, num_threads):
+    config.intra_op_threads = 3
+    Bmi_Model().initialize(config)
+    assert torch.get_num_threads() == 3
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from ..config import Config
+from ..model import Model
+from ..trainer import Trainer
+from ..utils import load_data, normalize
+
+
+@pytest.fixture
+def linear_data():
+    """runoff = 2 * precip + 1"""
+    precip = np.random.default_rng(42).uniform(-1, 1, (256, 1))
+    return 2 * precip + 1, precip
+
+
+def test_trainer_fit(config: Config, linear_data):
+    config.epochs = 50
+    config.batch_size = 32
+    config.learning_rate = 0.05
+    torch.manual_seed(42)
+    trainer = Trainer(Model(config), config, *linear_data)
+    history = trainer.fit()
+    assert len(history) == 50
+    assert history[-1].loss < history[0].loss
+    assert history[-1].loss < 1e-3
+    assert all(stats.samples_per_second > 0 for stats in history)
+
+
+@pytest.mark.parametrize("samples", [64, 48])
+def test_trainer_accumulation(config: Config, linear_data, samples):
+    """Accumulating up to 4 batches of 16 is one step on a batch of all samples,
+    including a partial group of 3 batches"""
+    runoff, precip = linear_data[0][:samples], linear_data[1][:samples]
+    config.epochs = 1
+    models = []
+    for batch_size, steps in ((samples, 1), (16, 4)):
+        config.batch_size = batch_size
+        config.accumulation_steps = steps
+        torch.manual_seed(42)
+        model = Model(config)
+        Trainer(model, config, runoff, precip).fit()
+        models.append(model)
+    for a, b in zip(models[0].parameters(), models[1].parameters()):
+        assert torch.allclose(a, b, atol=1e-6)
+
+
+def test_trainer_early_stopping(config: Config, linear_data):
+    config.epochs = 100
+    config.patience = 2
+    # a model that can't improve
+    config.learning_rate = 0.0
+    trainer = Trainer(Model(config), config, *linear_data, validation=linear_data)
+    history = trainer.fit()
+    assert len(history) == 3
+    assert history[-1].validation_loss is not None
+
+
+def test_trainer_camels(config: Config):
+    """Training on the CAMELS basin means reduces the loss"""
+    runoff, precip = load_data(Path(__file__).parent / "data/CAMELS")
+    config.epochs = 5
+    config.hidden_size = [10, 10]
+    trainer = Trainer(Model(config), config, normalize(runoff), normalize(precip))
+    history = trainer.fit()
+    assert history[-1].loss < history[0].loss
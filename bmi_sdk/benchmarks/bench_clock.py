@@ -0,0 +1,39 @@
+"""
+Benchmark advancing model time and reading it back each step, with the bmi_clock.Clock
+compared to accumulating the time of a pydantic BmiTime
+
+usage: python bench_clock.py [--steps N]
+"""
+
+import argparse
+import time
+
+from bmi_sdk.bmi_clock import Clock
+from bmi_sdk.bmi_time import BmiTime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    clock = Clock.from_time(BmiTime(time_step=0.1))
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        clock.advance()
+        clock.current_time
+    elapsed = (time.perf_counter() - start) / args.steps * 1e9
+    print(f"Clock: {elapsed:.0f} ns/step, time {clock.current_time!r}")
+
+    # the previous Bmi_Model update, accumulating time_step on the pydantic model
+    bmi_time = BmiTime(time_step=0.1)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        bmi_time.current_time += bmi_time.time_step
+        bmi_time.current_time
+    elapsed = (time.perf_counter() - start) / args.steps * 1e9
+    print(f"BmiTime: {elapsed:.0f} ns/step, time {bmi_time.current_time!r}")
+
+
+if __name__ == "__main__":
+    main()
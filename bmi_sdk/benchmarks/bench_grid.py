@@ -0,0 +1,75 @@
+"""
+Benchmark polling the grid meta data of a uniform rectilinear grid through the
+Bmi_Minimal get_grid_* functions, as a framework does each coupling step
+
+usage: python bench_grid.py [--shape 1000 1000] [--calls N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from bmi_sdk.bmi_grid import Grid, GridType
+from bmi_sdk.bmi_minimal import Bmi_Minimal
+
+
+class GridBmi(Bmi_Minimal):
+    """Bmi with a single registered grid"""
+
+    def __init__(self, grid: Grid):
+        super().__init__()
+        self.register_grid(grid)
+
+    def initialize(self, config_file: str) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def finalize(self) -> None:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shape", type=int, nargs=2, default=[1000, 1000])
+    parser.add_argument("--calls", type=int, default=10_000)
+    args = parser.parse_args()
+
+    grid = Grid(0, 2, GridType.uniform_rectilinear)
+    grid.shape = args.shape
+    grid.spacing = (1.0, 1.0)
+    bmi = GridBmi(grid)
+    rank = bmi.get_grid_rank(0)
+    shape, spacing, origin = np.empty(rank, np.int32), np.empty(rank), np.empty(rank)
+    x, y = np.empty(args.shape[1]), np.empty(args.shape[0])
+
+    def poll():
+        bmi.get_grid_size(0)
+        bmi.get_grid_shape(0, shape)
+        bmi.get_grid_spacing(0, spacing)
+        bmi.get_grid_origin(0, origin)
+        bmi.get_grid_x(0, x)
+        bmi.get_grid_y(0, y)
+
+    start = time.perf_counter()
+    poll()
+    print(
+        f"first poll (builds coordinates): {(time.perf_counter() - start) * 1e3:.2f} ms"
+    )
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        poll()
+    print(f"poll: {(time.perf_counter() - start) / args.calls * 1e6:.2f} us")
+    tracemalloc.start()
+    for _ in range(100):
+        poll()
+    print(
+        f"peak traced allocation over 100 polls: {tracemalloc.get_traced_memory()[1]} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
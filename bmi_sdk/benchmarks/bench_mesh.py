@@ -0,0 +1,87 @@
+"""
+Benchmark serving a large quadrilateral UnstructuredGrid through the Bmi_Minimal
+connectivity functions, with the mesh memory mapped from .npy files
+
+usage: python bench_mesh.py [--cells 1000] [--calls N]
+    the mesh is a --cells x --cells square of quadrilateral faces
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from bmi_sdk.bmi_grid import UnstructuredGrid
+from bmi_sdk.bmi_minimal import Bmi_Minimal
+
+
+class MeshBmi(Bmi_Minimal):
+    """Bmi with a single registered grid"""
+
+    def __init__(self, grid):
+        super().__init__()
+        self.register_grid(grid)
+
+    def initialize(self, config_file: str) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def finalize(self) -> None:
+        pass
+
+
+def square_mesh(cells: int) -> UnstructuredGrid:
+    """cells x cells quadrilateral faces over a (cells + 1)^2 node lattice"""
+    n = cells + 1
+    y, x = np.divmod(np.arange(n * n, dtype=np.int32), n)
+    # lower left node of each face
+    corner = (np.arange(cells, dtype=np.int32)[:, None] * n + np.arange(cells)).ravel()
+    face_nodes = np.stack([corner, corner + 1, corner + n + 1, corner + n], axis=1)
+    return UnstructuredGrid(
+        0,
+        node_x=x.astype(np.float64),
+        node_y=y.astype(np.float64),
+        face_node_offsets=np.arange(0, 4 * len(corner) + 1, 4, dtype=np.int32),
+        face_nodes=face_nodes.astype(np.int32).ravel(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cells", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        square_mesh(args.cells).save(tmp)
+        start = time.perf_counter()
+        mesh = UnstructuredGrid.load(0, tmp)
+        print(
+            f"load {mesh.face_count} faces: {(time.perf_counter() - start) * 1e3:.2f} ms"
+        )
+        bmi = MeshBmi(mesh)
+        faces = bmi.get_grid_face_count(0)
+        nodes_per_face = np.empty(faces, dtype=np.int32)
+        face_nodes = np.empty(int(mesh.face_node_offsets[-1]), dtype=np.int32)
+        x = np.empty(bmi.get_grid_node_count(0))
+        for name, call in [
+            (
+                "get_grid_nodes_per_face",
+                lambda: bmi.get_grid_nodes_per_face(0, nodes_per_face),
+            ),
+            ("get_grid_face_nodes", lambda: bmi.get_grid_face_nodes(0, face_nodes)),
+            ("get_grid_x", lambda: bmi.get_grid_x(0, x)),
+        ]:
+            call()
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                call()
+            cost = (time.perf_counter() - start) / args.calls * 1e3
+            print(f"{name:>24}: {cost:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
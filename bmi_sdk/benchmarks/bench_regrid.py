@@ -0,0 +1,71 @@
+"""
+Benchmark regridding a uniform rectilinear forcing field to basins, comparing the
+precomputed sparse weights of bmi_regrid.Regridder with per basin masking
+
+usage: python bench_regrid.py [--shape 1000 1000] [--basins 671] [--basin-cells 10]
+    each basin is a random square polygon about --basin-cells cells wide
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from bmi_sdk.bmi_grid import Grid, GridType
+from bmi_sdk.bmi_regrid import Regridder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shape", type=int, nargs=2, default=[1000, 1000])
+    parser.add_argument("--basins", type=int, default=671)
+    parser.add_argument("--basin-cells", type=float, default=10.0)
+    parser.add_argument("--steps", type=int, default=100)
+    args = parser.parse_args()
+
+    grid = Grid(0, 2, GridType.uniform_rectilinear)
+    grid.shape = args.shape
+    grid.spacing = (1.0, 1.0)
+    rng = np.random.default_rng(0)
+    width = args.basin_cells
+    corners = rng.uniform(0, np.array(args.shape[::-1]) - width - 1, (args.basins, 2))
+    square = np.array([(0, 0), (width, 0), (width, width), (0, width)])
+    polygons = [corner + square for corner in corners]
+    field = rng.uniform(0, 10, args.shape)
+    out = np.empty(args.basins, dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / "weights.npz"
+        start = time.perf_counter()
+        regridder = Regridder.from_polygons(grid, polygons, cache=cache)
+        print(
+            f"build weights ({len(regridder.data)} nonzeros): {time.perf_counter() - start:.2f} s"
+        )
+        start = time.perf_counter()
+        regridder = Regridder.from_polygons(grid, polygons, cache=cache)
+        print(f"load cached weights: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        regridder.apply(field, out)
+    sparse = (time.perf_counter() - start) / args.steps
+    print(f"sparse regrid: {sparse * 1e3:.3f} ms/step")
+
+    # baseline: boolean mask per basin (cell centres inside the square)
+    y, x = np.meshgrid(grid.grid_y, grid.grid_x, indexing="ij")
+    masks = [
+        (x >= c[0]) & (x < c[0] + width) & (y >= c[1]) & (y < c[1] + width)
+        for c in corners
+    ]
+    start = time.perf_counter()
+    for _ in range(max(args.steps // 10, 1)):
+        for i, mask in enumerate(masks):
+            out[i] = field[mask].mean()
+    masked = (time.perf_counter() - start) / max(args.steps // 10, 1)
+    print(f"per basin masking: {masked * 1e3:.3f} ms/step ({masked / sparse:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
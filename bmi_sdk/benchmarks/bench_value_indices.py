@@ -0,0 +1,76 @@
+"""
+Benchmark Bmi_Minimal get_value_at_indices / set_value_at_indices / set_value throughput
+for scattered index sets
+
+usage: python bench_value_indices.py [--size N] [--seconds S]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bmi_sdk.bmi_minimal import Bmi_Minimal
+from bmi_sdk.bmi_var import ValueStore
+
+
+class ArrayBmi(Bmi_Minimal):
+    """Bmi exposing a single flat float64 variable "x" """
+
+    def __init__(self, size: int):
+        super().__init__()
+        self._values = ValueStore(self._var_info)
+        self._values["x"] = np.zeros(size, dtype=np.float64)
+
+    def initialize(self, config_file: str) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def finalize(self) -> None:
+        pass
+
+    def get_value_ptr(self, name: str) -> np.ndarray:
+        return self._values[name]
+
+
+def calls_per_second(call, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    end = start + seconds
+    while time.perf_counter() < end:
+        call()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10**6)
+    parser.add_argument("--seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    bmi = ArrayBmi(args.size)
+    rng = np.random.default_rng(42)
+    src = rng.uniform(size=args.size)
+    set_value = calls_per_second(lambda: bmi.set_value("x", src), args.seconds)
+    print(f"set_value of {args.size} values: {set_value:.1f} calls/s")
+    print(f"{'indices':>8} {'get_at_indices':>16} {'set_at_indices':>16}  (calls/s)")
+    n = 10
+    while n <= args.size:
+        inds = rng.choice(args.size, n, replace=False)
+        dest = np.empty(n)
+        values = rng.uniform(size=n)
+        get = calls_per_second(
+            lambda: bmi.get_value_at_indices("x", dest, inds), args.seconds
+        )
+        put = calls_per_second(
+            lambda: bmi.set_value_at_indices("x", inds, values), args.seconds
+        )
+        print(f"{n:>8} {get:16.1f} {put:16.1f}")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
-from .exceptions import UnknownBMIVariable
+from .exceptions import UnknownBMIGrid, UnknownBMIVariable
 
-__all__ = [UnknownBMIVariable]
+__all__ = [UnknownBMIGrid, UnknownBMIVariable]
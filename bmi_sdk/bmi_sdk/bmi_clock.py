@@ -0,0 +1,128 @@
+"""bmi_clock.py
+Lightweight model clock backing the BMI time functions
+
+BmiTime validates the time configuration, a Clock is built from it once and then
+advanced on the hot path without validation.  Model time is start + steps * time_step
+from an integer step count, so it doesn't drift as floating point error accumulates.
+
+@version 0.1
+"""
+
+import math
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from .bmi_time import BmiTime
+
+# Seconds per unit of each bmi_time.TimeUnits value
+UNIT_SECONDS: Dict[str, float] = {
+    **dict.fromkeys(("s", "sec", "second", "seconds"), 1.0),
+    **dict.fromkeys(("min", "minute", "minutes"), 60.0),
+    **dict.fromkeys(("h", "hr", "hour", "hours"), 3600.0),
+    **dict.fromkeys(("d", "day", "days"), 86400.0),
+}
+
+
+class Clock:
+    """Model time as an integer count of time steps"""
+
+    __slots__ = (
+        "start_time",
+        "end_time",
+        "time_step",
+        "units",
+        "step",
+        "_base",
+        "_seconds",
+    )
+
+    def __init__(
+        self,
+        start_time: float = 0.0,
+        end_time: float = float("inf"),
+        time_step: float = 3600.0,
+        units: str = "s",
+        current_time: Optional[float] = None,
+    ):
+        """
+        Args:
+            start_time (float, optional): Defaults to 0.0.
+            end_time (float, optional): Defaults to inf, no end time.
+            time_step (float, optional): Duration of each update. Defaults to 3600.0.
+            units (str, optional): one of the bmi_time.TimeUnits. Defaults to "s".
+            current_time (float, optional): time of step 0. Defaults to None, the
+                start time.
+
+        Raises:
+            ValueError: @p time_step is 0 or @p units is unknown
+        """
+        if not time_step:
+            raise ValueError("time_step must be nonzero")
+        if units not in UNIT_SECONDS:
+            raise ValueError(f"Unknown time units {units}")
+        self.start_time: float = float(start_time)
+        self.end_time: float = float(end_time)
+        self.time_step: float = float(time_step)
+        self.units: str = units
+        # number of updates since step 0
+        self.step: int = 0
+        self._base: float = self.start_time if current_time is None else current_time
+        self._seconds: float = UNIT_SECONDS[units]
+
+    @classmethod
+    def from_time(cls, time: "BmiTime") -> "Clock":
+        """Clock starting at the current time of a validated BmiTime
+
+        Args:
+            time (BmiTime): time configuration
+
+        Returns:
+            Clock: the clock
+        """
+        return cls(
+            time.start_time,
+            time.end_time,
+            time.time_step,
+            time.units,
+            time.current_time,
+        )
+
+    @property
+    def current_time(self) -> float:
+        """The current model time"""
+        return self._base + self.step * self.time_step
+
+    def advance(self, steps: int = 1) -> None:
+        """Advance the clock by @p steps time steps"""
+        self.step += steps
+
+    def steps_until(self, time: float) -> int:
+        """Number of time steps needed to reach @p time from the current time
+
+        The steps are clamped to the whole steps left before the end time, so the
+        clock is never advanced past end_time.
+
+        Args:
+            time (float): model time
+
+        Returns:
+            int: number of steps, 0 if @p time or the end time has been reached
+        """
+        # round to guard against floating point error in the time difference
+        steps = round((time - self.current_time) / self.time_step, 9)
+        if math.isfinite(self.end_time):
+            remaining = round((self.end_time - self.current_time) / self.time_step, 9)
+            steps = min(steps, math.floor(remaining))
+        return max(0, math.ceil(steps))
+
+    def convert(self, time: float, units: str) -> float:
+        """Convert a duration (or time) from the clock units to @p units
+
+        Args:
+            time (float): value in the clock units
+            units (str): one of the bmi_time.TimeUnits
+
+        Returns:
+            float: value in @p units
+        """
+        return time * self._seconds / UNIT_SECONDS[units]
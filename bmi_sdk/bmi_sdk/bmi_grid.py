@@ -5,9 +5,10 @@ Module for supporting BMI grid meta data and functionality
 @version 0.1
 """
 
+import os
 from enum import Enum
-from functools import reduce
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import numpy as np
 
@@ -46,7 +47,7 @@ class GridType(str, Enum):
     points = ("points",)  # 1 dim
     vector = ("vector",)  # 1 dim
     unstructured = ("unstructured",)  # 1-N
-    structured_quadrilateral = ("structured_quadrilaterl",)  # 2 dim
+    structured_quadrilateral = ("structured_quadrilateral",)  # 2 dim
     rectilinear = ("rectilinear",)  # 2 dim dx != dy
     uniform_rectilinear = "uniform_rectilinear"  # 2 dim -- dx = dy
 
@@ -64,8 +65,22 @@ class GridUnits(Enum):
 class Grid:
     """
     Structure for holding required BMI meta data for any grid intended to be used via BMI
+
+    Derived values (size and coordinates) are computed on first access and cached until
+    the shape, spacing, or origin is set again.
     """
 
+    __slots__ = (
+        "_id",
+        "_rank",
+        "_type",
+        "_shape",
+        "_spacing",
+        "_origin",
+        "_units",
+        "_derived",
+    )
+
     def __init__(
         self, id: int, rank: int, type: GridType, units: GridUnits = GridUnits.none
     ):
@@ -78,12 +93,13 @@ class Grid:
         """
         self._id: int = id
         self._rank: int = rank
-        self._size: int = 0
         self._type: GridType = type  # FIXME validate type/rank?
         self._shape: "NDArray[np.int32]" = None  # array of size rank
         self._spacing: "NDArray[np.float64]" = None  # array of size rank
         self._origin: "NDArray[np.float64]" = None  # array of size rank
         self._units: "NDArray[np.int16]" = None  # array of size rank
+        # cache of values derived from shape, spacing, and origin
+        self._derived: Dict[str, Any] = {}
 
         if rank == 0:
             # We have to use a 1 dim representation for a scalar cause numpy initialization is weird
@@ -170,8 +186,22 @@ class Grid:
         if self.shape is None or self.shape.ndim == 0:  # it is None or np.array( () )
             return 0
         else:
-            # multiply the shape of each dimension together
-            return reduce(lambda x, y: x * y, self._shape)
+            size = self._derived.get("size")
+            if size is None:
+                # multiply the shape of each dimension together, in int64 since the
+                # product of int32 dimensions can overflow int32
+                size = int(np.prod(self._shape, dtype=np.int64))
+                self._derived["size"] = size
+            return size
+
+    @property
+    def node_count(self) -> int:
+        """The number of grid nodes, the grid size for structured grids
+
+        Returns:
+            int: number of nodes
+        """
+        return self.size
 
     @property
     def type(self) -> GridType:
@@ -210,6 +240,7 @@ class Grid:
         if self.rank > 0:
             self._shape = np.array(shape, dtype=np.int32)
             self._shape.flags.writeable = False
+            self._derived.clear()
         # noop for scalar or grids with rank < 1
 
     @property
@@ -233,6 +264,7 @@ class Grid:
         if self.rank > 0:
             self._spacing = np.array(spacing, dtype=np.float64)
             self._spacing.flags.writeable = False
+            self._derived.clear()
         # noop for scalar or grids with rank < 1
 
     @property
@@ -256,88 +288,319 @@ class Grid:
         if self.rank > 0:
             self._origin = np.array(origin, dtype=np.float64)
             self._origin.flags.writeable = False
+            self._derived.clear()
         # noop for scalar or grids with rank < 1
 
-    @property
-    def grid_x(self) -> "NDArray[np.float64]":
-        """Coordinates of the x components of the grid
+    def _coordinates(self, name: str, axis: int) -> "NDArray[np.float64]":
+        """Cached coordinates along the @p axis dimension counted from the last, e.g. 1 is x
 
         Returns:
-            NDArray[np.float64]: array of cooridnate values in the x direction
+            NDArray[np.float64]: read only array of coordinate values, empty if the grid
+            doesn't have that dimension
         """
-        if _error_on_grid_type and self.type == GridType.scalar:
-            raise GridTypeAccessError("Scalar has no grid x value")
+        coordinates = self._derived.get(name)
+        if coordinates is not None:
+            return coordinates
         # TODO refactor this -- not generic to grid, this works for structured/quads, not for unstructured
         if (
             self.type == GridType.rectilinear
             or self.type == GridType.uniform_rectilinear
-        ) and len(self.shape) > 0:
+        ) and len(self.shape) >= axis:
             # https://bmi.readthedocs.io/en/stable/model_grids.html#model-grids
             # bmi states dimension info in `ij` form (last dimension indexed first...) in the shape meta
             # so x would at index rank, y at rank-1, z at rank-2 ect...
-            idx = self.rank - 1  # index is 0 based, rank is 1 based, adjust...
-            return np.array(
-                [
-                    self.origin[idx] + self.spacing[idx] * x
-                    for x in range(self.shape[idx])
-                ],
-                dtype=np.float64,
+            idx = self.rank - axis
+            coordinates = self.origin[idx] + self.spacing[idx] * np.arange(
+                self.shape[idx], dtype=np.float64
             )
         else:
             # TODO should this raise an error or return an empty array?
-            # raise RuntimeError(f"Cannot get x coordinates of grid with shape {self.shape}")
-            return np.array((), dtype=np.float64)
+            # raise RuntimeError(f"Cannot get coordinates of grid with shape {self.shape}")
+            coordinates = np.array((), dtype=np.float64)
+        coordinates.flags.writeable = False
+        self._derived[name] = coordinates
+        return coordinates
+
+    @property
+    def grid_x(self) -> "NDArray[np.float64]":
+        """Coordinates of the x components of the grid
+
+        Returns:
+            NDArray[np.float64]: read only array of cooridnate values in the x direction
+        """
+        if _error_on_grid_type and self.type == GridType.scalar:
+            raise GridTypeAccessError("Scalar has no grid x value")
+        return self._coordinates("grid_x", 1)
 
     @property
     def grid_y(self) -> "NDArray[np.float64]":
         """Coordinates of the y components of the grid
 
         Returns:
-            NDArray[np.float64]: array of coordinate values in the y direction
+            NDArray[np.float64]: read only array of coordinate values in the y direction
         """
         if _error_on_grid_type and self.type == GridType.scalar:
             raise GridTypeAccessError("Scalar has no grid y value")
-
-        if (
-            self.type == GridType.rectilinear
-            or self.type == GridType.uniform_rectilinear
-        ) and len(self.shape) > 1:
-            idx = self.rank - 2  # index is 0 based, rank is 1 based, adjust...
-            return np.array(
-                [
-                    self.origin[idx] + self.spacing[idx] * y
-                    for y in range(self.shape[idx])
-                ],
-                dtype=np.float64,
-            )
-        else:
-            # TODO should this raise an error or return an empty array?
-            # raise RuntimeError(f"Cannot get y coordinates of grid with shape {self.shape}")
-            return np.array((), dtype=np.float64)
+        return self._coordinates("grid_y", 2)
 
     @property
     def grid_z(self) -> "NDArray[np.float64]":
         """Coordinates of the z components of the grid
 
         Returns:
-            NDArray[np.float64]: array of coordinate values in the z direction
+            NDArray[np.float64]: read only array of coordinate values in the z direction
         """
         if _error_on_grid_type and self.type == GridType.scalar:
             raise GridTypeAccessError("Scalar has no grid z value")
+        return self._coordinates("grid_z", 3)
 
-        if (
-            self.type == GridType.rectilinear
-            or self.type == GridType.uniform_rectilinear
-        ) and len(self.shape) > 2:
-            idx = self.rank - 3  # index is 0 based, rank is 1 based, adjust...
-            return np.array(
-                [
-                    self.origin[idx] + self.spacing[idx] * z
-                    for z in range(self.shape[idx])
-                ],
-                dtype=np.float64,
+
+class UnstructuredGrid(Grid):
+    """
+    Unstructured mesh with compact CSR (compressed sparse row) connectivity
+
+    The nodes of face i are face_nodes[face_node_offsets[i]:face_node_offsets[i + 1]],
+    and face_edges, when given, lists the edges of each face with the same offsets.
+    Edge j connects the nodes edge_nodes[2 * j] and edge_nodes[2 * j + 1].  Indices are
+    int32, as expected by BMI, and the arrays are held as read only views, so arrays
+    memory mapped by load are served without a copy.
+    """
+
+    __slots__ = (
+        "_node_x",
+        "_node_y",
+        "_node_z",
+        "_face_node_offsets",
+        "_face_nodes",
+        "_edge_nodes",
+        "_face_edges",
+    )
+
+    # array attributes and the .npy files that save/load use for them
+    _FILES = (
+        "node_x",
+        "node_y",
+        "node_z",
+        "face_node_offsets",
+        "face_nodes",
+        "edge_nodes",
+        "face_edges",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        node_x: "NDArray[np.float64]",
+        node_y: "NDArray[np.float64]",
+        face_node_offsets: "NDArray[np.int32]",
+        face_nodes: "NDArray[np.int32]",
+        node_z: Optional["NDArray[np.float64]"] = None,
+        edge_nodes: Optional["NDArray[np.int32]"] = None,
+        face_edges: Optional["NDArray[np.int32]"] = None,
+        units: GridUnits = GridUnits.none,
+    ):
+        """
+        Args:
+            id (int): User defined identifier for this grid
+            node_x (NDArray[np.float64]): x coordinate of each node
+            node_y (NDArray[np.float64]): y coordinate of each node
+            face_node_offsets (NDArray[np.int32]): (faces + 1) start of each face in
+                face_nodes, the last offset is len(face_nodes)
+            face_nodes (NDArray[np.int32]): node indices of each face, counter clockwise
+            node_z (NDArray[np.float64], optional): z coordinate of each node, makes the
+                grid rank 3. Defaults to None.
+            edge_nodes (NDArray[np.int32], optional): (2 * edges) node index pairs of
+                each edge. Defaults to None.
+            face_edges (NDArray[np.int32], optional): edge indices of each face, with the
+                face_node_offsets layout. Defaults to None.
+            units (GridUnits, optional): units of the node coordinates. Defaults to GridUnits.none.
+
+        Raises:
+            ValueError: the connectivity arrays are inconsistent
+        """
+        super(UnstructuredGrid, self).__init__(
+            id, 2 if node_z is None else 3, GridType.unstructured, units
+        )
+        self._node_x = _readonly(node_x, np.float64)
+        self._node_y = _readonly(node_y, np.float64)
+        self._node_z = _readonly(node_z, np.float64)
+        self._face_node_offsets = _readonly(face_node_offsets, np.int32)
+        self._face_nodes = _readonly(face_nodes, np.int32)
+        self._edge_nodes = _readonly(edge_nodes, np.int32)
+        self._face_edges = _readonly(face_edges, np.int32)
+        # O(1) consistency checks, a full scan of the indices would read every page of
+        # a memory mapped mesh
+        nodes = len(self._node_x)
+        if len(self._node_y) != nodes or (
+            self._node_z is not None and len(self._node_z) != nodes
+        ):
+            raise ValueError("Node coordinate arrays differ in length")
+        offsets = self._face_node_offsets
+        if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(self._face_nodes):
+            raise ValueError(
+                "face_node_offsets must start at 0 and end at len(face_nodes)"
             )
-        else:
-            # TODO should this raise an error or return an empty array?
-            # raise RuntimeError(f"Cannot get z coordinates of grid with shape {self.shape}")
-            return np.array((), dtype=np.float64)
+        if self._edge_nodes is not None and len(self._edge_nodes) % 2:
+            raise ValueError("edge_nodes must hold a pair of nodes per edge")
+        if self._face_edges is not None and len(self._face_edges) != len(
+            self._face_nodes
+        ):
+            raise ValueError("face_edges must have the face_nodes layout")
+
+    @classmethod
+    def load(
+        cls,
+        id: int,
+        directory: os.PathLike,
+        mmap_mode: Optional[str] = "r",
+        units: GridUnits = GridUnits.none,
+    ) -> "UnstructuredGrid":
+        """Load a mesh from the .npy files written by save
+
+        Args:
+            id (int): User defined identifier for this grid
+            directory (os.PathLike): directory holding <array>.npy for each array, the
+                node_z, edge_nodes, and face_edges files are optional
+            mmap_mode (str, optional): np.load memory map mode, None reads the arrays
+                into memory. Defaults to "r".
+            units (GridUnits, optional): units of the node coordinates. Defaults to GridUnits.none.
+
+        Returns:
+            UnstructuredGrid: the mesh, its arrays are memory mapped (when stored with
+            the expected dtypes)
+        """
+        directory = Path(directory)
+        arrays: Dict[str, Any] = {}
+        for name in cls._FILES:
+            path = directory / f"{name}.npy"
+            if path.exists():
+                arrays[name] = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+        return cls(id, units=units, **arrays)
+
+    def save(self, directory: os.PathLike) -> None:
+        """Write each mesh array to <array>.npy in @p directory, see load
+
+        Args:
+            directory (os.PathLike): directory to write to, created if needed
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self._FILES:
+            array = getattr(self, f"_{name}")
+            if array is not None:
+                np.save(directory / f"{name}.npy", array)
+
+    @property
+    def size(self) -> int:
+        """The number of grid nodes
+
+        Returns:
+            int: number of nodes
+        """
+        return len(self._node_x)
+
+    @property
+    def node_count(self) -> int:
+        """The number of grid nodes
+
+        Returns:
+            int: number of nodes
+        """
+        return len(self._node_x)
+
+    @property
+    def face_count(self) -> int:
+        """The number of grid faces
+
+        Returns:
+            int: number of faces
+        """
+        return len(self._face_node_offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        """The number of grid edges
+
+        Raises:
+            GridTypeAccessError: the grid has no edges
+
+        Returns:
+            int: number of edges
+        """
+        return len(self.edge_nodes) // 2
+
+    @property
+    def face_node_offsets(self) -> "NDArray[np.int32]":
+        """Start of each face in face_nodes and face_edges, and their total length
+
+        Returns:
+            NDArray[np.int32]: read only (faces + 1) offsets
+        """
+        return self._face_node_offsets
+
+    @property
+    def face_nodes(self) -> "NDArray[np.int32]":
+        """Node indices of each face
+
+        Returns:
+            NDArray[np.int32]: read only node indices, see face_node_offsets
+        """
+        return self._face_nodes
+
+    @property
+    def nodes_per_face(self) -> "NDArray[np.int32]":
+        """Number of nodes of each face
+
+        Returns:
+            NDArray[np.int32]: read only (faces) node counts
+        """
+        counts = self._derived.get("nodes_per_face")
+        if counts is None:
+            counts = np.diff(self._face_node_offsets).astype(np.int32, copy=False)
+            counts.flags.writeable = False
+            self._derived["nodes_per_face"] = counts
+        return counts
+
+    @property
+    def edge_nodes(self) -> "NDArray[np.int32]":
+        """Node index pair of each edge
+
+        Raises:
+            GridTypeAccessError: the grid has no edges
+
+        Returns:
+            NDArray[np.int32]: read only (2 * edges) node indices
+        """
+        if self._edge_nodes is None:
+            raise GridTypeAccessError(f"Grid {self.id} has no edges")
+        return self._edge_nodes
+
+    @property
+    def face_edges(self) -> "NDArray[np.int32]":
+        """Edge indices of each face
+
+        Raises:
+            GridTypeAccessError: the grid has no face edges
+
+        Returns:
+            NDArray[np.int32]: read only edge indices, see face_node_offsets
+        """
+        if self._face_edges is None:
+            raise GridTypeAccessError(f"Grid {self.id} has no face edges")
+        return self._face_edges
+
+    def _coordinates(self, name: str, axis: int) -> "NDArray[np.float64]":
+        """Node coordinates, grid_x, grid_y, and grid_z are the node x, y, and z"""
+        coordinates = (self._node_x, self._node_y, self._node_z)[axis - 1]
+        if coordinates is None:
+            return self._derived.setdefault(name, _readonly((), np.float64))
+        return coordinates
+
+
+def _readonly(array, dtype) -> Optional["NDArray"]:
+    """Read only 1 dimensional view of @p array, only copied if it isn't @p dtype"""
+    if array is None:
+        return None
+    view = np.asarray(array, dtype=dtype).reshape(-1).view()
+    view.flags.writeable = False
+    return view
@@ -1,8 +1,14 @@
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 from bmipy import Bmi
 from numpy import ndarray
 
+from .bmi_clock import Clock
+from .bmi_grid import Grid, GridTypeAccessError, UnstructuredGrid
+from .bmi_var import VarAccess, VarInfo
+from .exceptions import UnknownBMIGrid
+
 
 class Bmi_Minimal(Bmi):
     """Intermediate ABC for implementing functionality of standard BMI
@@ -30,11 +36,35 @@ class Bmi_Minimal(Bmi):
        Exceptions to the behavoir above are
        get_component_name -- will return the subclass class name if not overridden
        get_value -- returns a call to get_value_pointer and copies data
+       get_var_itemsize, get_var_nbytes, get_var_type -- looked up from the cached
+       VarInfo of the variable, see get_var_info
+       get_value_at_indices, set_value, set_value_at_indices -- read and write
+       the array returned by get_value_ptr
+       get_grid_rank, get_grid_size, get_grid_type, get_grid_shape, get_grid_spacing,
+       get_grid_origin, get_grid_x, get_grid_y, get_grid_z, get_grid_node_count -- looked
+       up from the Grid registered with the id, see register_grid
+       get_grid_face_count, get_grid_edge_count, get_grid_face_nodes, get_grid_edge_nodes,
+       get_grid_face_edges, get_grid_nodes_per_face -- the connectivity of a registered
+       UnstructuredGrid
+       get_current_time, get_start_time, get_end_time, get_time_step, get_time_units,
+       update_until -- from the model Clock (self._clock), which update must advance
 
     Args:
         Bmi (Bmi): Base BMI abstract class
     """
 
+    def __init__(self):
+        super().__init__()
+        # Cache of per variable meta data, see get_var_info
+        self._var_info: Dict[str, VarInfo] = {}
+        # dtype and castability of each variable for indexed get/set, see _access
+        self._var_access: Dict[str, VarAccess] = {}
+        # Grids of the model variables by grid id, see register_grid
+        self._grids: Dict[int, Grid] = {}
+        # Model time, replaced when the time configuration is read, e.g. by
+        # Clock.from_time in initialize
+        self._clock: Clock = Clock()
+
     #############
     # Bmi functions which have a reasonable "default" implementation
     #############
@@ -55,6 +85,118 @@ class Bmi_Minimal(Bmi):
     def get_value(self, name: str, dest: ndarray) -> ndarray:
         dest[:] = self.get_value_ptr(name)
 
+    def get_var_info(self, name: str) -> VarInfo:
+        """Cached meta data of a variable
+
+           The meta data is built on first access by _build_var_info and reused until
+           invalidate_var_info is called for the variable, e.g. when its buffer is reallocated.
+
+        Args:
+            name (str): Name of variable.
+
+        Returns:
+            VarInfo: meta data of the variable
+        """
+        try:
+            return self._var_info[name]
+        except KeyError:
+            info = self._var_info[name] = self._build_var_info(name)
+            return info
+
+    def invalidate_var_info(self, name: Optional[str] = None) -> None:
+        """Drop the cached meta data of a variable
+
+        Args:
+            name (str, optional): Name of variable. Defaults to None, which drops all variables.
+        """
+        if name is None:
+            self._var_info.clear()
+            self._var_access.clear()
+        else:
+            self._var_info.pop(name, None)
+            self._var_access.pop(name, None)
+
+    def _access(self, name: str) -> VarAccess:
+        """Cached dtype and castability of a variable, rebuilt with its VarInfo
+
+        Args:
+            name (str): Name of variable.
+
+        Returns:
+            VarAccess: access information of the variable
+        """
+        info = self.get_var_info(name)
+        access = self._var_access.get(name)
+        # the VarInfo is rebuilt whenever it's invalidated, e.g. by a ValueStore rebind
+        if access is None or access.info is not info:
+            access = self._var_access[name] = VarAccess(info)
+        return access
+
+    def _build_var_info(self, name: str) -> VarInfo:
+        """Build the meta data of a variable from its value buffer
+
+           Grid, units, and location are None if the subclass doesn't implement the
+           corresponding BMI function.  Subclasses which implement those functions in
+           terms of get_var_info must override this.
+
+        Args:
+            name (str): Name of variable.
+
+        Returns:
+            VarInfo: meta data of the variable
+        """
+        array = self.get_value_ptr(name)
+
+        def optional(getter):
+            try:
+                return getter(name)
+            except NotImplementedError:
+                return None
+
+        return VarInfo(
+            dtype=str(array.dtype),
+            itemsize=array.itemsize,
+            nbytes=array.nbytes,
+            size=array.size,
+            grid=optional(self.get_var_grid),
+            units=optional(self.get_var_units),
+            location=optional(self.get_var_location),
+        )
+
+    def register_grid(self, grid: Grid) -> None:
+        """Add @p grid to the grids served by the get_grid_* functions, replacing any
+           grid with the same id
+
+        Args:
+            grid (Grid): grid meta data
+        """
+        self._grids[grid.id] = grid
+
+    def _grid(self, grid: int) -> Grid:
+        """Registered grid with id @p grid
+
+        Raises:
+            UnknownBMIGrid: no grid is registered with the id
+        """
+        try:
+            return self._grids[grid]
+        except KeyError:
+            raise UnknownBMIGrid(f"No known grid in BMI model: {grid}") from None
+
+    def _mesh(self, grid: int) -> UnstructuredGrid:
+        """Registered unstructured grid with id @p grid
+
+        Raises:
+            UnknownBMIGrid: no grid is registered with the id
+            GridTypeAccessError: the grid has no connectivity
+        """
+        mesh = self._grid(grid)
+        if not isinstance(mesh, UnstructuredGrid):
+            raise GridTypeAccessError(
+                f"Grid {grid} of type {mesh.type.value} has no connectivity"
+            )
+        return mesh
+
     def get_var_nbytes(self, name: str) -> int:
         """Get the number of total bytes required to represent the variable.
 
@@ -64,7 +206,7 @@ class Bmi_Minimal(Bmi):
         Returns:
             int: Size of data array in bytes.
         """
-        return self.get_value_ptr(name).nbytes
+        return self.get_var_info(name).nbytes
 
     def get_var_type(self, name: str) -> str:
         """Data type of the variable.
@@ -78,19 +220,23 @@ class Bmi_Minimal(Bmi):
         Returns:
             str: Data type.
         """
-        return str(self.get_value_ptr(name).dtype)
+        return self.get_var_info(name).dtype
 
     ###############
     # BMI functions which may be cosidered "optional" for a minimally functioning
     # BMI implmentation
     ###############
     def update_until(self, time: float) -> None:
-        """Update model from current_time until current_time + time
+        """Update model from current_time until @p time
+
+           Calls update for each time step of the model clock needed to reach @p time,
+           update is expected to advance the clock.
 
         Args:
-            time (float): duration of time to advance model till
+            time (float): model time to advance the model to
         """
-        raise NotImplementedError()
+        for _ in range(self._clock.steps_until(time)):
+            self.update()
 
     # BMI Variable Information Functions
     def get_input_item_count(self) -> int:
@@ -149,7 +295,7 @@ class Bmi_Minimal(Bmi):
         Returns:
             int: number of bytes representing a single variable of @p name
         """
-        raise NotImplementedError()
+        return self.get_var_info(name).itemsize
 
     def get_var_location(self, name: str) -> str:
         """Location of the variable relative to the grid
@@ -179,79 +325,395 @@ class Bmi_Minimal(Bmi):
         """
         raise NotImplementedError()
 
+    # BMI Time Functions
     def get_current_time(self) -> float:
-        raise NotImplementedError()
+        """Current model time
+
+        Returns:
+            float: current time in the model time units
+        """
+        return self._clock.current_time
 
     def get_end_time(self) -> float:
-        raise NotImplementedError()
+        """End time of the model
+
+        Returns:
+            float: end time in the model time units
+        """
+        return self._clock.end_time
 
     # BMI grid functions
     def get_grid_edge_count(self, grid: int) -> int:
-        raise NotImplementedError()
+        """Number of edges of an unstructured grid
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no edges
+
+        Returns:
+            int: number of edges
+        """
+        return self._mesh(grid).edge_count
 
     def get_grid_edge_nodes(self, grid: int, edge_nodes: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the node index pair of each edge into @p edge_nodes
+
+        Args:
+            grid (int): grid identifier
+            edge_nodes (ndarray): Array, twice the number of edges, to place the node
+                indices into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no edges
+
+        Returns:
+            ndarray: @p edge_nodes
+        """
+        np.copyto(edge_nodes, self._mesh(grid).edge_nodes, casting="same_kind")
+        return edge_nodes
 
     def get_grid_face_count(self, grid: int) -> int:
-        raise NotImplementedError()
+        """Number of faces of an unstructured grid
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no faces
+
+        Returns:
+            int: number of faces
+        """
+        return self._mesh(grid).face_count
 
     def get_grid_face_edges(self, grid: int, face_edges: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the edge indices of each face into @p face_edges
+
+        Args:
+            grid (int): grid identifier
+            face_edges (ndarray): Array, the total number of face edges, to place the
+                edge indices into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no face edges
+
+        Returns:
+            ndarray: @p face_edges
+        """
+        np.copyto(face_edges, self._mesh(grid).face_edges, casting="same_kind")
+        return face_edges
 
     def get_grid_face_nodes(self, grid: int, face_nodes: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the node indices of each face into @p face_nodes
+
+        Args:
+            grid (int): grid identifier
+            face_nodes (ndarray): Array, the total number of face nodes, to place the
+                node indices into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no faces
+
+        Returns:
+            ndarray: @p face_nodes
+        """
+        np.copyto(face_nodes, self._mesh(grid).face_nodes, casting="same_kind")
+        return face_nodes
 
     def get_grid_node_count(self, grid: int) -> int:
-        raise NotImplementedError()
+        """Number of nodes of the grid
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            int: number of nodes
+        """
+        return self._grid(grid).node_count
 
     def get_grid_nodes_per_face(self, grid: int, nodes_per_face: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the number of nodes of each face into @p nodes_per_face
+
+        Args:
+            grid (int): grid identifier
+            nodes_per_face (ndarray): Array, the number of faces, to place the counts into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+            GridTypeAccessError: @p grid has no faces
+
+        Returns:
+            ndarray: @p nodes_per_face
+        """
+        np.copyto(nodes_per_face, self._mesh(grid).nodes_per_face, casting="same_kind")
+        return nodes_per_face
 
     def get_grid_origin(self, grid: int, origin: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the coordinates of the grid origin into @p origin
+
+        Args:
+            grid (int): grid identifier
+            origin (ndarray): Array, the size of the grid rank, to place the origin into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p origin
+        """
+        np.copyto(origin, self._grid(grid).origin, casting="same_kind")
+        return origin
 
     def get_grid_rank(self, grid: int) -> int:
-        raise NotImplementedError()
+        """Number of dimensions of the grid
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            int: rank of the grid
+        """
+        return self._grid(grid).rank
 
     def get_grid_shape(self, grid: int, shape: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the number of nodes in each dimension of the grid into @p shape
+
+        Args:
+            grid (int): grid identifier
+            shape (ndarray): Array, the size of the grid rank, to place the shape into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p shape
+        """
+        np.copyto(shape, self._grid(grid).shape, casting="same_kind")
+        return shape
 
     def get_grid_size(self, grid: int) -> int:
-        raise NotImplementedError()
+        """Total number of elements of the grid
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            int: number of grid elements
+        """
+        return self._grid(grid).size
 
     def get_grid_spacing(self, grid: int, spacing: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the spacing between nodes in each dimension of the grid into @p spacing
+
+        Args:
+            grid (int): grid identifier
+            spacing (ndarray): Array, the size of the grid rank, to place the spacing into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p spacing
+        """
+        np.copyto(spacing, self._grid(grid).spacing, casting="same_kind")
+        return spacing
 
     def get_grid_type(self, grid: int) -> str:
-        raise NotImplementedError()
+        """Type of the grid, e.g. scalar, vector, uniform_rectilinear
+
+        Args:
+            grid (int): grid identifier
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            str: grid type
+        """
+        return self._grid(grid).type.value
 
     def get_grid_x(self, grid: int, x: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the x coordinates of the grid nodes into @p x
+
+        Args:
+            grid (int): grid identifier
+            x (ndarray): Array, the size of the x dimension, to place the coordinates into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p x
+        """
+        np.copyto(x, self._grid(grid).grid_x, casting="same_kind")
+        return x
 
     def get_grid_y(self, grid: int, y: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the y coordinates of the grid nodes into @p y
+
+        Args:
+            grid (int): grid identifier
+            y (ndarray): Array, the size of the y dimension, to place the coordinates into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p y
+        """
+        np.copyto(y, self._grid(grid).grid_y, casting="same_kind")
+        return y
 
     def get_grid_z(self, grid: int, z: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the z coordinates of the grid nodes into @p z
+
+        Args:
+            grid (int): grid identifier
+            z (ndarray): Array, the size of the z dimension, to place the coordinates into.
+
+        Raises:
+            UnknownBMIGrid: @p grid is not a registered grid
+
+        Returns:
+            ndarray: @p z
+        """
+        np.copyto(z, self._grid(grid).grid_z, casting="same_kind")
+        return z
 
     def get_start_time(self) -> float:
-        raise NotImplementedError()
+        """Start time of the model
+
+        Returns:
+            float: start time in the model time units
+        """
+        return self._clock.start_time
 
     def get_time_step(self) -> float:
-        raise NotImplementedError()
+        """Duration of each model update
+
+        Returns:
+            float: time step in the model time units
+        """
+        return self._clock.time_step
 
     def get_time_units(self) -> str:
-        raise NotImplementedError()
+        """Units of the model time
+
+        Returns:
+            str: time units, e.g. s, h
+        """
+        return self._clock.units
 
     # BMI get/set
     def get_value_ptr(self, name: str) -> ndarray:
         raise NotImplementedError
 
     def get_value_at_indices(self, name: str, dest: ndarray, inds: ndarray) -> ndarray:
-        raise NotImplementedError()
+        """Copy the values of a variable at the given indices into @p dest
+
+        Args:
+            name (str): Name of variable.
+            dest (ndarray): Array, the size of @p inds, to place the values into.
+            inds (ndarray): Indices into the flattened variable array.
+
+        Raises:
+            IndexError: an index is out of bounds for the variable
+            ValueError: @p dest is not the size of @p inds
+            TypeError: the variable values cannot be safely cast to the @p dest type
+
+        Returns:
+            ndarray: @p dest
+        """
+        access = self._access(name)
+        self._check_indices(name, inds, access.size)
+        if dest.size != inds.size:
+            raise ValueError(
+                f"Cannot get {inds.size} values of {name} into array of size {dest.size}"
+            )
+        if not access.can_get(dest.dtype):
+            raise TypeError(
+                f"Cannot cast {name} values from {access.dtype} to {dest.dtype}"
+            )
+        # out of bounds indices are checked above, "clip" lets take skip the bounds
+        # checked (buffered) default "raise" mode
+        if dest.dtype == access.dtype and dest.shape == inds.shape:
+            np.take(self.get_value_ptr(name), inds, out=dest, mode="clip")
+        else:
+            # take only writes to an out of the variable dtype and the indices shape
+            values = np.take(self.get_value_ptr(name), inds, mode="clip")
+            np.copyto(dest, values.reshape(dest.shape), casting="same_kind")
+        return dest
 
     def set_value(self, name: str, src: ndarray) -> None:
-        raise NotImplementedError()
+        """Copy @p src into the variable array
+
+        Args:
+            name (str): Name of variable.
+            src (ndarray): Values, the size of the variable, to copy into the variable.
+
+        Raises:
+            ValueError: @p src is not the size of the variable
+            TypeError: @p src values cannot be safely cast to the variable type
+        """
+        size: int = self.get_var_info(name).size
+        if src.size != size:
+            raise ValueError(
+                f"Cannot set {name} of size {size} from array of size {src.size}"
+            )
+        np.copyto(self.get_value_ptr(name), src.reshape(size), casting="same_kind")
 
     def set_value_at_indices(self, name: str, inds: ndarray, src: ndarray) -> None:
-        raise NotImplementedError()
+        """Copy @p src into the variable array at the given indices
+
+        Args:
+            name (str): Name of variable.
+            inds (ndarray): Indices into the flattened variable array.
+            src (ndarray): Values, the size of @p inds, to copy into the variable.
+
+        Raises:
+            IndexError: an index is out of bounds for the variable
+            ValueError: @p src is not the size of @p inds
+            TypeError: @p src values cannot be safely cast to the variable type
+        """
+        access = self._access(name)
+        self._check_indices(name, inds, access.size)
+        if src.size != inds.size:
+            raise ValueError(
+                f"Cannot set {inds.size} values of {name} from array of size {src.size}"
+            )
+        if not access.can_set(src.dtype):
+            raise TypeError(
+                f"Cannot cast {src.dtype} values to {name} of type {access.dtype}"
+            )
+        np.put(self.get_value_ptr(name), inds, src, mode="clip")
+
+    def _check_indices(self, name: str, inds: ndarray, size: int) -> None:
+        """Verify each index is within the bounds of the variable's array
+
+        Args:
+            name (str): Name of variable.
+            inds (ndarray): Indices into the flattened variable array.
+            size (int): number of elements of the variable
+
+        Raises:
+            IndexError: an index is out of bounds for the variable
+        """
+        # two allocation free reductions, rather than a bounds checked (buffered) take/put
+        if inds.size and (inds.min() < 0 or inds.max() >= size):
+            raise IndexError(f"Index out of bounds for {name} of size {size}")
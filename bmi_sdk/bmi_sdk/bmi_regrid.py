@@ -0,0 +1,365 @@
+"""bmi_regrid.py
+Area weighted regridding of a field on a structured Grid to a set of target regions
+(e.g. basins), through a precomputed sparse weight matrix
+
+The weights are built once, from cell index lists or polygons, and stored in CSR
+(compressed sparse row) form: the source cells of target i are
+indices[indptr[i]:indptr[i + 1]], with the matching weights in data.  Each call to
+Regridder.apply is then a gather, multiply, and segmented sum of NumPy array
+operations into preallocated buffers.
+
+@version 0.1
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .bmi_grid import Grid, GridType
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .bmi_minimal import Bmi_Minimal
+
+
+class Regridder:
+    """Sparse (targets, source size) weight matrix mapping a source field to targets"""
+
+    def __init__(
+        self,
+        indptr: "ArrayLike",
+        indices: "ArrayLike",
+        data: "ArrayLike",
+        source_size: int,
+        fill_value: float = np.nan,
+    ):
+        """
+        Args:
+            indptr (ArrayLike): (targets + 1) start of each target's row in indices/data
+            indices (ArrayLike): flat source cell index of each weight
+            data (ArrayLike): weight of each source cell
+            source_size (int): number of values of the source field
+            fill_value (float, optional): value of targets without source cells, e.g. a
+                basin outside the grid. Defaults to np.nan.
+
+        Raises:
+            ValueError: the CSR arrays are inconsistent or an index is out of bounds
+        """
+        self.indptr: "NDArray[np.int64]" = np.asarray(indptr, dtype=np.int64)
+        self.indices: "NDArray[np.int64]" = np.asarray(indices, dtype=np.int64)
+        self.data: "NDArray[np.float64]" = np.asarray(data, dtype=np.float64)
+        self.source_size: int = int(source_size)
+        self.fill_value: float = fill_value
+        if (
+            len(self.indptr) == 0
+            or self.indptr[0] != 0
+            or self.indptr[-1] != len(self.indices)
+            or np.any(np.diff(self.indptr) < 0)
+        ):
+            raise ValueError("indptr must be non decreasing from 0 to len(indices)")
+        if len(self.data) != len(self.indices):
+            raise ValueError("indices and data differ in length")
+        if len(self.indices) and (
+            self.indices.min() < 0 or self.indices.max() >= self.source_size
+        ):
+            raise ValueError(f"Source index out of bounds for size {self.source_size}")
+        # Rows with source cells, apply sums them with one reduceat call
+        nonempty = np.diff(self.indptr) > 0
+        self._rows: "NDArray[np.int64]" = np.flatnonzero(nonempty)
+        self._starts: "NDArray[np.int64]" = self.indptr[:-1][nonempty]
+        self._dense: bool = bool(nonempty.all())
+        # Preallocated per call buffers
+        self._gathered: "NDArray[np.float64]" = np.empty(len(self.indices))
+        self._sums: "NDArray[np.float64]" = np.empty(len(self._rows))
+
+    @property
+    def targets(self) -> int:
+        """Number of targets, the rows of the weight matrix"""
+        return len(self.indptr) - 1
+
+    def apply(self, field: "NDArray", out: "NDArray") -> "NDArray":
+        """Map @p field to the targets, the weighted sum of each target's source cells
+
+        Args:
+            field (NDArray): source values, of any shape with source_size elements in
+                the grid's (C order) layout
+            out (NDArray): contiguous array with one element per target to write into,
+                e.g. a Bmi variable's get_value_ptr array
+
+        Raises:
+            ValueError: @p field or @p out has the wrong size
+
+        Returns:
+            NDArray: @p out
+        """
+        if field.size != self.source_size:
+            raise ValueError(
+                f"Cannot regrid field of size {field.size}, expected {self.source_size}"
+            )
+        if out.size != self.targets or not out.flags.c_contiguous:
+            raise ValueError(
+                f"Cannot regrid into size {out.size}, expected a contiguous array of "
+                f"size {self.targets}"
+            )
+        gathered = self._gathered
+        # indices are bounds checked when built, "clip" lets take write straight to the
+        # buffer where the default "raise" mode buffers the result
+        np.take(field.reshape(-1), self.indices, out=gathered, mode="clip")
+        gathered *= self.data
+        flat = out.reshape(-1)
+        if not len(gathered):
+            flat.fill(self.fill_value)
+            return out
+        np.add.reduceat(gathered, self._starts, out=self._sums)
+        if self._dense:
+            np.copyto(flat, self._sums, casting="same_kind")
+        else:
+            flat.fill(self.fill_value)
+            np.put(flat, self._rows, self._sums, mode="clip")
+        return out
+
+    def set_value(self, bmi: "Bmi_Minimal", name: str, field: "NDArray") -> None:
+        """Regrid @p field straight into the @p name variable of @p bmi
+
+        Args:
+            bmi (Bmi_Minimal): model to set the variable of
+            name (str): variable with one element per target, e.g. "precipitation"
+            field (NDArray): source values, see apply
+        """
+        self.apply(field, bmi.get_value_ptr(name))
+
+    def _arrays(self) -> Dict[str, "ArrayLike"]:
+        """Arrays written by save"""
+        return dict(
+            indptr=self.indptr,
+            indices=self.indices,
+            data=self.data,
+            source_size=self.source_size,
+            fill_value=self.fill_value,
+        )
+
+    def save(self, path: os.PathLike) -> None:
+        """Write the weights to an .npz file, see load
+
+        Args:
+            path (os.PathLike): file to write, ".npz" is appended if missing
+        """
+        np.savez(_npz(path), **self._arrays())
+
+    @classmethod
+    def load(cls, path: os.PathLike) -> "Regridder":
+        """Read weights written by save
+
+        Args:
+            path (os.PathLike): .npz file, ".npz" is appended if missing
+
+        Returns:
+            Regridder: the regridder
+        """
+        with np.load(_npz(path), allow_pickle=False) as weights:
+            return cls(
+                weights["indptr"],
+                weights["indices"],
+                weights["data"],
+                int(weights["source_size"]),
+                float(weights["fill_value"]),
+            )
+
+    @classmethod
+    def from_cell_indices(
+        cls,
+        grid: Grid,
+        cells: Sequence["ArrayLike"],
+        fractions: Optional[Sequence["ArrayLike"]] = None,
+        cache: Optional[os.PathLike] = None,
+    ) -> "Regridder":
+        """Area weighted mean of the listed grid cells for each target
+
+        Args:
+            grid (Grid): source grid, all its cells have the same area
+            cells (Sequence[ArrayLike]): flat cell indices of each target
+            fractions (Sequence[ArrayLike], optional): fraction of each listed cell
+                covered by the target. Defaults to None, all cells fully covered.
+            cache (os.PathLike, optional): .npz file to load the weights from, when it
+                was built from the same arguments, or save them to. Defaults to None.
+
+        Returns:
+            Regridder: the regridder
+        """
+        cells = [np.asarray(c, dtype=np.int64).reshape(-1) for c in cells]
+        if fractions is None:
+            fractions = [np.ones(len(c)) for c in cells]
+        else:
+            fractions = [np.asarray(f, dtype=np.float64).reshape(-1) for f in fractions]
+        return _cached(
+            cache,
+            _key("cells", grid, cells + fractions),
+            lambda: _normalized(cells, fractions, int(grid.size)),
+        )
+
+    @classmethod
+    def from_polygons(
+        cls,
+        grid: Grid,
+        polygons: Sequence["ArrayLike"],
+        cache: Optional[os.PathLike] = None,
+    ) -> "Regridder":
+        """Area weighted mean of the grid cells overlapping each target polygon
+
+        Each value of a rank 2 (rectilinear or uniform rectilinear) grid represents the
+        spacing sized cell centred on its node.  The weight of a cell is the area of its
+        intersection with the polygon, normalized over the polygon.
+
+        Args:
+            grid (Grid): source grid
+            polygons (Sequence[ArrayLike]): (vertices, 2) x, y coordinates of a simple
+                polygon (one ring, no holes) for each target
+            cache (os.PathLike, optional): .npz file to load the weights from, when it
+                was built from the same arguments, or save them to. Defaults to None.
+
+        Raises:
+            ValueError: @p grid isn't a rank 2 rectilinear grid
+
+        Returns:
+            Regridder: the regridder
+        """
+        if grid.rank != 2 or grid.type not in (
+            GridType.rectilinear,
+            GridType.uniform_rectilinear,
+        ):
+            raise ValueError(
+                f"Polygon weights require a rank 2 rectilinear grid, not {grid.type.value}"
+            )
+        polygons = [np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in polygons]
+
+        def build() -> Regridder:
+            cells, areas = zip(*(_overlap(grid, p) for p in polygons))
+            return _normalized(list(cells), list(areas), int(grid.size))
+
+        return _cached(cache, _key("polygons", grid, polygons), build)
+
+
+def _normalized(
+    cells: List["NDArray[np.int64]"], weights: List["NDArray[np.float64]"], size: int
+) -> Regridder:
+    """Regridder with each target's @p weights scaled to sum to 1"""
+    indptr = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in cells], out=indptr[1:])
+    data = [w / w.sum() if w.sum() else w for w in weights]
+    return Regridder(
+        indptr,
+        np.concatenate(cells) if cells else (),
+        np.concatenate(data) if data else (),
+        size,
+    )
+
+
+def _key(kind: str, grid: Grid, arrays: List["NDArray"]) -> str:
+    """Digest of the grid geometry and the target arrays the weights are built from"""
+    digest = hashlib.sha256(kind.encode())
+    for array in (grid.shape, grid.spacing, grid.origin, *arrays):
+        digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(str(np.shape(array)).encode())
+    return digest.hexdigest()
+
+
+def _cached(
+    cache: Optional[os.PathLike], key: str, build: Callable[[], Regridder]
+) -> Regridder:
+    """Load the weights from @p cache if they were built for @p key, else build them
+    and save them to @p cache
+    """
+    if cache is not None:
+        cache = _npz(cache)
+        if cache.exists():
+            with np.load(cache, allow_pickle=False) as weights:
+                hit = "key" in weights.files and str(weights["key"]) == key
+            if hit:
+                return Regridder.load(cache)
+    regridder = build()
+    if cache is not None:
+        np.savez(cache, key=np.array(key), **regridder._arrays())
+    return regridder
+
+
+def _npz(path: os.PathLike) -> Path:
+    """@p path with the ".npz" suffix np.savez appends, when it's missing"""
+    path = Path(path)
+    return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+
+def _clip(polygon: "NDArray[np.float64]", axis: int, bound: float, sign: float):
+    """Sutherland-Hodgman clip of @p polygon to sign * (coordinate - bound) >= 0"""
+    if not len(polygon):
+        return polygon
+    following = np.roll(polygon, -1, axis=0)
+    distance = sign * (polygon[:, axis] - bound)
+    following_distance = np.roll(distance, -1)
+    inside = distance >= 0
+    crossing = inside != (following_distance >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # t is only used for crossing edges, where the distances differ
+        t = distance / (distance - following_distance)
+        intersection = polygon + t[:, None] * (following - polygon)
+    # each edge emits its start vertex if inside, then its crossing point if any
+    points = np.stack([polygon, intersection], axis=1).reshape(-1, 2)
+    keep = np.stack([inside, crossing], axis=1).reshape(-1)
+    return points[keep]
+
+
+def _area_below(polygon: "NDArray[np.float64]", y: "NDArray[np.float64]"):
+    """Area of @p polygon below each of the @p y values
+
+    By Green's theorem the area is the boundary integral of x dy.  Clamping each edge
+    to Y <= y leaves only the part below y, as the clamped part (and the closing
+    segment along Y = y) has dy = 0, so the integral is evaluated for every y at once.
+    """
+    x0, y0 = polygon[:, 0, None], polygon[:, 1, None]
+    x1, y1 = np.roll(x0, -1, axis=0), np.roll(y0, -1, axis=0)
+    dy = y1 - y0
+    # horizontal edges contribute nothing, their slope is never used
+    slope = np.divide(x1 - x0, dy, out=np.zeros_like(dy), where=dy != 0)
+    ya, yb = np.minimum(y0, y), np.minimum(y1, y)
+    xa, xb = x0 + (ya - y0) * slope, x0 + (yb - y0) * slope
+    # the sign is the orientation of the polygon
+    return np.abs(((yb - ya) * (xa + xb)).sum(axis=0) / 2.0)
+
+
+def _overlap(grid: Grid, polygon: "NDArray[np.float64]"):
+    """Flat indices of the cells of @p grid overlapping @p polygon, and the areas of
+    overlap
+    """
+    cells: List["NDArray[np.int64]"] = []
+    areas: List["NDArray[np.float64]"] = []
+    ny, nx = (int(n) for n in grid.shape)
+    # lower and upper bounds of each cell, each node is the centre of a spacing sized
+    # cell (spacing may be negative, e.g. north up rasters)
+    x_lower = grid.grid_x - abs(grid.spacing[1]) / 2
+    x_upper = grid.grid_x + abs(grid.spacing[1]) / 2
+    y_lower = grid.grid_y - abs(grid.spacing[0]) / 2
+    y_upper = grid.grid_y + abs(grid.spacing[0]) / 2
+    # overlaps below this are round off, e.g. of a polygon edge on a cell edge
+    tolerance = 1e-9 * abs(grid.spacing[0] * grid.spacing[1])
+    if len(polygon) >= 3:
+        lo, hi = polygon.min(axis=0), polygon.max(axis=0)
+        columns = np.flatnonzero((x_upper > lo[0]) & (x_lower < hi[0]))
+    else:
+        columns = ()
+    for i in columns:
+        # clip to the column, then the area in each row is a difference of areas below
+        strip = _clip(_clip(polygon, 0, x_lower[i], 1.0), 0, x_upper[i], -1.0)
+        if len(strip) < 3:
+            continue
+        lo, hi = strip[:, 1].min(), strip[:, 1].max()
+        rows = np.flatnonzero((y_upper > lo) & (y_lower < hi))
+        area = _area_below(strip, y_upper[rows]) - _area_below(strip, y_lower[rows])
+        overlap = area > tolerance
+        cells.append(rows[overlap] * nx + i)
+        areas.append(area[overlap])
+    if not cells:
+        return np.array((), dtype=np.int64), np.array(())
+    return np.concatenate(cells).astype(np.int64), np.concatenate(areas)
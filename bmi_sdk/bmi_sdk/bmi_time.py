@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 TimeUnits = Literal[
     "s",
@@ -34,6 +34,9 @@ class BmiTime(BaseModel):
     "A time step is typically a positive value. However, if the model permits it, a negative value can be used (running the model backward)."
     """
 
+    # json Infinity for the default end_time, rather than null which doesn't validate
+    model_config = ConfigDict(ser_json_inf_nan="constants")
+
     current_time: float = Field(default=0.0)
     start_time: float = Field(default=0.0)
     end_time: float = Field(default=float("inf"))
@@ -0,0 +1,89 @@
+"""bmi_var.py
+Module for caching BMI variable meta data
+
+@author Nels Frazier
+@version 0.1
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+
+class VarInfo(NamedTuple):
+    """
+    Meta data of a single BMI variable, as reported by the BMI variable information functions
+    """
+
+    dtype: str  # numpy dtype name of a single element
+    itemsize: int  # bytes per element
+    nbytes: int  # bytes of the whole variable
+    size: int  # number of elements
+    grid: Optional[int] = None
+    units: Optional[str] = None
+    location: Optional[str] = None
+
+
+class VarAccess:
+    """
+    numpy dtype and size of a variable, from its VarInfo, used by the indexed get and set
+    functions, with the castability of each caller array dtype memoized
+    """
+
+    __slots__ = ("info", "dtype", "size", "_get", "_set")
+
+    def __init__(self, info: VarInfo):
+        """
+        Args:
+            info (VarInfo): meta data of the variable
+        """
+        self.info: VarInfo = info
+        self.dtype: np.dtype = np.dtype(info.dtype)
+        self.size: int = info.size
+        # caller dtype -> whether it can be "same_kind" cast from/to the variable
+        self._get: Dict[np.dtype, bool] = {}
+        self._set: Dict[np.dtype, bool] = {}
+
+    def can_get(self, dtype: np.dtype) -> bool:
+        """Whether the variable values can be cast to a destination of @p dtype"""
+        try:
+            return self._get[dtype]
+        except KeyError:
+            cast = self._get[dtype] = np.can_cast(self.dtype, dtype, "same_kind")
+            return cast
+
+    def can_set(self, dtype: np.dtype) -> bool:
+        """Whether values of @p dtype can be cast to the variable"""
+        try:
+            return self._set[dtype]
+        except KeyError:
+            cast = self._set[dtype] = np.can_cast(dtype, self.dtype, "same_kind")
+            return cast
+
+
+class ValueStore(dict):
+    """
+    Mapping of variable name to value buffer.
+
+    Rebinding (or deleting) a variable's buffer by item assignment drops that variable from
+    each of the given caches, so meta data derived from a buffer is only rebuilt when the
+    buffer is reallocated.
+    """
+
+    def __init__(self, *caches: Dict[str, object]):
+        """
+        Args:
+            caches (Dict[str, object]): per variable caches to invalidate when a buffer is rebound
+        """
+        super().__init__()
+        self._caches = caches
+
+    def __setitem__(self, name: str, value: object) -> None:
+        super().__setitem__(name, value)
+        for cache in self._caches:
+            cache.pop(name, None)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        for cache in self._caches:
+            cache.pop(name, None)
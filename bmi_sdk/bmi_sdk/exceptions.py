@@ -1,2 +1,6 @@
 class UnknownBMIVariable(RuntimeError):
     pass
+
+
+class UnknownBMIGrid(RuntimeError):
+    pass
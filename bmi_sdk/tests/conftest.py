@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from ..bmi_minimal import Bmi_Minimal
+from ..bmi_var import ValueStore
+
+
+class _Bmi(Bmi_Minimal):
+    """Minimal BMI exposing numpy buffers from a ValueStore"""
+
+    def __init__(self):
+        super().__init__()
+        self._values = ValueStore(self._var_info)
+        self._values["a"] = np.zeros(4, dtype=np.float64)
+        self._values["b"] = np.arange(1000, dtype=np.float64)
+        self.ptr_calls = 0
+
+    def initialize(self, config_file: str) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def finalize(self) -> None:
+        pass
+
+    def get_value_ptr(self, name: str) -> np.ndarray:
+        self.ptr_calls += 1
+        return self._values[name]
+
+
+@pytest.fixture
+def bmi() -> _Bmi:
+    return _Bmi()
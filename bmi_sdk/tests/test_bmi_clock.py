@@ -0,0 +1,85 @@
+from typing import get_args
+
+import pytest
+
+from ..bmi_clock import UNIT_SECONDS, Clock
+from ..bmi_time import BmiTime, TimeUnits
+
+
+def test_unit_factors():
+    assert set(UNIT_SECONDS) == set(get_args(TimeUnits))
+
+
+def test_from_time():
+    clock = Clock.from_time(
+        BmiTime(
+            current_time=10.0, start_time=10.0, end_time=100.0, time_step=0.1, units="h"
+        )
+    )
+    assert (clock.start_time, clock.end_time, clock.time_step) == (10.0, 100.0, 0.1)
+    assert clock.units == "h"
+    assert clock.current_time == 10.0
+    clock = Clock.from_time(BmiTime(current_time=5.0))
+    assert clock.current_time == 5.0
+    assert clock.start_time == 0.0
+
+
+def test_no_drift():
+    clock = Clock(time_step=0.1)
+    accumulated = 0.0
+    for _ in range(1000):
+        clock.advance()
+        accumulated += 0.1
+    assert clock.step == 1000
+    assert clock.current_time == 1000 * 0.1
+    assert accumulated != clock.current_time
+
+
+@pytest.mark.parametrize(
+    "time, steps", [(0.0, 0), (-5.0, 0), (0.3, 3), (0.25, 3), (1.0, 10)]
+)
+def test_steps_until(time, steps):
+    assert Clock(time_step=0.1).steps_until(time) == steps
+
+
+def test_steps_until_backward():
+    assert Clock(start_time=10.0, time_step=-2.0).steps_until(5.0) == 3
+
+
+@pytest.mark.parametrize(
+    "time, steps", [(0.5, 5), (1.0, 10), (2.0, 10), (float("inf"), 10)]
+)
+def test_steps_until_end_time(time, steps):
+    """Steps never advance the clock past the end time"""
+    assert Clock(end_time=1.0, time_step=0.1).steps_until(time) == steps
+    assert Clock(end_time=1.05, time_step=0.1).steps_until(time) == steps
+    clock = Clock(end_time=1.0, time_step=0.1)
+    clock.advance(10)
+    assert clock.steps_until(time) == 0
+
+
+def test_convert():
+    clock = Clock(units="h")
+    assert clock.convert(2.0, "min") == 120.0
+    assert clock.convert(36.0, "days") == 1.5
+
+
+@pytest.mark.parametrize("kwargs", [dict(time_step=0.0), dict(units="years")])
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        Clock(**kwargs)
+
+
+def test_bmi_time(bmi):
+    bmi._clock = Clock(time_step=60.0, units="min")
+    assert bmi.get_current_time() == bmi.get_start_time() == 0.0
+    assert bmi.get_end_time() == float("inf")
+    assert bmi.get_time_step() == 60.0
+    assert bmi.get_time_units() == "min"
+
+    bmi.update = bmi._clock.advance
+    bmi.update_until(150.0)
+    assert bmi.get_current_time() == 180.0
+    # already reached
+    bmi.update_until(100.0)
+    assert bmi.get_current_time() == 180.0
@@ -0,0 +1,152 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from ..bmi_grid import Grid, GridType, GridTypeAccessError, UnstructuredGrid
+
+
+@pytest.fixture
+def grid() -> Grid:
+    grid = Grid(1, 3, GridType.uniform_rectilinear)
+    grid.shape = (2, 3, 4)  # z, y, x
+    grid.spacing = (10.0, 0.5, 0.1)
+    grid.origin = (-5.0, 1.0, 100.0)
+    return grid
+
+
+def test_grid_coordinates(grid):
+    # the same values as accumulating origin + spacing * i for each index
+    np.testing.assert_array_equal(grid.grid_x, [100.0 + 0.1 * i for i in range(4)])
+    np.testing.assert_array_equal(grid.grid_y, [1.0, 1.5, 2.0])
+    np.testing.assert_array_equal(grid.grid_z, [-5.0, 5.0])
+    for coordinates in (grid.grid_x, grid.grid_y, grid.grid_z):
+        assert coordinates.dtype == np.float64
+        assert not coordinates.flags.writeable
+    # cached between accesses
+    assert grid.grid_x is grid.grid_x
+
+
+def test_grid_coordinates_rank():
+    grid = Grid(2, 1, GridType.rectilinear)
+    grid.shape = (3,)
+    grid.spacing = (2.0,)
+    np.testing.assert_array_equal(grid.grid_x, [0.0, 2.0, 4.0])
+    assert grid.grid_y.size == 0
+    assert grid.grid_z.size == 0
+    assert Grid(3, 1, GridType.vector).grid_x.size == 0
+
+
+@pytest.mark.parametrize(
+    "field, value, x",
+    [
+        ("shape", (2, 3, 2), [100.0, 100.1]),
+        ("spacing", (10.0, 0.5, 1.0), [100.0, 101.0, 102.0, 103.0]),
+        ("origin", (-5.0, 1.0, 0.0), [0.0, 0.1, 0.2, 0.30000000000000004]),
+    ],
+)
+def test_grid_invalidate(grid, field, value, x):
+    before = grid.grid_x
+    grid.size
+    setattr(grid, field, value)
+    assert grid.grid_x is not before
+    np.testing.assert_array_equal(grid.grid_x, x)
+    assert grid.size == int(np.prod(grid.shape))
+
+
+def test_grid_size():
+    grid = Grid(0, 2, GridType.uniform_rectilinear)
+    assert grid.size == 0
+    grid.shape = (100_000, 100_000)
+    # exceeds int32
+    assert grid.size == 10_000_000_000
+    assert isinstance(grid.size, int)
+    assert Grid(0, 0, GridType.scalar).size == 0
+
+
+def test_grid_slots(grid):
+    with pytest.raises(AttributeError):
+        grid.extra = 1
+
+
+@pytest.fixture
+def mesh() -> UnstructuredGrid:
+    """Unit square split into a triangle and a quadrilateral
+
+    3---2---5
+    | 0 | 1 |
+    0---1---4
+    """
+    return UnstructuredGrid(
+        7,
+        node_x=[0.0, 1.0, 1.0, 0.0, 2.0, 2.0],
+        node_y=[0.0, 0.0, 1.0, 1.0, 0.0, 1.0],
+        face_node_offsets=[0, 4, 7],
+        face_nodes=[0, 1, 2, 3, 1, 4, 2],
+        edge_nodes=[0, 1, 1, 2, 2, 3, 3, 0, 1, 4, 4, 2],
+        face_edges=[0, 1, 2, 3, 4, 5, 1],
+    )
+
+
+def test_unstructured(mesh):
+    assert mesh.type == GridType.unstructured
+    assert mesh.rank == 2
+    assert mesh.size == mesh.node_count == 6
+    assert mesh.face_count == 2
+    assert mesh.edge_count == 6
+    np.testing.assert_array_equal(mesh.nodes_per_face, [4, 3])
+    np.testing.assert_array_equal(mesh.grid_x, [0, 1, 1, 0, 2, 2])
+    assert mesh.grid_z.size == 0
+    for array in (
+        mesh.face_nodes,
+        mesh.edge_nodes,
+        mesh.face_edges,
+        mesh.nodes_per_face,
+    ):
+        assert array.dtype == np.int32
+        assert not array.flags.writeable
+
+
+def test_unstructured_load(mesh, tmp_path):
+    mesh.save(tmp_path)
+    loaded = UnstructuredGrid.load(7, tmp_path)
+    # served straight from the memory map
+    base = loaded.face_nodes
+    while isinstance(base, np.ndarray):
+        base = base.base
+    assert isinstance(base, mmap.mmap)
+    np.testing.assert_array_equal(loaded.face_nodes, mesh.face_nodes)
+    np.testing.assert_array_equal(loaded.nodes_per_face, mesh.nodes_per_face)
+    np.testing.assert_array_equal(loaded.grid_y, mesh.grid_y)
+    assert loaded.edge_count == 6
+    assert not (tmp_path / "node_z.npy").exists()
+
+
+def test_unstructured_optional():
+    mesh = UnstructuredGrid(0, [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [0, 3], [0, 1, 2])
+    assert mesh.face_count == 1
+    with pytest.raises(GridTypeAccessError):
+        mesh.edge_count
+    with pytest.raises(GridTypeAccessError):
+        mesh.face_edges
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(node_y=[0.0, 1.0]),
+        dict(face_node_offsets=[1, 3]),
+        dict(face_node_offsets=[0, 2]),
+        dict(edge_nodes=[0, 1, 2]),
+        dict(face_edges=[0, 1]),
+    ],
+)
+def test_unstructured_invalid(kwargs):
+    args = dict(
+        node_x=[0.0, 1.0, 0.0],
+        node_y=[0.0, 0.0, 1.0],
+        face_node_offsets=[0, 3],
+        face_nodes=[0, 1, 2],
+    )
+    with pytest.raises(ValueError):
+        UnstructuredGrid(0, **{**args, **kwargs})
@@ -0,0 +1,202 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ..bmi_grid import Grid, GridType, GridTypeAccessError, UnstructuredGrid
+from ..exceptions import UnknownBMIGrid
+
+
+def test_get_value_at_indices(bmi):
+    inds = np.array([5, 0, 999, 5])
+    dest = np.empty(4)
+    assert bmi.get_value_at_indices("b", dest, inds) is dest
+    np.testing.assert_array_equal(dest, [5, 0, 999, 5])
+
+
+@pytest.mark.parametrize("inds", [[-1], [1000], [0, 1000]])
+def test_get_value_at_indices_out_of_bounds(bmi, inds):
+    with pytest.raises(IndexError):
+        bmi.get_value_at_indices("b", np.empty(len(inds)), np.array(inds))
+
+
+def test_get_value_at_indices_size(bmi):
+    with pytest.raises(ValueError):
+        bmi.get_value_at_indices("b", np.empty(3), np.array([0, 1]))
+
+
+def test_get_value_at_indices_cast(bmi):
+    """Values are cast to a dest of another dtype, or shape, of the same size"""
+    bmi._values["a"] = np.arange(4, dtype=np.float32)
+    dest = np.empty(2)
+    assert bmi.get_value_at_indices("a", dest, np.array([1, 3])) is dest
+    np.testing.assert_array_equal(dest, [1, 3])
+    dest = np.empty((2, 1), dtype=np.float32)
+    bmi.get_value_at_indices("a", dest, np.array([2, 0]))
+    np.testing.assert_array_equal(dest, [[2], [0]])
+
+
+def test_var_access_cached(bmi):
+    """Dtype checks are cached per variable and rebuilt when its buffer is rebound"""
+    bmi.get_value_at_indices("a", np.empty(1, dtype=np.float32), np.array([0]))
+    access = bmi._access("a")
+    assert bmi._access("a") is access
+    assert access.can_get(np.dtype(np.float32))
+    bmi._values["a"] = np.zeros(4, dtype=np.int32)
+    assert bmi._access("a") is not access
+    with pytest.raises(TypeError):
+        bmi.set_value_at_indices("a", np.array([0]), np.array([1.5]))
+
+
+def test_get_value_at_indices_type(bmi):
+    with pytest.raises(TypeError):
+        bmi.get_value_at_indices("b", np.empty(2, dtype=np.int32), np.array([0, 1]))
+
+
+def test_set_value(bmi):
+    ptr = bmi.get_value_ptr("a")
+    bmi.set_value("a", np.array([[1.0, 2.0], [3.0, 4.0]]))
+    np.testing.assert_array_equal(bmi._values["a"], [1, 2, 3, 4])
+    # written in place
+    assert bmi.get_value_ptr("a") is ptr
+    # integers safely cast to the float variable
+    bmi.set_value("a", np.arange(4))
+    np.testing.assert_array_equal(bmi._values["a"], [0, 1, 2, 3])
+
+
+def test_set_value_size(bmi):
+    with pytest.raises(ValueError):
+        bmi.set_value("a", np.zeros(5))
+
+
+def test_set_value_type(bmi):
+    bmi._values["a"] = np.zeros(4, dtype=np.int32)
+    with pytest.raises(TypeError):
+        bmi.set_value("a", np.zeros(4, dtype=np.float64))
+
+
+def test_set_value_at_indices(bmi):
+    bmi.set_value_at_indices("a", np.array([3, 1]), np.array([7.0, 8.0]))
+    np.testing.assert_array_equal(bmi._values["a"], [0, 8, 0, 7])
+    with pytest.raises(IndexError):
+        bmi.set_value_at_indices("a", np.array([4]), np.array([1.0]))
+
+
+def test_set_value_at_indices_size(bmi):
+    # np.put would silently repeat or truncate src
+    with pytest.raises(ValueError):
+        bmi.set_value_at_indices("a", np.array([0, 1]), np.array([1.0]))
+    with pytest.raises(ValueError):
+        bmi.set_value_at_indices("a", np.array([0]), np.array([1.0, 2.0]))
+    np.testing.assert_array_equal(bmi._values["a"], [0, 0, 0, 0])
+
+
+def test_set_value_at_indices_type(bmi):
+    with pytest.raises(TypeError):
+        bmi.set_value_at_indices("a", np.array([0]), np.array([1 + 2j]))
+    np.testing.assert_array_equal(bmi._values["a"], [0, 0, 0, 0])
+
+
+@pytest.fixture
+def grid():
+    grid = Grid(3, 2, GridType.uniform_rectilinear)
+    grid.shape = (2, 3)
+    grid.spacing = (0.5, 2.0)
+    grid.origin = (1.0, -1.0)
+    return grid
+
+
+def test_get_grid(bmi, grid):
+    bmi.register_grid(grid)
+    assert bmi.get_grid_rank(3) == 2
+    assert bmi.get_grid_size(3) == 6
+    assert bmi.get_grid_type(3) == "uniform_rectilinear"
+    for getter, dest, expected in [
+        (bmi.get_grid_shape, np.empty(2, dtype=np.int32), [2, 3]),
+        (bmi.get_grid_spacing, np.empty(2), [0.5, 2.0]),
+        (bmi.get_grid_origin, np.empty(2), [1.0, -1.0]),
+        (bmi.get_grid_x, np.empty(3), [-1.0, 1.0, 3.0]),
+        (bmi.get_grid_y, np.empty(2), [1.0, 1.5]),
+        (bmi.get_grid_z, np.empty(0), []),
+    ]:
+        # filled in place
+        assert getter(3, dest) is dest
+        np.testing.assert_array_equal(dest, expected)
+
+
+def test_get_grid_replaced(bmi, grid):
+    bmi.register_grid(grid)
+    replacement = Grid(3, 0, GridType.scalar)
+    bmi.register_grid(replacement)
+    assert bmi.get_grid_rank(3) == 0
+    assert bmi.get_grid_type(3) == "scalar"
+
+
+def test_get_grid_unknown(bmi, grid):
+    bmi.register_grid(grid)
+    with pytest.raises(UnknownBMIGrid):
+        bmi.get_grid_rank(0)
+    with pytest.raises(UnknownBMIGrid):
+        bmi.get_grid_x(1, np.empty(3))
+
+
+def test_get_grid_allocations(bmi, grid):
+    bmi.register_grid(grid)
+    shape, x = np.empty(2, dtype=np.int32), np.empty(3)
+
+    def poll():
+        bmi.get_grid_shape(3, shape)
+        bmi.get_grid_x(3, x)
+        bmi.get_grid_size(3)
+
+    poll()
+    tracemalloc.start()
+    try:
+        for _ in range(1000):
+            poll()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # no array allocated per call
+    assert peak < 1000
+
+
+def test_get_grid_unstructured(bmi):
+    bmi.register_grid(
+        UnstructuredGrid(
+            1,
+            node_x=[0.0, 1.0, 1.0, 0.0, 2.0],
+            node_y=[0.0, 0.0, 1.0, 1.0, 0.0],
+            face_node_offsets=[0, 4, 7],
+            face_nodes=[0, 1, 2, 3, 1, 4, 2],
+            edge_nodes=[0, 1, 1, 2, 2, 3, 3, 0, 1, 4, 4, 2],
+            face_edges=[0, 1, 2, 3, 4, 5, 1],
+        )
+    )
+    assert bmi.get_grid_type(1) == "unstructured"
+    assert bmi.get_grid_node_count(1) == 5
+    assert bmi.get_grid_size(1) == 5
+    assert bmi.get_grid_face_count(1) == 2
+    assert bmi.get_grid_edge_count(1) == 6
+    for getter, dest, expected in [
+        (bmi.get_grid_nodes_per_face, np.empty(2, np.int32), [4, 3]),
+        (bmi.get_grid_face_nodes, np.empty(7, np.int32), [0, 1, 2, 3, 1, 4, 2]),
+        (bmi.get_grid_face_edges, np.empty(7, np.int32), [0, 1, 2, 3, 4, 5, 1]),
+        (
+            bmi.get_grid_edge_nodes,
+            np.empty(12, np.int32),
+            [0, 1, 1, 2, 2, 3, 3, 0, 1, 4, 4, 2],
+        ),
+        (bmi.get_grid_x, np.empty(5), [0, 1, 1, 0, 2]),
+    ]:
+        assert getter(1, dest) is dest
+        np.testing.assert_array_equal(dest, expected)
+
+
+def test_get_grid_structured_connectivity(bmi, grid):
+    bmi.register_grid(grid)
+    assert bmi.get_grid_node_count(3) == 6
+    with pytest.raises(GridTypeAccessError):
+        bmi.get_grid_face_count(3)
+    with pytest.raises(GridTypeAccessError):
+        bmi.get_grid_face_nodes(3, np.empty(0, np.int32))
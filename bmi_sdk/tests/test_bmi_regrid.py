@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+from ..bmi_grid import Grid, GridType
+from ..bmi_regrid import Regridder
+
+
+@pytest.fixture
+def grid() -> Grid:
+    """3 rows by 4 columns of unit cells, centred on integer coordinates"""
+    grid = Grid(1, 2, GridType.uniform_rectilinear)
+    grid.shape = (3, 4)
+    grid.spacing = (1.0, 1.0)
+    return grid
+
+
+@pytest.fixture
+def field() -> np.ndarray:
+    return np.arange(12, dtype=np.float64).reshape(3, 4)
+
+
+def test_cell_indices(grid, field):
+    regridder = Regridder.from_cell_indices(grid, [[0, 1], [5], [4, 8, 11]])
+    out = np.empty(3, dtype=np.float32)
+    assert regridder.apply(field, out) is out
+    np.testing.assert_allclose(out, [0.5, 5.0, 23 / 3])
+
+
+def test_cell_fractions(grid, field):
+    regridder = Regridder.from_cell_indices(grid, [[0, 1]], fractions=[[1.0, 0.25]])
+    np.testing.assert_allclose(regridder.apply(field, np.empty(1)), [0.2])
+
+
+def test_polygons(grid, field):
+    polygons = [
+        # exactly cell (0, 0)
+        [(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)],
+        # half of cell 1 and all of cell 2, row 0
+        [(1.0, -0.5), (2.5, -0.5), (2.5, 0.5), (1.0, 0.5)],
+        # triangle over cells 5 and 6 (row 1), equal halves
+        [(0.5, 0.5), (2.5, 0.5), (1.5, 1.5)],
+        # outside the grid
+        [(10.0, 10.0), (11.0, 10.0), (11.0, 11.0)],
+    ]
+    regridder = Regridder.from_polygons(grid, polygons)
+    out = regridder.apply(field, np.empty(4))
+    np.testing.assert_allclose(out[:3], [0.0, (0.5 * 1 + 2) / 1.5, 5.5])
+    assert np.isnan(out[3])
+
+
+def test_polygons_negative_spacing(field):
+    grid = Grid(1, 2, GridType.uniform_rectilinear)
+    grid.shape = (3, 4)
+    grid.spacing = (-1.0, 1.0)
+    grid.origin = (2.0, 0.0)
+    # row 0 is the top row, y = 2
+    regridder = Regridder.from_polygons(grid, [[(-0.5, 1.5), (0.5, 1.5), (0.5, 2.5)]])
+    np.testing.assert_allclose(regridder.apply(field, np.empty(1)), [0.0])
+
+
+def test_polygons_grid_type():
+    with pytest.raises(ValueError):
+        Regridder.from_polygons(Grid(0, 1, GridType.vector), [])
+
+
+def test_cache(grid, field, tmp_path):
+    cache = tmp_path / "weights.npz"
+    polygons = [[(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]]
+    built = Regridder.from_polygons(grid, polygons, cache=cache)
+    assert cache.exists()
+    loaded = Regridder.from_polygons(grid, polygons, cache=cache)
+    np.testing.assert_array_equal(loaded.data, built.data)
+    np.testing.assert_array_equal(loaded.indices, built.indices)
+    # a different grid rebuilds the weights
+    grid.origin = (0.5, 0.5)
+    moved = Regridder.from_polygons(grid, polygons, cache=cache)
+    assert not np.array_equal(moved.indices, built.indices)
+    np.testing.assert_allclose(moved.apply(field, np.empty(1)), [2.5])
+
+
+def test_cache_suffix(grid, tmp_path):
+    """A cache path without the .npz suffix np.savez appends is still reused"""
+    polygons = [[(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]]
+    Regridder.from_polygons(grid, polygons, cache=tmp_path / "weights")
+    cache = tmp_path / "weights.npz"
+    saved = cache.stat().st_mtime_ns
+    os.utime(cache, ns=(saved - 10**9, saved - 10**9))
+    Regridder.from_polygons(grid, polygons, cache=tmp_path / "weights")
+    # loaded rather than rebuilt and saved again
+    assert cache.stat().st_mtime_ns == saved - 10**9
+    assert list(tmp_path.iterdir()) == [cache]
+
+
+def test_save_load(grid, field, tmp_path):
+    regridder = Regridder.from_cell_indices(grid, [[0, 1], [], [11]])
+    regridder.save(tmp_path / "weights.npz")
+    loaded = Regridder.load(tmp_path / "weights.npz")
+    out = loaded.apply(field, np.empty(3))
+    np.testing.assert_allclose(out[[0, 2]], [0.5, 11.0])
+    assert np.isnan(out[1])
+
+
+def test_apply_size(grid, field):
+    regridder = Regridder.from_cell_indices(grid, [[0], [1]])
+    with pytest.raises(ValueError):
+        regridder.apply(field[:2], np.empty(2))
+    with pytest.raises(ValueError):
+        regridder.apply(field, np.empty(3))
+
+
+@pytest.mark.parametrize(
+    "indptr, indices",
+    [([0, 2], [0]), ([1, 1], [0]), ([0, 1], [12]), ([0, 1], [-1])],
+)
+def test_invalid(indptr, indices):
+    with pytest.raises(ValueError):
+        Regridder(indptr, indices, np.ones(len(indices)), 12)
+
+
+def test_set_value(bmi, grid, field):
+    # bmi variable "a" has 4 elements
+    regridder = Regridder.from_cell_indices(grid, [[0], [1, 2], [3], [4, 5, 6, 7]])
+    ptr = bmi.get_value_ptr("a")
+    regridder.set_value(bmi, "a", field)
+    assert bmi.get_value_ptr("a") is ptr
+    np.testing.assert_allclose(bmi._values["a"], [0, 1.5, 3, 5.5])
+
+
+def test_polygons_concave(grid, field):
+    # clockwise L over cells 0, 1 and 4 (rows 0 and 1, columns 0 and 1)
+    polygon = [
+        (-0.5, -0.5),
+        (-0.5, 1.5),
+        (0.5, 1.5),
+        (0.5, 0.5),
+        (1.5, 0.5),
+        (1.5, -0.5),
+    ]
+    regridder = Regridder.from_polygons(grid, [polygon])
+    np.testing.assert_array_equal(np.sort(regridder.indices), [0, 1, 4])
+    np.testing.assert_allclose(regridder.data, 1 / 3)
+    np.testing.assert_allclose(regridder.apply(field, np.empty(1)), [5 / 3])
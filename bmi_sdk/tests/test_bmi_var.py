@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from ..bmi_var import ValueStore, VarInfo
+
+
+def test_var_info_cached(bmi):
+    """Info calls are served from the cached VarInfo"""
+    assert bmi.get_var_info("a") == VarInfo("float64", 8, 32, 4)
+    assert bmi.get_var_type("a") == "float64"
+    assert bmi.get_var_itemsize("a") == 8
+    assert bmi.get_var_nbytes("a") == 32
+    assert bmi.ptr_calls == 1
+
+
+def test_var_info_invalidated_on_rebind(bmi):
+    """Rebinding a buffer in the ValueStore rebuilds its VarInfo"""
+    bmi.get_var_info("a")
+    bmi._values["a"] = np.zeros(3, dtype=np.int32)
+    assert bmi.get_var_info("a") == VarInfo("int32", 4, 12, 3)
+    assert bmi.ptr_calls == 2
+
+
+def test_var_info_invalidate(bmi):
+    info = bmi.get_var_info("a")
+    assert bmi.get_var_info("a") is info
+    bmi.invalidate_var_info("a")
+    assert bmi.get_var_info("a") is not info
+    bmi.invalidate_var_info()
+    assert bmi._var_info == {}
+
+
+def test_value_store_delete():
+    cache = {"a": 1}
+    store = ValueStore(cache)
+    dict.__setitem__(store, "a", 1)
+    del store["a"]
+    assert "a" not in cache
+    with pytest.raises(KeyError):
+        store["a"]
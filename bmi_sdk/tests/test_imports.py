@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+
+def test_pydantic_imported_lazily(tmp_path):
+    """Only bmi_time uses pydantic, the rest of the sdk doesn't load it"""
+    script = (
+        "import sys\n"
+        "import bmi_sdk, bmi_sdk.bmi_minimal, bmi_sdk.bmi_grid, bmi_sdk.bmi_var\n"
+        "import bmi_sdk.bmi_clock, bmi_sdk.bmi_regrid\n"
+        "bmi_sdk.bmi_clock.Clock().advance()\n"
+        "assert 'pydantic' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=tmp_path)